@@ -0,0 +1,213 @@
+import argparse
+import json
+import os
+import random
+import sys
+import tracemalloc
+
+from settings import *
+from controls import ScriptedPad
+
+# Budget file checked into the repo. The benchmark fails when steady-state gameplay
+# goes over it, and --ratchet tightens it whenever a change brings allocations down.
+BUDGET_FILE = get_path("alloc_budget.json")
+RATCHET_HEADROOM = 1.10  # New budgets keep 10% slack over the measurement
+
+
+class AllocationTracker:
+    """Attributes Python allocations per frame to GameManager update/draw phases (via tracemalloc).
+
+    The game marks where each phase begins (GameManager.mark_phase); a phase runs until
+    the next mark or end(). For every phase it records:
+      * bytes  - high-water mark of memory allocated above the phase's starting point
+                 (temporary Surfaces, text, masks and lists show up here even when freed again)
+      * net    - bytes still allocated when the phase ends
+      * blocks - change in live allocated blocks (objects), i.e. what the phase leaves behind
+
+    Pixel buffers live in SDL's allocator, which tracemalloc cannot see, so a new
+    Surface costs its Python object here, not its pixels. The tracker assumes serial
+    rendering (not --pipelined).
+    """
+
+    def __init__(self):
+        self.frames = []
+        self.current = {}
+        self.overhead = 0
+        self._open = None
+        self._start_bytes = 0
+        self._start_blocks = 0
+
+    def start(self):
+        tracemalloc.start()
+        # Calibrate: what an empty phase reports is bookkeeping, not the game
+        for _ in range(10):
+            self.begin("_probe")
+            self.end()
+        samples = self.current.pop("_probe")
+        self.overhead = samples[0] // samples[3]
+        self.current.clear()
+
+    def stop(self):
+        self.end()
+        tracemalloc.stop()
+
+    def begin(self, name):
+        """Closes the open phase (if any) and starts attributing allocations to name."""
+        if self._open is not None:
+            self.end()
+        self._open = name
+        tracemalloc.reset_peak()
+        self._start_blocks = sys.getallocatedblocks()
+        self._start_bytes = tracemalloc.get_traced_memory()[0]
+
+    def end(self):
+        if self._open is None:
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        blocks = sys.getallocatedblocks()
+        self._record(self._open, peak - self._start_bytes, current - self._start_bytes,
+                     blocks - self._start_blocks)
+        self._open = None
+
+    def _record(self, name, peak, net, blocks):
+        entry = self.current.get(name)
+        if entry is None:
+            entry = self.current[name] = [0, 0, 0, 0]
+        entry[0] += max(0, peak - self.overhead)
+        entry[1] += net
+        entry[2] += blocks
+        entry[3] += 1
+
+    def end_frame(self):
+        self.end()
+        self.frames.append(self.current)
+        self.current = {}
+
+    def summary(self, skip=0):
+        """Mean per-frame {phase: {"bytes", "net", "blocks"}} over frames[skip:], plus "frame" totals."""
+        frames = self.frames[skip:]
+        if not frames:
+            return {}
+        totals = {}
+        for frame in frames:
+            for name, (peak, net, blocks, _) in frame.items():
+                t = totals.setdefault(name, [0, 0, 0])
+                t[0] += peak
+                t[1] += net
+                t[2] += blocks
+
+        n = len(frames)
+        result = {name: {"bytes": t[0] / n, "net": t[1] / n, "blocks": t[2] / n} for name, t in totals.items()}
+        result["frame"] = {key: sum(p[key] for p in result.values()) for key in ("bytes", "net", "blocks")}
+        return result
+
+    def report(self, skip=0):
+        summary = self.summary(skip)
+        lines = [f"{'phase':<22}{'bytes/frame':>14}{'net':>10}{'blocks':>10}"]
+        for name, s in sorted(summary.items(), key=lambda item: -item[1]["bytes"]):
+            lines.append(f"{name:<22}{s['bytes']:>14.0f}{s['net']:>10.0f}{s['blocks']:>10.1f}")
+        return "\n".join(lines)
+
+
+def load_budget(path=BUDGET_FILE):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def check_budget(summary, budget):
+    """Returns a list of human-readable budget violations (empty when within budget)."""
+    failures = []
+    frame = summary["frame"]
+    if frame["bytes"] > budget["frame_bytes"]:
+        failures.append(f"frame allocates {frame['bytes']:.0f} B/frame (budget {budget['frame_bytes']})")
+    if frame["blocks"] > budget["frame_blocks"]:
+        failures.append(f"frame leaves {frame['blocks']:.1f} blocks/frame (budget {budget['frame_blocks']})")
+    for name, limit in budget.get("phases", {}).items():
+        measured = summary.get(name, {"bytes": 0})["bytes"]
+        if measured > limit:
+            failures.append(f"{name} allocates {measured:.0f} B/frame (budget {limit})")
+    return failures
+
+
+def ratchet_budget(summary, budget):
+    """Tightens (never loosens) the budget towards the measurement."""
+    def tighten(old, measured):
+        new = int(measured * RATCHET_HEADROOM) + 1
+        return new if old is None else min(old, new)
+
+    budget = budget or {}
+    new = {
+        "frame_bytes": tighten(budget.get("frame_bytes"), summary["frame"]["bytes"]),
+        "frame_blocks": max(1, tighten(budget.get("frame_blocks"), max(0.0, summary["frame"]["blocks"]))),
+        "phases": {},
+    }
+    old_phases = budget.get("phases", {})
+    for name, s in summary.items():
+        if name != "frame":
+            new["phases"][name] = tighten(old_phases.get(name), s["bytes"])
+    return new
+
+
+def run_benchmark(frames=900, warmup=300, seed=0, level=1):
+    """Plays scripted, headless gameplay with the tracker attached. Returns the tracker."""
+    from game import GameManager
+
+    game = GameManager(headless=True)
+    random.seed(seed)
+    game.start_new_game()
+    if level > 1:
+        game.level = level
+        game.spawn_enemies()
+
+    pad = ScriptedPad(seed)
+    tracker = AllocationTracker()
+    game.alloc_tracker = tracker
+    tracker.start()
+    try:
+        dt = 1.0 / FPS
+        for _ in range(warmup + frames):
+            if game.state != "PLAYING":
+                # Steady-state gameplay only: put the pilot straight back in
+                game.start_new_game()
+            game.step(dt, pad.next_input())
+            game.draw()
+            tracker.end_frame()
+    finally:
+        tracker.stop()
+        game.alloc_tracker = None
+    return tracker
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-frame allocation benchmark with a regression budget")
+    parser.add_argument("--frames", type=int, default=900, help="measured frames")
+    parser.add_argument("--warmup", type=int, default=300, help="frames played before measuring")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--level", type=int, default=1)
+    parser.add_argument("--budget", default=BUDGET_FILE, help="budget JSON file")
+    parser.add_argument("--ratchet", action="store_true", help="lower the stored budget to the new measurement")
+    args = parser.parse_args()
+
+    tracker = run_benchmark(args.frames, args.warmup, args.seed, args.level)
+    summary = tracker.summary(skip=args.warmup)
+    print(tracker.report(skip=args.warmup))
+
+    budget = load_budget(args.budget)
+    if args.ratchet:
+        budget = ratchet_budget(summary, budget)
+        with open(args.budget, "w") as f:
+            json.dump(budget, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Budget written to {os.path.relpath(args.budget)}")
+
+    if budget is None:
+        print("No allocation budget yet; run with --ratchet to create one.")
+        sys.exit(0)
+
+    failures = check_budget(summary, budget)
+    for failure in failures:
+        print(f"OVER BUDGET: {failure}")
+    sys.exit(1 if failures else 0)
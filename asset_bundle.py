@@ -0,0 +1,151 @@
+import mmap
+import os
+import struct
+import sys
+
+import pygame
+
+from settings import *
+
+# Packed sprite bundle: every image GameManager uses, already converted to the display's
+# pixel format and already scaled to its in-game sizes, so startup maps pixels instead of
+# decoding PNGs. Built by running this module; the loose PNGs stay the source of truth.
+BUNDLE_FILE = get_path("assets/sprites.bundle")
+MAGIC = b"EIBN"
+VERSION = 1
+
+# key -> (source image, in-game scale factors baked in next to the original)
+SPRITES = {
+    "player": ("assets/spaceship_2.png", (2,)),
+    "enemy": ("assets/invadership.png", (2,)),
+    "enemy_shooter": ("assets/invadership_shooter.png", (2,)),
+    "bullet": ("assets/spaceMissile.png", (0.5, 0.75)),  # 0.75 is the HUD ammo icon
+    "ufo": ("assets/ufo.png", (2,)),
+    "bg": ("assets/earth_bg_1_transparent.png", ()),
+}
+
+_HEADER = struct.Struct("<4sH4sI")         # magic, version, pixel format, entries
+_ENTRY = struct.Struct("<24sdqqHHQ")       # key, scale, source mtime_ns, source size, w, h, offset
+_ALIGN = 64
+
+
+def _pixel_format(surface):
+    """The frombuffer/tobytes format string matching surface's memory layout (None if unsupported)."""
+    if surface.get_bitsize() != 32 or sys.byteorder != "little":
+        return None
+    return {
+        (0xFF0000, 0xFF00, 0xFF, 0xFF000000): "BGRA",
+        (0xFF, 0xFF00, 0xFF0000, 0xFF000000): "RGBA",
+    }.get(surface.get_masks())
+
+
+def _display_format():
+    """Pixel format convert_alpha() produces for the current display."""
+    return _pixel_format(pygame.Surface((1, 1)).convert_alpha())
+
+
+def _source_stamp(path):
+    st = os.stat(get_path(path))
+    return st.st_mtime_ns, st.st_size
+
+
+def build_bundle(path=BUNDLE_FILE):
+    """Packs SPRITES into path. Needs a display mode set (convert_alpha)."""
+    fmt = _display_format()
+    if fmt is None:
+        raise RuntimeError("display pixel format has no packed layout the bundle supports")
+
+    entries = []
+    blobs = []
+    offset = _HEADER.size + _ENTRY.size * sum(1 + len(scales) for _, scales in SPRITES.values())
+    for key, (source, scales) in SPRITES.items():
+        mtime_ns, size = _source_stamp(source)
+        image = pygame.image.load(get_path(source)).convert_alpha()
+        for scale in (1.0,) + tuple(scales):
+            surf = image if scale == 1.0 else pygame.transform.scale_by(image, scale)
+            offset += -offset % _ALIGN
+            data = pygame.image.tobytes(surf, fmt)
+            entries.append(_ENTRY.pack(key.encode(), scale, mtime_ns, size, surf.get_width(), surf.get_height(),
+                                       offset))
+            blobs.append((offset, data))
+            offset += len(data)
+
+    with open(path + ".tmp", "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, fmt.encode(), len(entries)))
+        for entry in entries:
+            f.write(entry)
+        for blob_offset, data in blobs:
+            f.write(b"\0" * (blob_offset - f.tell()))
+            f.write(data)
+    os.replace(path + ".tmp", path)  # Never leave a half-written bundle behind
+    return offset
+
+
+def _open_bundle(path):
+    """Maps the bundle and returns (images, scaled), or None with the reason it can't be used."""
+    try:
+        with open(path, "rb") as f:
+            # Copy-on-write: pages load on first touch, and a stray draw into an asset never reaches the file
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    except (FileNotFoundError, ValueError):
+        return None, "no bundle"
+
+    view = memoryview(mapped)
+    try:
+        magic, version, fmt, count = _HEADER.unpack_from(view, 0)
+        _ENTRY.unpack_from(view, _HEADER.size + (count - 1) * _ENTRY.size)
+    except struct.error:
+        return None, "truncated bundle"
+    if magic != MAGIC or version != VERSION:
+        return None, "old bundle version"
+    fmt = fmt.decode()
+    if fmt != _display_format():
+        return None, "display pixel format changed"
+
+    images = {}
+    scaled = {}
+    for i in range(count):
+        key, scale, mtime_ns, size, width, height, offset = _ENTRY.unpack_from(view, _HEADER.size + i * _ENTRY.size)
+        key = key.rstrip(b"\0").decode()
+        if key not in SPRITES:
+            continue
+        try:
+            if (mtime_ns, size) != _source_stamp(SPRITES[key][0]):
+                return None, f"{SPRITES[key][0]} changed"
+        except FileNotFoundError:
+            return None, f"{SPRITES[key][0]} missing"
+        if offset + width * height * 4 > len(view):
+            return None, "truncated bundle"
+        surface = pygame.image.frombuffer(view[offset:offset + width * height * 4], (width, height), fmt)
+        if scale == 1.0:
+            images[key] = surface
+        else:
+            scaled[(key, scale)] = surface
+
+    for key, (source, scales) in SPRITES.items():
+        if key not in images or any((key, scale) not in scaled for scale in scales):
+            return None, f"{key} not in bundle"
+    return (images, scaled), None
+
+
+def load_sprites(path=BUNDLE_FILE):
+    """Returns (images, scaled): {key: Surface} and {(key, scale): Surface}.
+
+    Comes straight from the memory-mapped bundle when it is up to date. When it is
+    missing or stale, falls back to decoding the loose PNGs (scaled is then empty and
+    sprites get scaled on first use, as before).
+    """
+    bundle, reason = _open_bundle(path)
+    if bundle is not None:
+        return bundle
+    if reason != "no bundle":
+        print(f"Asset bundle is stale ({reason}); loading PNGs. Rebuild with: python asset_bundle.py")
+    images = {key: pygame.image.load(get_path(source)).convert_alpha() for key, (source, _) in SPRITES.items()}
+    return images, {}
+
+
+if __name__ == "__main__":
+    pygame.init()
+    pygame.display.set_mode((1, 1), pygame.HIDDEN)
+    written = build_bundle()
+    print(f"Wrote {os.path.relpath(BUNDLE_FILE)} ({written / 1024:.0f} KiB, {_display_format()})")
@@ -0,0 +1,67 @@
+import asyncio
+import time
+
+WAKE_POLL = 1.0 / 60  # How often an uncapped pacer's idle wait checks for input
+
+
+class AsyncFramePacer:
+    """Paces frames by awaiting the asyncio event loop instead of blocking in clock.tick.
+
+    wait() sleeps with asyncio.sleep until the next frame is due, so every other task on
+    the loop (coroutines from GameManager.spawn, future networking) runs in the gap the
+    frame leaves over. Each wait records how long the frame handed back to the loop (idle)
+    and how late the loop handed control back (lateness): when background coroutines hog
+    the loop, it is lateness that grows, not the frame work.
+    """
+
+    def __init__(self, fps):
+        # fps 0: uncapped, every wait just gives the loop one turn
+        self.frame_time = 1.0 / fps if fps else 0.0
+        self.last_frame = self.deadline = time.perf_counter()
+        self.frames = 0
+        self.elapsed = 0.0  # Seconds covered by the measured frames
+        self.idle = []      # ms handed to the event loop before each frame
+        self.lateness = []  # ms past the deadline the frame actually started
+
+    async def wait(self, interval=None, wake=None):
+        """Yields to the event loop until the next frame is due; returns dt since the previous one.
+
+        interval overrides the frame time (idle screens refresh slower). wake, if given, is
+        checked after every sleep of at most one frame time and ends the wait early when it
+        returns True, so input still gets an answer at full rate.
+        """
+        start = time.perf_counter()
+        deadline = self.deadline + (interval or self.frame_time)
+        woken = False
+        while True:
+            # Sleeps at least once: a frame that ran over still lets the loop take a turn
+            remaining = max(0.0, deadline - time.perf_counter())
+            await asyncio.sleep(min(remaining, self.frame_time or WAKE_POLL) if wake else remaining)
+            if wake is not None and wake():
+                woken = True
+                break
+            if time.perf_counter() >= deadline:
+                break
+
+        now = time.perf_counter()
+        self.frames += 1
+        self.idle.append((now - start) * 1000.0)
+        if not woken:
+            self.lateness.append(max(0.0, now - deadline) * 1000.0)
+        dt = now - self.last_frame
+        self.elapsed += dt
+        self.last_frame = now
+        # Deadlines stay on the frame grid, so small wake-up lateness doesn't add up to a lower
+        # frame rate; after input or a frame that ran over, the grid restarts from now
+        self.deadline = deadline if not woken and now - deadline < self.frame_time else now
+        return dt
+
+    def report(self):
+        if not self.frames:
+            return "Event loop: no frames run"
+        idle = sum(self.idle) / len(self.idle)
+        late = sorted(self.lateness) or [0.0]
+        p95 = late[min(len(late) - 1, int(len(late) * 0.95))]
+        return (f"Event loop over {self.frames} frames: {idle:.1f} ms idle per frame given back "
+                f"({sum(self.idle) / (self.elapsed * 1000.0):.0%} of the run), "
+                f"wake-up lateness mean {sum(late) / len(late):.2f} ms, p95 {p95:.2f} ms")
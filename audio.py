@@ -1,8 +1,93 @@
 from settings import *
 import pygame
 
+
+class MusicEngine:
+    """Keeps every music track decoded in RAM on its own reserved channel and crossfades by volume.
+
+    Switching tracks never touches the disk or seeks a stream: the outgoing track fades to
+    silence and is paused where it stands, the incoming one fades in (resumed, or restarted
+    from the top). Fades run on wall-clock ticks, so call update() once per frame.
+    """
+
+    def __init__(self, paths):
+        self.tracks = {}
+        for key, path in paths.items():
+            try:
+                self.tracks[key] = pygame.mixer.Sound(path)
+            except (pygame.error, FileNotFoundError) as e:
+                print(f"couldn't load music {key}: {e}")
+
+        # Music owns the first channels; Sound.play() for effects never picks a reserved one
+        self.reserved = len(self.tracks)
+        pygame.mixer.set_num_channels(pygame.mixer.get_num_channels() + self.reserved)
+        pygame.mixer.set_reserved(self.reserved)
+        self.channels = {key: pygame.mixer.Channel(i) for i, key in enumerate(self.tracks)}
+
+        self.gains = {key: 0.0 for key in self.tracks}
+        self.fades = {}  # key -> (from_gain, to_gain, start_ms, duration_ms)
+        self.master = 1.0
+        self.current = None
+
+    def play(self, key, loops=-1, fade_ms=2000, resume=False):
+        if self.current == key:
+            return
+        now = pygame.time.get_ticks()
+        for other in self.channels:
+            if other != key:
+                self._fade(other, 0.0, fade_ms, now)
+
+        channel = self.channels.get(key)
+        if channel is not None:
+            if not resume or not channel.get_busy():
+                self.gains[key] = 0.0
+                channel.set_volume(0.0)
+                channel.play(self.tracks[key], loops)
+            channel.unpause()
+            self._fade(key, 1.0, fade_ms, now)
+        self.current = key
+        self.update()
+
+    def stop(self, fade_ms=1000):
+        now = pygame.time.get_ticks()
+        for key in self.channels:
+            self._fade(key, 0.0, fade_ms, now)
+        self.current = None
+
+    def pause(self):
+        for channel in self.channels.values():
+            channel.pause()
+
+    def unpause(self):
+        for key, channel in self.channels.items():
+            if self.gains[key] > 0.0:
+                channel.unpause()
+
+    def set_master(self, volume):
+        self.master = volume
+        for key, channel in self.channels.items():
+            channel.set_volume(self.gains[key] * volume)
+
+    def _fade(self, key, target, fade_ms, now):
+        if self.gains[key] != target:
+            self.fades[key] = (self.gains[key], target, now, fade_ms)
+
+    def update(self):
+        if not self.fades:
+            return
+        now = pygame.time.get_ticks()
+        for key, (start, target, t0, duration) in list(self.fades.items()):
+            t = 1.0 if duration <= 0 else min(1.0, (now - t0) / duration)
+            self.gains[key] = start + (target - start) * t
+            self.channels[key].set_volume(self.gains[key] * self.master)
+            if t >= 1.0:
+                del self.fades[key]
+                if target == 0.0:
+                    self.channels[key].pause()  # Silent tracks hold their position for a later resume
+
+
 class AudioManager:
-    def __init__(self, assets):
+    def __init__(self, assets, load_music=True):
         # --- Background
         self.music_tracks = {
             'menu': get_path("assets/audio/menu_music.mp3"),
@@ -17,24 +102,27 @@ class AudioManager:
             "ufo": pygame.mixer.Sound(get_path("assets/audio/ufo_sound.mp3"))
         }
 
-        self.current_track = None
+        # Decoded once up front (a few MB per minute of audio); headless runs skip it
+        self.music = MusicEngine(self.music_tracks if load_music else {})
+        self.muted = False  # Set while netplay re-simulates frames that were already heard
 
         self.master_volume = 0.5
         self.set_volume(self.master_volume)
 
-    def play_music(self, key, loops=-1, fade_ms=2000, start=0.0):
-        if self.current_track == key:
-            return
-        if key in self.music_tracks:
-            try:
-                pygame.mixer.music.load(self.music_tracks[key])
-                pygame.mixer.music.play(loops, start=start, fade_ms=fade_ms)
+    @property
+    def current_track(self):
+        return self.music.current
 
-                self.current_track = key
-            except pygame.error as e:
-                print(f"couldn't load music {key}: {e}")
+    def play_music(self, key, loops=-1, fade_ms=2000, resume=False):
+        # resume=True continues the track where it was faded out, otherwise it restarts
+        self.music.play(key, loops, fade_ms, resume)
+
+    def update(self):
+        self.music.update()
 
     def play_sfx(self, key, loops=0):
+        if self.muted:
+            return None
         if key in self.sfx:
             # .play() returns a Channel object, allowing multiple instances
             self.sfx[key].play(loops=loops)
@@ -45,37 +133,37 @@ class AudioManager:
             self.sfx[key].stop()
 
     def stop_music(self, fade_ms=1000):
-        pygame.mixer.music.fadeout(fade_ms)
-        self.current_track = None
+        self.music.stop(fade_ms)
 
     def set_volume(self, volume):
         self.master_volume = volume
-        pygame.mixer.music.set_volume(volume)
+        self.music.set_master(volume)
         for sound in self.sfx.values():
             sound.set_volume(volume)
 
+    def sfx_channels(self):
+        # Every channel after the ones reserved for music
+        return [pygame.mixer.Channel(i) for i in range(self.music.reserved, pygame.mixer.get_num_channels())]
+
     def pause_sfx(self):
-        # Only pauses sound effects (UFO, Bullets), leaves Music stream alone
-        pygame.mixer.pause()
+        # Only pauses sound effects (UFO, Bullets), leaves the music channels alone
+        for channel in self.sfx_channels():
+            channel.pause()
 
     def unpause_sfx(self):
         # Resumes sound effects exactly where they were
-        pygame.mixer.unpause()
+        for channel in self.sfx_channels():
+            channel.unpause()
 
     def pause_music(self):
-        pygame.mixer.music.pause()
+        self.music.pause()
 
     def unpause_music(self):
-        pygame.mixer.music.unpause()
-
-    def get_music_pos(self):
-        # Returns current position in seconds (for resuming later)
-        return pygame.mixer.music.get_pos() / 1000.0
+        self.music.unpause()
 
     def pause_all(self):
-        pygame.mixer.music.pause()
-        pygame.mixer.pause()  # Pauses all SFX channels
+        pygame.mixer.pause()  # Music and SFX channels alike
 
     def unpause_all(self):
-        pygame.mixer.music.unpause()
-        pygame.mixer.unpause()
\ No newline at end of file
+        self.unpause_sfx()
+        self.music.unpause()
\ No newline at end of file
@@ -0,0 +1,172 @@
+import argparse
+import csv
+import json
+import os
+import random
+import statistics
+import sys
+from collections import Counter
+from multiprocessing import Pool
+
+from settings import *
+from bots import BOTS
+
+# Headless balance runs: thousands of bot games spread over a process pool, no rendering.
+# Game i of a run uses seed (--seed + i) for both the game and its bot, so any run, or
+# any single game from it, can be reproduced exactly on any number of workers.
+
+_game = None  # One GameManager per worker process, reused for every game it plays
+
+
+def _init_worker(tuning):
+    global _game
+    # Every worker builds its own GameManager: its one-off startup notices (a stale asset
+    # bundle, pygame's banner where workers are spawned rather than forked) would print
+    # once per worker into the report
+    sys.stdout = open(os.devnull, "w")
+    from game import GameManager
+
+    _game = GameManager(headless=True, governor=False)
+    for name, value in tuning.items():
+        setattr(_game, name, value)
+
+
+def play_game(job):
+    """Plays one game to the end (or the time limit). Returns its result row."""
+    seed, bot_name, max_frames = job
+    game = _game
+    random.seed(seed)
+    # Same fresh start as start_versus: no state-change side effects, so a worker's
+    # previous game can't leak into this one
+    game.state = "PLAYING"
+    game.reset_game_state_vars()
+    bot = BOTS[bot_name](seed)
+
+    dt = 1.0 / FPS
+    frames = 0
+    while game.state == "PLAYING" and frames < max_frames:
+        game.step(dt, bot.next_input(game))
+        frames += 1
+
+    return {
+        "bot": bot_name,
+        "seed": seed,
+        "score": game.score,
+        "level": game.level,
+        "seconds": round(frames / FPS, 3),
+        "cause": game.death_cause or "timeout",
+    }
+
+
+def histogram(values, width):
+    """{bin start: count} with bins of the given width."""
+    counts = Counter(int(v // width) * width for v in values)
+    return {str(k): counts[k] for k in sorted(counts)}
+
+
+def percentile(ordered, q):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+def summarize(rows, score_bin, time_bin):
+    """Per-bot distributions of score, level reached, time to death and cause of death."""
+    summary = {}
+    for bot in sorted({row["bot"] for row in rows}):
+        games = [row for row in rows if row["bot"] == bot]
+        scores = sorted(row["score"] for row in games)
+        deaths = sorted(row["seconds"] for row in games if row["cause"] != "timeout")
+        summary[bot] = {
+            "games": len(games),
+            "score": {
+                "mean": round(statistics.mean(scores), 1),
+                "p10": percentile(scores, 0.1),
+                "p50": percentile(scores, 0.5),
+                "p90": percentile(scores, 0.9),
+                "max": scores[-1],
+                "histogram": histogram(scores, score_bin),
+            },
+            "level": {
+                "mean": round(statistics.mean(row["level"] for row in games), 2),
+                "max": max(row["level"] for row in games),
+                "histogram": histogram((row["level"] for row in games), 1),
+            },
+            "time_to_death": {
+                "p50": percentile(deaths, 0.5) if deaths else None,
+                "histogram": histogram(deaths, time_bin),
+            },
+            "cause_of_death": dict(sorted(Counter(row["cause"] for row in games).items())),
+        }
+    return summary
+
+
+def report(summary):
+    lines = [f"{'bot':<8}{'games':>7}{'score p10/p50/p90':>20}{'mean lvl':>10}{'max lvl':>9}"
+             f"{'death p50':>11}  causes"]
+    for bot, s in summary.items():
+        score = s["score"]
+        scores = f"{score['p10']}/{score['p50']}/{score['p90']}"
+        death = s["time_to_death"]["p50"]
+        death = f"{death:.0f}s" if death is not None else "-"
+        causes = ", ".join(f"{k} {v}" for k, v in s["cause_of_death"].items())
+        lines.append(f"{bot:<8}{s['games']:>7}{scores:>20}{s['level']['mean']:>10}{s['level']['max']:>9}"
+                     f"{death:>11}  {causes}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bot-driven balance simulation (headless, all cores)")
+    parser.add_argument("--games", type=int, default=500, help="games per bot")
+    parser.add_argument("--bots", default=",".join(BOTS), help=f"comma-separated, from: {', '.join(BOTS)}")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("--max-minutes", type=float, default=10.0, help="game-time limit per game")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="processes (default: all cores)")
+    parser.add_argument("--csv", help="write one row per game here")
+    parser.add_argument("--json", help="write the distributions here")
+    parser.add_argument("--score-bin", type=int, default=100, help="score histogram bin width")
+    parser.add_argument("--time-bin", type=int, default=15, help="time-to-death histogram bin width (seconds)")
+    # Balance knobs under test (defaults from settings.py)
+    parser.add_argument("--difficulty-step", type=float, default=DIFFICULTY_STEP)
+    parser.add_argument("--shooter-chance", type=float, default=SHOOTER_CHANCE)
+    parser.add_argument("--shooter-min-level", type=int, default=SHOOTER_MIN_LEVEL)
+    parser.add_argument("--bullet-stock", type=int, default=BULLET_STOCK)
+    parser.add_argument("--recharge-time", type=float, default=BULLET_RECHARGE_TIME)
+    args = parser.parse_args()
+
+    bots = args.bots.split(",")
+    for bot in bots:
+        if bot not in BOTS:
+            parser.error(f"unknown bot {bot!r}")
+
+    tuning = {
+        "difficulty_step": args.difficulty_step,
+        "shooter_chance": args.shooter_chance,
+        "shooter_min_level": args.shooter_min_level,
+        "start_bullet_stock": args.bullet_stock,
+        "start_recharge_time": args.recharge_time,
+    }
+    max_frames = int(args.max_minutes * 60 * FPS)
+    jobs = [(args.seed + i, bot, max_frames) for bot in bots for i in range(args.games)]
+
+    with Pool(args.workers, initializer=_init_worker, initargs=(tuning,)) as pool:
+        rows = []
+        for done, row in enumerate(pool.imap_unordered(play_game, jobs, chunksize=4), 1):
+            rows.append(row)
+            if done % 100 == 0 or done == len(jobs):
+                print(f"\r{done}/{len(jobs)} games", end="", file=sys.stderr, flush=True)
+        print(file=sys.stderr)
+
+    # Completion order depends on scheduling; output order must not
+    rows.sort(key=lambda row: (bots.index(row["bot"]), row["seed"]))
+    summary = summarize(rows, args.score_bin, args.time_bin)
+    print(report(summary))
+
+    if args.csv:
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"seed": args.seed, "games_per_bot": args.games, "max_minutes": args.max_minutes,
+                       "tuning": tuning, "bots": summary}, f, indent=2)
+            f.write("\n")
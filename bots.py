@@ -0,0 +1,106 @@
+from settings import *
+from controls import INPUT_LEFT, INPUT_RIGHT, INPUT_FIRE, ScriptedPad
+
+# Scripted pilots for headless games (balance.py). Each one reads the GameManager
+# and returns an input word for GameManager.step(), exactly like a player's keyboard.
+
+MISSILE_SPEED = 700.0  # Bullet.speed, for leading shots and timing dodges
+DEADBAND = 8           # Pixels off target that still count as "on target"
+
+
+def steer(ship, target_x):
+    """Input bits that move the ship's centre towards target_x."""
+    if target_x < ship.rect.centerx - DEADBAND:
+        return INPUT_LEFT
+    if target_x > ship.rect.centerx + DEADBAND:
+        return INPUT_RIGHT
+    return 0
+
+
+def incoming(game, horizon):
+    """Enemy bullets that will reach the ship's row within `horizon` seconds and overlap it."""
+    ship = game.player.rect
+    threats = []
+    for b in game.enemy_bullets:
+        if b.rect.bottom > ship.top:
+            continue
+        eta = (ship.top - b.rect.bottom) / b.speed
+        if eta < horizon and b.rect.right > ship.left - 20 and b.rect.left < ship.right + 20:
+            threats.append((eta, b))
+    threats.sort(key=lambda t: t[0])
+    return [b for _, b in threats]
+
+
+def dodge(game, bullet):
+    """Steers away from bullet, towards whichever side has more room."""
+    ship = game.player.rect
+    room_left = bullet.rect.centerx - ship.width
+    room_right = SCREEN_WIDTH - bullet.rect.centerx - ship.width
+    if ship.centerx < bullet.rect.centerx and room_left > 0 or room_right <= 0:
+        return INPUT_LEFT
+    return INPUT_RIGHT
+
+
+def aim(game, enemy):
+    """Where enemy will be when a missile fired now reaches its height (ignores wall bounces)."""
+    flight = max(0.0, game.player.rect.top - enemy.rect.centery) / MISSILE_SPEED
+    return enemy.rect.centerx + enemy.vx * flight
+
+
+def fire_if_lined_up(game, enemy, target_x):
+    if game.current_bullet_stock > 0 and abs(target_x - game.player.rect.centerx) < enemy.rect.width / 3:
+        return INPUT_FIRE
+    return 0
+
+
+class RandomBot:
+    """Wanders and fires at random (the ScriptedPad also used by netplay and benchmarks)."""
+
+    def __init__(self, seed):
+        self.pad = ScriptedPad(seed)
+
+    def next_input(self, game):
+        return self.pad.next_input()
+
+
+class DodgeBot:
+    """Survival first: sidesteps any missile about to land, only hunts when the sky is clear."""
+
+    def __init__(self, seed):
+        pass
+
+    def next_input(self, game):
+        threats = incoming(game, horizon=0.6)
+        if threats:
+            return dodge(game, threats[0])
+        if not game.enemies:
+            return 0
+        # Clear the most urgent enemy: the one closest to the invasion line
+        enemy = max(game.enemies, key=lambda e: e.rect.bottom)
+        target_x = aim(game, enemy)
+        return steer(game.player, target_x) | fire_if_lined_up(game, enemy, target_x)
+
+
+class GreedyAimBot:
+    """Points first: chases the most valuable reachable enemy and only dodges at the last moment."""
+
+    def __init__(self, seed):
+        pass
+
+    def next_input(self, game):
+        threats = incoming(game, horizon=0.2)
+        if threats:
+            return dodge(game, threats[0])
+        if not game.enemies:
+            return 0
+        ship_x = game.player.rect.centerx
+        enemy = max(game.enemies, key=lambda e: e.points - abs(e.rect.centerx - ship_x) / SCREEN_WIDTH * 10)
+        target_x = aim(game, enemy)
+        return steer(game.player, target_x) | fire_if_lined_up(game, enemy, target_x)
+
+
+BOTS = {
+    "random": RandomBot,
+    "dodge": DodgeBot,
+    "greedy": GreedyAimBot,
+}
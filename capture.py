@@ -0,0 +1,147 @@
+import argparse
+import os
+import random
+import threading
+import time
+
+import pygame
+
+from settings import *
+
+# ---- Frame Capture ----
+# Records presented frames (after PostProcessor.render) without screen-grabbing the window.
+# The game thread only copies the frame into the next free Surface of a preallocated ring
+# (one blit, or one scale when capturing at a smaller size; both release the GIL);
+# converting to bytes and writing to disk happen on the writer thread.
+
+
+class FrameCapture:
+    """Copies every stride-th presented frame into a ring of preallocated Surfaces for a writer thread.
+
+    path ending in .rgb or .raw: one raw RGB24 stream (frames back to back, no header; see
+    ffmpeg_hint()). Anything else is a directory that gets a frame_000000.png sequence.
+
+    The ring is single-producer / single-consumer: add() only advances head, the writer only
+    tail. When the writer is a full ring behind, add() drops the frame (counted in `dropped`)
+    so the game never waits for the disk; drop=False waits instead, for offline renders where
+    every frame matters more than real time.
+    """
+
+    def __init__(self, path, size=(SCREEN_WIDTH, SCREEN_HEIGHT), stride=CAPTURE_STRIDE, scale=CAPTURE_SCALE,
+                 slots=CAPTURE_SLOTS, drop=True):
+        self.path = path
+        self.raw = path.endswith((".rgb", ".raw"))
+        self.size = (max(1, round(size[0] * scale)), max(1, round(size[1] * scale)))
+        self.stride = stride
+        self.drop = drop
+        self.ring = [pygame.Surface(self.size) for _ in range(slots)]
+        self.head = 0      # Frames copied into the ring
+        self.tail = 0      # Frames written out
+        self.presented = 0  # Frames offered to add(), captured or not
+        self.dropped = 0
+        self._wake = threading.Event()
+        self._space = threading.Event()
+        self._closing = False
+
+        if self.raw:
+            self.file = open(path, "wb")
+        else:
+            os.makedirs(path, exist_ok=True)
+            self.file = None
+        self._thread = threading.Thread(target=self._writer, name="capture", daemon=True)
+        self._thread.start()
+
+    def add(self, surface):
+        """Call once per presented frame with the post-processed surface."""
+        self.presented += 1
+        if (self.presented - 1) % self.stride:
+            return
+        while self.head - self.tail >= len(self.ring):
+            if self.drop:
+                self.dropped += 1
+                return
+            self._space.clear()
+            self._wake.set()
+            self._space.wait(0.1)
+        slot = self.ring[self.head % len(self.ring)]
+        if surface.get_size() == self.size:
+            slot.blit(surface, (0, 0))
+        else:
+            # The governor may change the render size mid-recording: the video keeps its size
+            pygame.transform.scale(surface, self.size, slot)
+        self.head += 1
+        self._wake.set()
+
+    def _writer(self):
+        while True:
+            self._wake.wait(0.1)
+            self._wake.clear()
+            while self.tail < self.head:
+                slot = self.ring[self.tail % len(self.ring)]
+                if self.raw:
+                    self.file.write(pygame.image.tobytes(slot, "RGB"))
+                else:
+                    pygame.image.save(slot, os.path.join(self.path, f"frame_{self.tail:06d}.png"))
+                self.tail += 1
+                self._space.set()
+            if self._closing:
+                return
+
+    def close(self):
+        """Writes out everything still in the ring and closes the output."""
+        self._closing = True
+        self._wake.set()
+        self._thread.join()
+        if self.file is not None:
+            self.file.close()
+
+    def ffmpeg_hint(self, fps=FPS):
+        """The command that turns this recording into an MP4."""
+        rate = fps / self.stride
+        if self.raw:
+            source = f"-f rawvideo -pixel_format rgb24 -video_size {self.size[0]}x{self.size[1]} -i {self.path}"
+        else:
+            source = f"-i {os.path.join(self.path, 'frame_%06d.png')}"
+        return f"ffmpeg -framerate {rate:g} {source} -pix_fmt yuv420p capture.mp4"
+
+    def report(self):
+        return (f"Captured {self.tail} frames ({self.size[0]}x{self.size[1]}, every {self.stride}) to {self.path}; "
+                f"{self.dropped} dropped")
+
+
+if __name__ == "__main__":
+    from bots import BOTS
+    from game import GameManager
+
+    parser = argparse.ArgumentParser(
+        description="Renders a bot game headless, as fast as the machine allows, straight to a capture")
+    parser.add_argument("path", help="output: .rgb/.raw for a raw RGB24 stream, otherwise a PNG directory")
+    parser.add_argument("--bot", choices=sorted(BOTS), default="greedy")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="game and bot seed (a balance.py row replays with the same --seed and --bot)")
+    parser.add_argument("--frames", type=int, default=60 * FPS, help="game frames to simulate")
+    parser.add_argument("--stride", type=int, default=CAPTURE_STRIDE, help="capture every Nth frame")
+    parser.add_argument("--scale", type=float, default=CAPTURE_SCALE, help="capture size relative to the window")
+    parser.add_argument("--render-scale", type=float, default=RENDER_SCALE)
+    args = parser.parse_args()
+
+    game = GameManager(render_scale=args.render_scale, headless=True, governor=False)
+    # Offline: nobody is waiting on the frame rate, so wait for the writer rather than drop
+    game.capture = FrameCapture(args.path, stride=args.stride, scale=args.scale, drop=False)
+    random.seed(args.seed)
+    # Same fresh start as balance.py, so its rows replay frame for frame
+    game.state = "PLAYING"
+    game.reset_game_state_vars()
+    bot = BOTS[args.bot](args.seed)
+
+    start = time.perf_counter()
+    dt = 1.0 / FPS
+    frames = 0
+    while frames < args.frames and game.state == "PLAYING":
+        game.step(dt, bot.next_input(game))
+        game.draw()
+        frames += 1
+    game.capture.close()
+    elapsed = time.perf_counter() - start
+    print(f"{game.capture.report()} in {elapsed:.1f} s ({frames / elapsed / FPS:.1f}x real time)")
+    print(game.capture.ffmpeg_hint())
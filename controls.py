@@ -0,0 +1,54 @@
+import random
+
+import pygame
+
+# ---- Input Words ----
+# One small int per player per frame. This is what netplay sends over the wire,
+# and what scripted players feed into GameManager.step().
+INPUT_LEFT = 1
+INPUT_RIGHT = 2
+INPUT_FIRE = 4  # Fire was pressed this frame (a KEYDOWN, not a held key)
+
+
+class InputKeys:
+    """Stands in for pygame.key.get_pressed() in Player.handle_input, backed by an input word."""
+    __slots__ = ("bits",)
+
+    def __init__(self, bits=0):
+        self.bits = bits
+
+    def __getitem__(self, key):
+        if key == pygame.K_LEFT:
+            return bool(self.bits & INPUT_LEFT)
+        if key == pygame.K_RIGHT:
+            return bool(self.bits & INPUT_RIGHT)
+        return False
+
+
+def sample_input(keys, fire_pressed):
+    """Builds an input word from live keyboard state and this frame's fire press."""
+    bits = 0
+    if keys[pygame.K_LEFT]:
+        bits |= INPUT_LEFT
+    if keys[pygame.K_RIGHT]:
+        bits |= INPUT_RIGHT
+    if fire_pressed:
+        bits |= INPUT_FIRE
+    return bits
+
+
+class ScriptedPad:
+    """Deterministic stand-in for a human: holds a direction for a while, taps fire now and then."""
+
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+        self.hold = 0
+        self.direction = 0
+
+    def next_input(self):
+        if self.hold <= 0:
+            self.direction = self.rng.choice((0, INPUT_LEFT, INPUT_RIGHT))
+            self.hold = self.rng.randint(5, 40)
+        self.hold -= 1
+        fire = INPUT_FIRE if self.rng.random() < 0.08 else 0
+        return self.direction | fire
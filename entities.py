@@ -7,15 +7,107 @@ from pygame.transform import scale_by
 
 from settings import *
 
-class Entity(pygame.sprite.Sprite):
-    def __init__(self, surface, x, y, scaling_factor=1.0):
-        super().__init__()
-        self.image = surface
-
+# Transformed images and masks are shared by every entity made from the same source,
+# so spawning (or restoring) an entity never re-scales pixels or rebuilds masks.
+# Keyed by id(); the source surface is kept in the value so the id stays valid.
+_sprite_cache = {}
+_flip_cache = {}
+_particle_cache = {}  # (color, size) -> filled square
+
+def prepare_sprite(surface, scaling_factor=1.0):
+    """Returns the shared (image, mask) for surface at the given scale."""
+    key = (id(surface), scaling_factor)
+    entry = _sprite_cache.get(key)
+    if entry is None:
+        image = surface
         if scaling_factor != 1.0:
-            self.image = pygame.transform.scale_by(self.image, scaling_factor)
+            image = pygame.transform.scale_by(surface, scaling_factor)
+        entry = (surface, image, pygame.mask.from_surface(image))
+        _sprite_cache[key] = entry
+    return entry[1], entry[2]
+
+def register_scaled(surface, scaling_factor, image):
+    """Seeds the cache with a copy of surface that was scaled ahead of time (asset bundle)."""
+    _sprite_cache[(id(surface), scaling_factor)] = (surface, image, pygame.mask.from_surface(image))
+
+def flipped_image(image):
+    """Returns a shared vertically flipped copy of image."""
+    entry = _flip_cache.get(id(image))
+    if entry is None:
+        entry = (image, pygame.transform.flip(image, False, True))
+        _flip_cache[id(image)] = entry
+    return entry[1]
+
+def particle_image(color, size):
+    """Returns the shared square for a particle of this color and size. Never draw into it."""
+    image = _particle_cache.get((color, size))
+    if image is None:
+        image = _particle_cache[(color, size)] = pygame.Surface((size, size))
+        image.fill(color)
+    return image
+
+class CompactSprite:
+    """The part of pygame.sprite.Sprite that sprite groups use, in __slots__.
+
+    Sprite has an instance dict and keeps its groups in a set (over 200 bytes even when
+    empty). An entity is in one or two groups at a time, so a tuple does, and subclasses
+    declare their attributes in __slots__, so no instance carries a dict. Groups take
+    anything with add_internal/remove_internal: the isinstance(Sprite) check in
+    Group.add fails and it falls back to them, a couple of microseconds per add. Particles,
+    added by the dozen, are added from the sprite side (particle.add(group)) instead.
+    """
+    __slots__ = ("_groups",)
+
+    def __init__(self):
+        self._groups = ()
+
+    def add(self, *groups):
+        for group in groups:
+            if hasattr(group, "_spritegroup"):
+                if group not in self._groups:
+                    group.add_internal(self)
+                    self.add_internal(group)
+            else:
+                self.add(*group)
+
+    def remove(self, *groups):
+        for group in groups:
+            if hasattr(group, "_spritegroup"):
+                if group in self._groups:
+                    group.remove_internal(self)
+                    self.remove_internal(group)
+            else:
+                self.remove(*group)
+
+    def add_internal(self, group):
+        self._groups += (group,)
+
+    def remove_internal(self, group):
+        self._groups = tuple(g for g in self._groups if g is not group)
+
+    def kill(self):
+        for group in self._groups:
+            group.remove_internal(self)
+        self._groups = ()
+
+    def groups(self):
+        return list(self._groups)
+
+    def alive(self):
+        return bool(self._groups)
+
+    def update(self, *args, **kwargs):
+        pass
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} Sprite(in {len(self._groups)} groups)>"
+
+class Entity(CompactSprite):
+    __slots__ = ("image", "mask", "rect", "pos_x", "pos_y")
 
-        self.mask = pygame.mask.from_surface(self.image)
+    def __init__(self, surface, x, y, scaling_factor=1.0):
+        super().__init__()
+        self.image, self.mask = prepare_sprite(surface, scaling_factor)
         self.rect = self.image.get_rect()
 
         self.pos_x = float(x)
@@ -28,6 +120,8 @@ class Entity(pygame.sprite.Sprite):
         self.rect.y = int(self.pos_y)
 
 class Bullet(Entity):
+    __slots__ = ("speed", "direction")
+
     def __init__(self, surface, x, y, direction = -1):
         """direction: -1 for UP, 1 for down"""
         super().__init__(surface, x, y, scaling_factor=.5)
@@ -51,29 +145,29 @@ class Bullet(Entity):
             self.kill()
 
 class Player(Entity):
+    __slots__ = ("original_image", "accel", "friction", "max_speed", "velocity")
+
     def __init__(self, surface):
         super().__init__(surface, PLAYER_START_X, PLAYER_START_Y, 2)
-        self.original_image = pygame.transform.scale_by(surface, 2)
+        self.original_image = self.image
 
         self.accel = PLAYER_ACCEL
         self.friction = PLAYER_FRICTION
         self.max_speed = PLAYER_MAX_SPEED
         self.velocity = 0.0
 
-    def move(self, dt):
+    def move(self):
+        """Settles the tilt and hitbox after handle_input has flown the ship."""
         # Speed Cap
         if abs(self.velocity) > self.max_speed:
             self.velocity = math.copysign(self.max_speed, self.velocity)
 
-        # Apply Velocity
-        self.pos_x += self.velocity * dt
-
-        # 5. Boundary Check
+        # 5. Boundary Check (handle_input already stops at the walls; this only catches rounding)
         if self.pos_x < 0:
             self.pos_x = 0
             self.velocity = 0
-        elif self.pos_x > SCREEN_WIDTH - self.rect.width:
-            self.pos_x = SCREEN_WIDTH - self.rect.width
+        elif self.pos_x > self.right_wall():
+            self.pos_x = self.right_wall()
             self.velocity = 0
 
         # Tilt
@@ -84,28 +178,91 @@ class Player(Entity):
         self.rect = self.image.get_rect(center=self.rect.center)
         self.rect.x = int(self.pos_x)
 
-    def handle_input(self, keys):
+    def right_wall(self):
+        # The untilted width: the tilted rect is wider the faster the last frame flew,
+        # which would put the wall somewhere else at every frame rate
+        return SCREEN_WIDTH - self.original_image.get_width()
+
+    def handle_input(self, keys, dt):
+        """Flies the ship through this frame's thrust and friction.
+
+        accel is in px/s^2 and friction a share of it. Every stretch of the frame (left held,
+        right held, coasting) is integrated exactly, up to the speed cap, a standstill or a
+        wall, so the ship takes the same path at 60, 144 or 240 Hz or uncapped.
+        """
         # Handle Input
-        if keys[pygame.K_LEFT]:
-            self.velocity -= self.accel
-        elif keys[pygame.K_RIGHT]:
-            self.velocity += self.accel
-        else:
+        # Keys may also hold the share of the frame each one was down (latency.LatchedKeys);
+        # plain bools from get_pressed() count as 0 or 1, left winning over right.
+        left = keys[pygame.K_LEFT]
+        right = 0 if left >= 1 else keys[pygame.K_RIGHT]
+        if left:
+            self.accelerate(-self.accel, left * dt)
+        if right:
+            self.accelerate(self.accel, right * dt)
+
+        coast = 1 - left - right
+        if coast > 0 and self.velocity:
             # Friction (linear lerp)
-            if self.velocity > 0:
-                self.velocity = max(0, self.velocity - self.accel * self.friction)
-            if self.velocity < 0:
-                self.velocity = min(0, self.velocity + self.accel * self.friction)
+            self.accelerate(-math.copysign(self.accel * self.friction, self.velocity), coast * dt, 0.0)
+
+    def accelerate(self, accel, duration, stop=None):
+        """Flies for duration seconds while the velocity changes at accel px/s^2.
+
+        The velocity holds once it reaches stop (default: the speed cap in accel's direction).
+        A wall stops the ship dead; thrust away from it carries on from there.
+        """
+        start = self.velocity
+        heading = start or accel
+        if (self.pos_x <= 0 and heading < 0) or (self.pos_x >= self.right_wall() and heading > 0):
+            self.velocity = 0.0  # Pushing into the wall it stands against
+            return
+        if stop is None:
+            stop = math.copysign(self.max_speed, accel)
+        # Seconds the velocity changes for before it gets to stop; it holds from then on
+        ramp = duration if not accel else min(duration, max(0.0, (stop - start) / accel))
+        end = start + accel * ramp
+
+        contact = self.wall_contact(start, accel, ramp, end, duration)
+        if contact is None:
+            self.pos_x += (start + end) / 2 * ramp + end * (duration - ramp)
+            self.velocity = end
+            return
+        t, self.pos_x = contact
+        self.velocity = 0.0
+        if stop:
+            self.accelerate(accel, duration - t, stop)
+
+    def wall_contact(self, start, accel, ramp, end, duration):
+        """The first (seconds, wall x) at which accelerate's path meets a wall, or None."""
+        contacts = []
+        covered = (start + end) / 2 * ramp
+        for wall in (0, self.right_wall()):
+            gap = wall - self.pos_x
+            # While ramping: start * t + accel * t^2 / 2 = gap
+            if accel:
+                disc = start * start + 2 * accel * gap
+                if disc >= 0:
+                    for t in ((-start - math.sqrt(disc)) / accel, (-start + math.sqrt(disc)) / accel):
+                        if 0 < t <= ramp:
+                            contacts.append((t, wall))
+            elif start and 0 < gap / start <= ramp:
+                contacts.append((gap / start, wall))
+            # Then at the steady velocity
+            if end and ramp < duration and ramp < ramp + (gap - covered) / end <= duration:
+                contacts.append((ramp + (gap - covered) / end, wall))
+        return min(contacts, default=None)
 
     def update(self, dt, keys):
-        self.handle_input(keys)
-        self.move(dt)
+        self.handle_input(keys, dt)
+        self.move()
 
 class Enemy(Entity):
+    __slots__ = ("points", "base_vx", "vx", "vy")
+
     def __init__(self, surface, x, y, points=ENEMY_POINTS_NORMAL):
         super().__init__(surface, x, y, 2)
 
-        self.image = pygame.transform.flip(self.image, False, True)
+        self.image = flipped_image(self.image)
         self.points = points
 
         # Override initial positions from super
@@ -147,31 +304,34 @@ class Enemy(Entity):
         self.rect.y = int(self.pos_y)
 
 class ShooterEnemy(Enemy):
-    def __init__(self, surface, x, y, bullet_img):
+    __slots__ = ("bullet_img", "shoot_timer", "shoot_interval", "fire_timer")
+
+    def __init__(self, surface, x, y, bullet_img, shoot_timer=None):
         super().__init__(surface, x, y, points=ENEMY_POINTS_SHOOTER)
         self.bullet_img = bullet_img
 
         # ---- Shooting Setup
-        self.shoot_timer = random.uniform(0.5, 2.0)
+        # The countdown itself lives in the game's Scheduler (fire_timer); shoot_timer is
+        # only the delay before the first shot once the enemy is armed.
+        if shoot_timer is None:
+            shoot_timer = random.uniform(0.5, 2.0)
+        self.shoot_timer = shoot_timer
         self.shoot_interval = 2.5
+        self.fire_timer = None
 
-    def update(self, speed_multiplier, dt, bullet_group):
-        super().update(speed_multiplier, dt)
-
-        self.shoot_timer -= dt
-        if self.shoot_timer <= 0:
-            self.shoot_timer = self.shoot_interval + random.uniform(-0.5, 0.5)
-            self.fire(bullet_group)
+    def next_shot_delay(self):
+        return self.shoot_interval + random.uniform(-0.5, 0.5)
 
     def fire(self, bullet_group):
         b = Bullet(self.bullet_img, self.rect.centerx, self.rect.bottom, direction=1)
         bullet_group.add(b)
 
-class Particle(pygame.sprite.Sprite):
+class Particle(CompactSprite):
+    __slots__ = ("image", "rect", "pos_x", "pos_y", "size", "color", "vel_x", "vel_y", "max_lifetime", "lifetime")
+
     def __init__(self, x, y ,color, velocity=None, lifetime=0.5, size=8):
         super().__init__()
-        self.image = pygame.Surface((size, size))
-        self.image.fill(color)
+        self.image = particle_image(color, size)
         self.rect = self.image.get_rect(center=(x, y))
 
         self.pos_x = float(x)
@@ -204,10 +364,11 @@ class Particle(pygame.sprite.Sprite):
 
         # Shrink over time: start at original size and go to 0
         current_size = max(1, int(self.size * (self.lifetime / self.max_lifetime)))
-        self.image = pygame.Surface((current_size, current_size))
-        self.image.fill(self.color)  # You'll need to store self.color and self.size in __init__
+        self.image = particle_image(self.color, current_size)
 
 class UFO(Entity):
+    __slots__ = ("points", "speed", "direction")
+
     def __init__(self, surface, side="left"):
         # side: "left" starts at x=0, moves right. "right" starts at x=width, moves left.
         y = 30
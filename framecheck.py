@@ -0,0 +1,184 @@
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+import pygame
+
+from settings import *
+from controls import ScriptedPad
+
+# Reference frames checked into the repo: the visual gate for rendering work on
+# draw_parallax, the overlays, text caching and PostProcessor. A change must leave every
+# scene within tolerance of its reference; --record rewrites them (and the timings the
+# report compares against) when the look is meant to change.
+FRAMES_DIR = get_path("golden/frames")
+TIMINGS_FILE = "timings.json"
+TICKS = 123456  # Fixed pygame clock for the pulsing danger zone
+
+
+def _scene_menu(lang):
+    def setup(game):
+        game.state = "MENU"
+        game.locale.current_lang = lang
+        game.menu_options = [game.locale.get("start"), game.locale.get("quit")]
+        game.menu_index = 1
+    return setup
+
+
+def _play(game, ticks=240):
+    """Deterministic mid-game state: a fixed seed and a scripted pad."""
+    game.locale.current_lang = game.locale.lang_codes[0]
+    random.seed(5)
+    game.versus = False
+    game.state = "PLAYING"
+    game.reset_game_state_vars()
+    pad = ScriptedPad(5)
+    for _ in range(ticks):
+        game.step(1.0 / 60, pad.next_input())
+    game.state = "PLAYING"  # A scripted death would end the scene early; keep playing
+
+
+def _scene_playing(game):
+    _play(game)
+
+
+def _scene_danger(game):
+    _play(game)
+    # Pull the wave down to the invasion line: red floor, pulsing line and the breach alert
+    for enemy in list(game.enemies)[:3]:
+        enemy.rect.bottom = COLLISION_DISTANCE - 20
+
+
+def _scene_paused(game):
+    _play(game)
+    game.state = "PAUSED"
+
+
+def _scene_game_over(game):
+    _play(game)
+    game.state = "GAME_OVER"  # Direct: change_state would save the high score
+
+
+SCENES = {f"menu_{lang}": _scene_menu(lang) for lang in ("en", "la", "es", "fr", "de")}
+SCENES.update({
+    "playing": _scene_playing,
+    "danger_zone": _scene_danger,
+    "paused": _scene_paused,
+    "game_over": _scene_game_over,
+})
+
+
+def render_scene(game, name, repeat=1):
+    """Sets up a scene and renders it off-screen repeat times. Returns (frame copy, median ms).
+
+    Everything random or machine-specific that reaches the screen is pinned first: the
+    starfield and particle RNGs, the FX RNG behind shake and flicker, the clock, the FPS
+    counter and the high score. Each repeat
+    re-seeds the FX, so every repeat draws the same frame.
+    """
+    game.star_rng.seed(0)
+    for layer in game.star_layers:
+        for star in layer["stars"]:
+            star[:] = [game.star_rng.randint(0, SCREEN_WIDTH), game.star_rng.randint(0, SCREEN_HEIGHT)]
+    game.particle_rng.seed(0)
+    game.particles.empty()
+    game.high_score = 12345  # Not whatever highscore.txt holds on this machine
+    SCENES[name](game)
+    snapshot = game.capture_render_state()._replace(ticks=TICKS, fps=FPS)
+
+    times = []
+    for _ in range(repeat):
+        game.fx.rng.seed(0)
+        game.fx.shake_intensity = 0
+        start = time.perf_counter()
+        game.render_frame(snapshot)
+        times.append((time.perf_counter() - start) * 1000.0)
+    return game.screen.copy(), statistics.median(times)
+
+
+def compare(reference, frame, tolerance):
+    """Returns (pixels over tolerance, Rect around them or None, the |reference - frame| Surface)."""
+    diff = reference.copy()
+    diff.blit(frame, (0, 0), special_flags=pygame.BLEND_RGB_SUB)
+    other = frame.copy()
+    other.blit(reference, (0, 0), special_flags=pygame.BLEND_RGB_SUB)
+    diff.blit(other, (0, 0), special_flags=pygame.BLEND_RGB_ADD)  # |reference - frame| per channel
+    # Set where every channel is within tolerance
+    over = pygame.mask.from_threshold(diff, (0, 0, 0, 255), (tolerance + 1, tolerance + 1, tolerance + 1, 255))
+    over.invert()
+    bad = over.count()
+    if not bad:
+        return 0, None, diff
+    rects = over.get_bounding_rects()
+    return bad, rects[0].unionall(rects[1:]), diff
+
+
+def write_diff(path, reference, frame, diff):
+    """Saves reference | current | difference (amplified x8) side by side."""
+    width, height = reference.get_size()
+    sheet = pygame.Surface((width * 3, height))
+    sheet.blit(reference, (0, 0))
+    sheet.blit(frame, (width, 0))
+    for _ in range(3):
+        diff.blit(diff, (0, 0), special_flags=pygame.BLEND_RGB_ADD)
+    sheet.blit(diff, (width * 2, 0))
+    pygame.image.save(sheet, path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Renders scripted scenes off-screen and compares them to reference frames")
+    parser.add_argument("--scene", nargs="+", choices=list(SCENES), default=list(SCENES))
+    parser.add_argument("--tolerance", type=int, default=0, help="allowed difference per colour channel (0-255)")
+    parser.add_argument("--repeat", type=int, default=20, help="renders per scene for the timing")
+    parser.add_argument("--record", action="store_true", help="rewrite the reference frames and timings")
+    parser.add_argument("--frames", default=FRAMES_DIR, help="directory of the reference frames")
+    parser.add_argument("--diffs", default="framecheck_diffs", help="where diff images go on failure")
+    args = parser.parse_args()
+
+    from game import GameManager
+    game = GameManager(headless=True, governor=False)
+
+    timings_path = os.path.join(args.frames, TIMINGS_FILE)
+    recorded = {}
+    if os.path.exists(timings_path):
+        with open(timings_path) as f:
+            recorded = json.load(f)
+
+    failed = False
+    timings = {}
+    for name in args.scene:
+        frame, ms = render_scene(game, name, args.repeat)
+        timings[name] = round(ms, 3)
+        path = os.path.join(args.frames, f"{name}.png")
+        before = f" (recorded {recorded[name]:.2f} ms)" if name in recorded else ""
+        if args.record:
+            os.makedirs(args.frames, exist_ok=True)
+            pygame.image.save(frame, path)
+            print(f"{name:<12} recorded  {ms:7.2f} ms")
+            continue
+        if not os.path.exists(path):
+            failed = True
+            print(f"{name:<12} NO REFERENCE (run with --record)")
+            continue
+        reference = pygame.image.load(path).convert()
+        bad, box, diff = compare(reference, frame, args.tolerance)
+        if bad:
+            failed = True
+            os.makedirs(args.diffs, exist_ok=True)
+            diff_path = os.path.join(args.diffs, f"{name}.png")
+            write_diff(diff_path, reference, frame, diff)
+            print(f"{name:<12} DIFFERS   {ms:7.2f} ms{before}: {bad} pixels over tolerance in {tuple(box)}, "
+                  f"see {diff_path}")
+        else:
+            print(f"{name:<12} OK        {ms:7.2f} ms{before}")
+
+    if args.record:
+        recorded.update(timings)
+        with open(timings_path, "w") as f:
+            json.dump(recorded, f, indent=2)
+            f.write("\n")
+    sys.exit(1 if failed else 0)
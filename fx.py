@@ -1,16 +1,51 @@
 import pygame
 import random
-from settings import SCREEN_WIDTH, SCREEN_HEIGHT
+from concurrent.futures import ThreadPoolExecutor
+from settings import SCREEN_WIDTH, SCREEN_HEIGHT, FX_THREADS, SHAKE_DECAY
 
 class PostProcessor:
-    def __init__(self):
+    def __init__(self, size=(SCREEN_WIDTH, SCREEN_HEIGHT), threads=FX_THREADS):
+        self._pool = None
+        self.resize(size)
+        self.set_threads(threads)
 
-        self.crt_texture = self._create_crt_lines()
-        self.vignette = self._create_vignette()
+        # Own RNG so effects never consume the gameplay random stream
+        # (the renderer may run on another thread, see pipeline.py)
+        self.rng = random.Random()
+
+        # Optional extras, switched off by the quality governor on slow machines
+        self.aberration = True
+        self.flicker = True
 
         # Shake state
         self.shake_intensity = 0
-        self.shake_decay = 0.9
+        self.shake_decay = SHAKE_DECAY  # Share of the shake left after one second
+
+        self.flicker_color = (20, 30, 20)
+
+    def resize(self, size):
+        """Rebuilds the overlay textures for a new internal render size."""
+        self.width, self.height = size
+        # Offsets are tuned for the full 1280x720 frame; keep them proportional
+        self.scale = self.width / SCREEN_WIDTH
+        self.aberration_shift = max(1, round(2 * self.scale))
+
+        self.crt_texture = self._create_crt_lines()
+        self.vignette = self._create_vignette()
+        self._bands = None  # Band subsurfaces, rebuilt for the new size on the next render
+
+    def set_threads(self, threads):
+        """Splits render() into `threads` horizontal bands composed in parallel (0 or 1: serial).
+
+        pygame releases the GIL inside blits and fills, so the bands really run side by side.
+        Every band blits from and to its own subsurfaces: SDL caches blit mappings on the
+        source surface, which two threads must never share.
+        """
+        if self._pool is not None:
+            self._pool.shutdown()
+        self.threads = threads
+        self._pool = ThreadPoolExecutor(threads, thread_name_prefix="fx") if threads > 1 else None
+        self._bands = None
 
     def trigger_shake(self, intensity, duration=.5):
         """Public method to start a screen shake."""
@@ -30,25 +65,48 @@ class PostProcessor:
 
     def _create_crt_lines(self):
         """Internal helper to build the scanline texture."""
-        crt_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        crt_surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
         line_color = (10, 10, 10, 80)
 
-        for y in range(0, SCREEN_HEIGHT, 3):
-            pygame.draw.line(crt_surface, line_color, (0, y), (SCREEN_WIDTH, y))
+        for y in range(0, self.height, 3):
+            pygame.draw.line(crt_surface, line_color, (0, y), (self.width, y))
 
         return crt_surface
 
     def _create_vignette(self):
         """Internal helper to build the vignette shadow."""
-        vignette_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        vignette_surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        shrink = 1.5 * self.scale
+        border = max(1, round(25 * self.scale))
+        radius = max(1, round(10 * self.scale))
 
         for i in range(0, 100, 10):
             alpha = 150 - (i * 1.5)
             pygame.draw.rect(vignette_surface, (0, 0, 0, alpha),
-                             vignette_surface.get_rect().inflate(-i * 1.5, -i * 1.5), 25, border_radius=10)
+                             vignette_surface.get_rect().inflate(-i * shrink, -i * shrink), border, border_radius=radius)
 
         return vignette_surface
 
+    def update(self, dt):
+        """Decays the shake by the time that passed, so it dies out as fast at any frame rate."""
+        if self.shake_intensity > 0.1:
+            self.shake_intensity *= self.shake_decay ** dt
+
+    def shake_offset(self):
+        """This frame's shake offset in render pixels."""
+        shake_x, shake_y = 0, 0
+        if self.shake_intensity > 0.1:
+            shake_x = self.rng.randint(-int(self.shake_intensity), int(self.shake_intensity))
+            shake_y = self.rng.randint(-int(self.shake_intensity), int(self.shake_intensity))
+            shake_x, shake_y = round(shake_x * self.scale), round(shake_y * self.scale)
+        return shake_x, shake_y
+
+    def flicker_alpha(self):
+        """Rolls this frame's random flicker: its alpha, or None when it doesn't fire."""
+        if self.flicker and self.rng.randint(0, 100) > 90:
+            return self.rng.randint(5, 12)
+        return None
+
     def render(self, game_surface, final_screen):
         """
                 Applies all effects to the game_surface and blits to final_screen.
@@ -58,30 +116,94 @@ class PostProcessor:
                     final_screen: The actual Pygame display surface.
                 """
         # 1. Calculate Shake Offsets
-        shake_x, shake_y = 0, 0
-        if self.shake_intensity > 0.1:
-            shake_x = random.randint(-int(self.shake_intensity), int(self.shake_intensity))
-            shake_y = random.randint(-int(self.shake_intensity), int(self.shake_intensity))
-            self.shake_intensity *= self.shake_decay
+        shake_x, shake_y = self.shake_offset()
 
         # 2. Random Flicker (Atmospheric lighting)
-        if random.randint(0, 100) > 90:
-            flicker = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-            flicker.set_alpha(random.randint(5, 12))
-            flicker.fill((20, 30, 20))
+        alpha = self.flicker_alpha()
+        if self._pool is not None:
+            self._render_bands(game_surface, final_screen, shake_x, shake_y, alpha)
+            return
+        if alpha is not None:
+            flicker = pygame.Surface((self.width, self.height))
+            flicker.set_alpha(alpha)
+            flicker.fill(self.flicker_color)
             game_surface.blit(flicker, (0, 0), special_flags=pygame.BLEND_RGB_ADD)
 
         # 3. Clear screen to black before drawing (prevents trails during shake)
         final_screen.fill((0, 0, 0))
 
-        # 4. Chromatic Aberration (The "Glitch" RGB Split)
-        # Red Channel (shifted left)
-        final_screen.blit(game_surface, (-2 + shake_x, 0 + shake_y), special_flags=pygame.BLEND_RGB_ADD)
-        # Green Channel (shifted right)
-        final_screen.blit(game_surface, (2 + shake_x, 0 + shake_y), special_flags=pygame.BLEND_RGB_ADD)
-        # Blue/Original Channel (centered)
-        final_screen.blit(game_surface, (0 + shake_x, 0 + shake_y), special_flags=pygame.BLEND_RGB_MULT)
-
-        # 5. Static Overlays (Vignette & CRT)
-        final_screen.blit(self.crt_texture, (0, 0))
-        final_screen.blit(self.vignette, (0, 0))
+        # 4 + 5 go out as a single Surface.blits call
+        shift = self.aberration_shift
+        if self.aberration:
+            frame = (
+                # 4. Chromatic Aberration (The "Glitch" RGB Split)
+                # Red Channel (shifted left)
+                (game_surface, (-shift + shake_x, 0 + shake_y), None, pygame.BLEND_RGB_ADD),
+                # Green Channel (shifted right)
+                (game_surface, (shift + shake_x, 0 + shake_y), None, pygame.BLEND_RGB_ADD),
+                # Blue/Original Channel (centered)
+                (game_surface, (0 + shake_x, 0 + shake_y), None, pygame.BLEND_RGB_MULT),
+            )
+        else:
+            frame = ((game_surface, (shake_x, shake_y)),)
+
+        final_screen.blits(frame + (
+            # 5. Static Overlays (Vignette & CRT)
+            (self.crt_texture, (0, 0)),
+            (self.vignette, (0, 0)),
+        ), doreturn=False)
+
+    # ---- Band-Parallel Render ----
+    # Same steps as render(), one horizontal band of the output per task. A band's rows
+    # only depend on its own pixels in each step, so splitting the frame changes nothing
+    # in the output; only the shake moves rows between bands, which is why the game
+    # surface is read through a per-band subsurface of exactly the rows that land in it.
+
+    def _band_targets(self, game_surface, final_screen):
+        if self._bands is None or self._bands[0] is not game_surface or self._bands[1] is not final_screen:
+            rows = [round(i * self.height / self.threads) for i in range(self.threads + 1)]
+            bands = []
+            for top, bottom in zip(rows, rows[1:]):
+                area = (0, top, self.width, bottom - top)
+                bands.append((top, bottom - top,
+                              game_surface.subsurface(area), final_screen.subsurface(area),
+                              self.crt_texture.subsurface(area), self.vignette.subsurface(area),
+                              pygame.Surface((self.width, bottom - top))))  # Flicker fill for this band
+            self._bands = (game_surface, final_screen, bands)
+        return self._bands[2]
+
+    def _flicker_band(self, band, alpha):
+        _, _, game_band, _, _, _, flicker = band
+        flicker.set_alpha(alpha)
+        flicker.fill(self.flicker_color)
+        game_band.blit(flicker, (0, 0), special_flags=pygame.BLEND_RGB_ADD)
+
+    def _compose_band(self, band, game_surface, offsets):
+        top, height, _, dest, crt, vignette, _ = band
+        dest.fill((0, 0, 0))
+        for x, y, flags in offsets:
+            # Rows of the game surface that land in this band at this offset
+            first = max(0, top - y)
+            last = min(self.height, top + height - y)
+            if last > first:
+                source = game_surface.subsurface((0, first, self.width, last - first))
+                dest.blit(source, (x, y + first - top), None, flags)
+        dest.blits(((crt, (0, 0)), (vignette, (0, 0))), doreturn=False)
+
+    def _render_bands(self, game_surface, final_screen, shake_x, shake_y, alpha):
+        bands = self._band_targets(game_surface, final_screen)
+        if alpha is not None:
+            # The flicker has to be on every band before any band is composed: a shake reads across bands
+            for _ in self._pool.map(self._flicker_band, bands, [alpha] * len(bands)):
+                pass
+
+        shift = self.aberration_shift
+        if self.aberration:
+            offsets = ((-shift + shake_x, shake_y, pygame.BLEND_RGB_ADD),
+                       (shift + shake_x, shake_y, pygame.BLEND_RGB_ADD),
+                       (shake_x, shake_y, pygame.BLEND_RGB_MULT))
+        else:
+            offsets = ((shake_x, shake_y, 0),)
+        for _ in self._pool.map(self._compose_band, bands, [game_surface] * len(bands),
+                                [offsets] * len(bands)):
+            pass
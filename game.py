@@ -1,39 +1,86 @@
+import argparse
+import asyncio
+import os
+import socket
+import time
+from collections import deque
 import pygame
 import random
 import math
 from pygame import mixer
 from settings import *
-from entities import Player, Bullet, Enemy, ShooterEnemy, Particle, UFO
+from entities import Player, Bullet, Particle, ShooterEnemy, UFO, register_scaled
+from asset_bundle import load_sprites
 from fx import PostProcessor
 from audio import AudioManager
 from locale_manager import LocaleManager
+from pipeline import RenderPipeline, RenderSnapshot
+from render_queue import (RenderQueue, SPRITE_LAYERS, LAYER_BACKGROUND, LAYER_STARS, LAYER_BACKGROUND_OVER,
+                          LAYER_OVERLAY, LAYER_DANGER, LAYER_HUD)
+from texture_renderer import TextureRenderer
+from savestate import STATES, pack_state, unpack_state
+from waves import WavePrefetcher
+from scheduler import Scheduler
+from governor import QUALITY_TIERS, QualityGovernor
+from latency import LatchedInput
+from async_loop import AsyncFramePacer
+from controls import INPUT_FIRE, InputKeys, sample_input
+from netplay import RollbackSession, UdpTransport, connect
+from telemetry import (Telemetry, open_sink, CAUSES, TARGET_UFO, SHOT, HIT, KILL, UFO_SPAWN, UFO_KILL, DEATH,
+                       LEVEL_UP, STATE, FRAME, LANGUAGE, QUALITY)
+from profiler import SamplingProfiler
+from spectator import SpectatorPublisher
+from capture import FrameCapture
+from memreport import memory_report
 
 class GameManager:
-    def __init__(self):
+    def __init__(self, pipelined=PIPELINED_RENDER, render_scale=RENDER_SCALE, headless=False,
+                 governor=QUALITY_GOVERNOR, low_latency=LOW_LATENCY, idle_fps=IDLE_FPS,
+                 backend=RENDER_BACKEND, accelerated=RENDER_ACCELERATED, fps=FPS):
         # Pygame Initialization
+        if headless:
+            # No window or sound card needed (bots, netplay harness, benchmarks)
+            os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+            os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+            # Leave SIGINT/SIGTERM to Python, so Ctrl+C and process pools can stop headless games
+            os.environ.setdefault("SDL_NO_SIGNAL_HANDLERS", "1")
         pygame.mixer.pre_init(44100, -16, 2, 512)
         pygame.init()
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        if backend == "texture":
+            # The SDL Renderer opens its own window. The display module only keeps a hidden
+            # 1x1 one, because convert()/convert_alpha() need a video mode to convert to.
+            self.screen = pygame.display.set_mode((1, 1), pygame.HIDDEN)
+            self.textures = TextureRenderer(TITLE, (SCREEN_WIDTH, SCREEN_HEIGHT), accelerated)
+            if pipelined:
+                print("Texture renderer draws on the main thread only; --pipelined ignored")
+                pipelined = False
+        else:
+            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+            self.textures = None
         pygame.display.set_caption(TITLE)
         self.clock = pygame.time.Clock()
         self.locale = LocaleManager()
         self.running = True
+        self.pipelined = pipelined
+        self.headless = headless
+        self.low_latency = low_latency
+        self.idle_fps = idle_fps
+        self.next_idle_refresh = 0
+        self.fps = fps  # Frame rate run() paces to; 0 is uncapped. Gameplay is time-based, so it handles the same
 
         self.fx = PostProcessor()
 
         # ---- Assets ----
-        self.main_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        self.assets = {
-            "player": pygame.image.load(get_path("assets/spaceship_2.png",)).convert_alpha(),
-            "enemy": pygame.image.load(get_path("assets/invadership.png",)).convert_alpha(),
-            "enemy_shooter": pygame.image.load(get_path("assets/invadership_shooter.png")).convert_alpha(),
-            "bullet": pygame.image.load(get_path("assets/spaceMissile.png",)).convert_alpha(),
-            "ufo": pygame.image.load(get_path("assets/ufo.png")).convert_alpha(),
-            "bg": pygame.image.load(get_path("assets/earth_bg_1_transparent.png")).convert_alpha()
-        }
+        # Memory-mapped from the packed bundle when it is current, decoded from the PNGs otherwise
+        self.assets, scaled_assets = load_sprites()
+        for (key, factor), image in scaled_assets.items():
+            register_scaled(self.assets[key], factor, image)
+        # Versus rival: the player ship with a red tint
+        self.assets["rival"] = self.assets["player"].copy()
+        self.assets["rival"].fill((255, 110, 110), special_flags=pygame.BLEND_RGB_MULT)
 
         # ---- Music and Audio ----
-        self.audio = AudioManager(self.assets)
+        self.audio = AudioManager(self.assets, load_music=not headless)
         self.audio.play_music("menu")
 
         # ---- Font ----
@@ -45,15 +92,53 @@ class GameManager:
         self.high_score = self.load_high_score()
 
         self.levels_per_difficulty = 50
-        self.difficulty_step = 0.2
-
-        self.hud_bullet = pygame.transform.scale_by(self.assets["bullet"], 0.75)
+        # Balance knobs (balance.py overrides them per experiment)
+        self.difficulty_step = DIFFICULTY_STEP
+        self.shooter_chance = SHOOTER_CHANCE
+        self.shooter_min_level = SHOOTER_MIN_LEVEL
+        self.start_bullet_stock = BULLET_STOCK
+        self.start_recharge_time = BULLET_RECHARGE_TIME
+
+        self.hud_bullet = scaled_assets.get(("bullet", 0.75))
+        if self.hud_bullet is None:
+            self.hud_bullet = pygame.transform.scale_by(self.assets["bullet"], 0.75)
         self.hud_bullet_gray = self.hud_bullet.copy()
         self.hud_bullet_gray.fill((100, 100, 100), special_flags=pygame.BLEND_RGB_MULT)
 
-        self.music_paused_pos = 0.0
+        # ---- Render Queue ----
+        # Every layer is batched and submitted with one Surface.blits call per layer
+        self.render_queue = RenderQueue()
+        self.stats_dests = ((SCREEN_WIDTH - 250, 10), (SCREEN_WIDTH - 250, 40), (SCREEN_WIDTH - 250, 70))
+
+        # Menu separator line, pre-drawn so it can go through the queue like everything else
+        self.scaled_text_cache = {}  # Titles only change with the language; don't re-fit them every frame
+        self.menu_separator = pygame.Surface((SCREEN_WIDTH, 8), pygame.SRCALPHA)
+        pygame.draw.line(self.menu_separator, WHITE, (SCREEN_WIDTH / 2 - 100, 4), (SCREEN_WIDTH / 2 + 100, 4), 2)
+
+        # Translucent fills are built once; only their alpha changes per frame
+        self.dim_overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.dim_overlay.fill((0, 0, 0))
+        self.warning_floor = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT - COLLISION_DISTANCE))
+        self.warning_floor.fill((200, 0, 0))
+        self.danger_line = pygame.Surface((SCREEN_WIDTH, 2))
+        self.danger_line.fill(DANGER_COLOR)
+
+        # ---- Internal Render Resolution ----
+        self.base_render_scale = render_scale  # What was asked for; the governor may render below it
+        self.set_render_scale(render_scale)
+
+        # ---- Quality Governor ----
+        self.quality = QUALITY_TIERS[0]
+        # Budget of one frame at the chosen rate; uncapped runs are judged against FPS
+        self.governor = QualityGovernor(1000.0 / (fps or FPS)) if governor else None
+        self.quality_labels = {tier.name: self.font.render(f"Q: {tier.name}", True, (0, 255, 0))
+                               for tier in QUALITY_TIERS}
+        # Particles are scenery too: their own RNG, so the governor scaling them never shifts gameplay
+        self.particle_rng = random.Random()
 
         # ---- Parallax Setup ----
+        # The starfield is scenery: it draws from its own RNG so it never shifts the gameplay stream
+        self.star_rng = random.Random()
         self.star_layers = []
         # Create 3 layers of stars with different densities and speeds
         for i in range(3):
@@ -61,8 +146,8 @@ class GameManager:
             num_stars = 50 // (i + 1)
             for _ in range(num_stars):
                 # Random (x, y)
-                star_x = random.randint(0, SCREEN_WIDTH)
-                star_y = random.randint(0, SCREEN_HEIGHT)
+                star_x = self.star_rng.randint(0, SCREEN_WIDTH)
+                star_y = self.star_rng.randint(0, SCREEN_HEIGHT)
                 layer_stars.append([star_x, star_y])
 
             # Speed: further stars (index 2) move slower
@@ -70,12 +155,35 @@ class GameManager:
             self.star_layers.append(
                 {"stars": layer_stars, "speed": speed, "color": (150, 150, 150) if i == 0 else WHITE})
 
+        # One tiny pre-filled surface per layer, so stars are blitted instead of rect-drawn
+        self.star_sprites = []
+        for i, layer in enumerate(self.star_layers):
+            star_surf = pygame.Surface((i + 1, i + 1))
+            star_surf.fill(layer["color"])
+            self.star_sprites.append(star_surf)
+
         # ---- State Machine
         self.state = "MENU" # MENU, PLAYING, PAUSED, GAME_OVER
         self.menu_options = [self.locale.get("start"), self.locale.get("quit")]
         self.menu_index = 0
 
+        # ---- Waves ----
+        # The next wave is built on a worker thread so a level-up only swaps it in
+        self.waves = WavePrefetcher(self.assets)
 
+        # ---- Instrumentation ----
+        self.alloc_tracker = None  # AllocationTracker, attached by alloc_tracker.py benchmarks
+        self.telemetry = Telemetry()  # Gameplay event stream; only written out once start_telemetry is called
+        self.frames_governed = 0
+        self.profiler = SamplingProfiler(self)  # F9 starts/stops it; idle until then
+        self.profile_path = None  # --profile target; F9 profiles get a timestamped name in PROFILE_DIR
+        self.spectator = None  # SpectatorPublisher when --spectator feeds a second display
+        self.capture = None  # FrameCapture recording presented frames (--capture, capture.py)
+        self.background_tasks = set()  # Coroutines started with spawn() under run_async
+
+        # ---- Versus ----
+        self.versus = False
+        self.local_is_rival = False  # Which ship this cabinet flies (HUD follows it)
 
         self.reset_game_state_vars()
 
@@ -89,13 +197,10 @@ class GameManager:
             #self.audio.stop_sfx("ufo")  # Kill UFO sound immediately on exit
             pass
 
-        if self.state == "PAUSED":
-            self.music_paused_pos = self.audio.get_music_pos()
-
         # --- UPDATE THE STATE --
         previous_state = self.state
         self.state = new_state
-        print(f"DEBUG: State changed to {self.state}")  # Helpful for development
+        self.telemetry.record(STATE, STATES.index(self.state))
 
         # --- ENTRY LOGIC (Things that happen ONCE when entering a state) ---
         if self.state == "MENU":
@@ -109,9 +214,8 @@ class GameManager:
             if previous_state == "PAUSED":
                 self.audio.unpause_sfx()
 
-                # 2. Resume Battle Music (from saved spot)
-                # Note: We use the 'start' parameter to jump back to where we were
-                self.audio.play_music("playing", fade_ms=500, start=self.music_playing_pos)
+                # 2. Resume Battle Music (it was only faded out, so it picks up where it stopped)
+                self.audio.play_music("playing", fade_ms=500, resume=True)
             else:
                 # This is a fresh start (from Menu or Game Over)
                 self.audio.play_music("playing", fade_ms=1000)
@@ -119,14 +223,11 @@ class GameManager:
                 self.start_new_game()  # Helper to spawn initial enemies and reset player
 
         elif self.state == "PAUSED":
-            # 1. Save current battle music position
-            self.music_playing_pos = self.audio.get_music_pos()
-
-            # 2. Freeze the UFO/Explosions
+            # 1. Freeze the UFO/Explosions
             self.audio.pause_sfx()
 
-            # 3. Play the Pause Music (Reuse menu track or a specific 'elevator' track)
-            self.audio.play_music("menu", fade_ms=500, start=self.music_paused_pos)
+            # 2. Crossfade to the Pause Music (Reuse menu track, resumed where the last pause left it)
+            self.audio.play_music("menu", fade_ms=500, resume=True)
 
         elif self.state == "GAME_OVER":
             self.audio.play_music("game_over", loops=0)
@@ -136,16 +237,23 @@ class GameManager:
         """Resets variables, but does not necessarily start the game logic immediately."""
         self.score = 0
         self.level = 1
+        self.death_cause = None
         self.speed_multiplier = 1.0
 
-        self.max_bullet_stock = 3
+        # ---- Timers ----
+        # timers: the gameplay clock (shooter fire, missile recharge). It stops while PAUSED
+        # or frozen, because update_playing only advances it when the battle is running.
+        # round_timers: keeps running through a freeze (UFO arrivals, the freeze itself).
+        self.timers = Scheduler()
+        self.round_timers = Scheduler()
+
+        self.max_bullet_stock = self.start_bullet_stock
         self.current_bullet_stock = self.max_bullet_stock
-        self.bullet_recharge_time = 1.0  # Seconds per bullet
-        self.recharge_timer = 0.0
+        self.bullet_recharge_time = self.start_recharge_time  # Seconds per bullet
+        self.recharge_timer = None  # Pending recharge of the next missile, if below max stock
 
-        self.freeze_timer = 0.0
-        self.shake_intensity = 0
-        self.shake_decay = 0.9  # How fast the shake stops (0 to 1)
+        self.frozen = False
+        self.freeze_timer = None
 
         # ---- Create Entities ----
         self.bullets = pygame.sprite.Group()
@@ -155,18 +263,52 @@ class GameManager:
         self.particles = pygame.sprite.Group()
 
         self.ufo_group = pygame.sprite.GroupSingle()  # Use GroupSingle because there's usually only one UFO
-        self.ufo_spawn_timer = random.uniform(10.0, 20.0)  # Seconds until next UFO
+        self.ufo_timer = self.round_timers.schedule(random.uniform(10.0, 20.0), self.spawn_ufo)
+        self.ufo_spawn_delay = 0.0  # While a UFO is on screen: wait for the next one once it's gone
+        self.wave_seed = random.getrandbits(32)  # Layout seed of the next wave to spawn
+
+        # ---- Versus Rival (second ship, only exists in a versus match) ----
+        self.player_alive = True
+        self.rival = None
+        self.rival_alive = False
+        self.rival_bullets = pygame.sprite.Group()
+        self.rival_score = 0
+        self.rival_bullet_stock = self.max_bullet_stock
+        self.rival_recharge_timer = None
+        if self.versus:
+            self.rival = Player(self.assets["rival"])
+            self.rival_alive = True
+            for ship, offset in ((self.player, -200), (self.rival, 200)):
+                ship.pos_x = PLAYER_START_X + offset
+                ship.rect.x = int(ship.pos_x)
 
         if self.state == "PLAYING":
             self.spawn_enemies()
             pass
 
+    def start_versus(self, seed, local_is_rival=False):
+        """Starts a two-ship match. Both cabinets call this with the same seed."""
+        random.seed(seed)
+        self.versus = True
+        self.local_is_rival = local_is_rival
+        self.state = "PLAYING"
+        self.audio.play_music("playing", fade_ms=1000)
+        self.reset_game_state_vars()
+
     def start_new_game(self):
         """Called when selecting Start from menu or Restarting."""
         self.change_state("PLAYING")
         self.reset_game_state_vars()
         self.load_high_score()
 
+    def save_state(self):
+        """Captures the full gameplay state (entities, timers, score, RNG) as a compact blob."""
+        return pack_state(self)
+
+    def load_state(self, blob):
+        """Rewinds or resumes to a blob made by save_state."""
+        unpack_state(self, blob)
+
     def load_high_score(self):
         try:
             with open(self.high_score_file, "a+") as f:
@@ -183,27 +325,39 @@ class GameManager:
                 f.write(str(self.high_score))
 
     def create_explosion(self, x, y, color, count=20):
-        for _ in range(count):
-            self.particles.add(Particle(x, y, color))
+        if self.spectator is not None:
+            self.spectator.explosion(x, y, color, count)
+        rng = self.particle_rng
+        for _ in range(max(1, round(count * self.quality.particle_scale))):
+            Particle(x, y, color, velocity=(rng.uniform(-150, 150), rng.uniform(-150, 150))).add(self.particles)
 
     def spawn_enemies(self):
         self.enemies.empty()
         self.bullets.empty()
         self.enemy_bullets.empty()
+        self.rival_bullets.empty()
         self.ufo_group.empty()
         self.update_difficulty()
 
-        for _ in range(5 + self.level):
-            x = random.randint(50, SCREEN_WIDTH - 100)
-            y = random.randint(ENEMY_SPAWN_Y_MIN, ENEMY_SPAWN_Y_MAX)
+        for enemy in self.waves.take(self.level, self.wave_seed, self.shooter_chance, self.shooter_min_level):
+            if isinstance(enemy, ShooterEnemy):
+                enemy.fire_timer = self.timers.schedule(enemy.shoot_timer, self.enemy_fires, enemy)
+            self.enemies.add(enemy)
+        self.start_recharge()  # A new level can raise max_bullet_stock
 
-            if self.level >= 5 and random.random() < 0.3:
-                self.enemies.add(ShooterEnemy(self.assets["enemy_shooter"], x, y, self.assets["bullet"]))
-            else:
-                self.enemies.add(Enemy(self.assets["enemy"], x, y))
+        # Seed the following wave now, so it can be built in the background while this one is played
+        self.wave_seed = random.getrandbits(32)
+        self.waves.prefetch(self.level + 1, self.wave_seed, self.shooter_chance,
+                            self.shooter_min_level)
 
     def render_scaled_text(self, text_string, font_name, max_width, color):
         """Returns a surface that is guaranteed to fit within max_width."""
+        key = (text_string, font_name, max_width, color)
+        if key not in self.scaled_text_cache:
+            self.scaled_text_cache[key] = self._fit_text(text_string, font_name, max_width, color)
+        return self.scaled_text_cache[key]
+
+    def _fit_text(self, text_string, font_name, max_width, color):
         current_size = FONT_SIZE_TITLE  # Start with your default big size
         temp_font = pygame.font.Font(font_name, current_size)
         text_surface = temp_font.render(text_string, True, color)
@@ -216,16 +370,20 @@ class GameManager:
 
         return text_surface
 
-    def handle_events(self):
-        for event in pygame.event.get():
+    def handle_events(self, events=None):
+        for event in pygame.event.get() if events is None else events:
             if event.type == pygame.QUIT:
                 return False
 
             if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_F9:
+                    self.toggle_profiler()
+                if event.key == pygame.K_F10:
+                    print(memory_report(self))
                 if event.key == pygame.K_l:
                     self.locale.toggle_language()
                     self.menu_options = [self.locale.get("start"), self.locale.get("quit")]
-                    print(f"Language changed to: {self.locale.current_lang}")
+                    self.telemetry.record(LANGUAGE, self.locale.lang_codes.index(self.locale.current_lang))
                 # ---- Menu
                 if self.state == "MENU":
                     if event.key == pygame.K_UP:
@@ -246,14 +404,11 @@ class GameManager:
                     if event.key == pygame.K_EQUALS:
                         self.level += 1
                         self.spawn_enemies()
-                        print(f"DEBUG: Advanced to Level {self.level}")
 
 
 
-                    elif event.key == pygame.K_SPACE and self.current_bullet_stock > 0:
-                        self.bullets.add(Bullet(self.assets["bullet"], self.player.rect.centerx, self.player.rect.top))
-                        self.audio.play_sfx("shoot")
-                        self.current_bullet_stock -= 1
+                    elif event.key == pygame.K_SPACE:
+                        self.fire_bullet()
 
                 # ---- PAUSED
                 elif self.state == "PAUSED":
@@ -272,11 +427,86 @@ class GameManager:
 
         return True
 
+    def fire_bullet(self, rival=False):
+        """Launches a missile from a ship if it has one in stock."""
+        if rival:
+            if not self.rival_alive or self.rival_bullet_stock <= 0:
+                return
+            self.rival_bullets.add(Bullet(self.assets["bullet"], self.rival.rect.centerx, self.rival.rect.top))
+            self.rival_bullet_stock -= 1
+            self.telemetry.record(SHOT, 1)
+        else:
+            if not self.player_alive or self.current_bullet_stock <= 0:
+                return
+            self.bullets.add(Bullet(self.assets["bullet"], self.player.rect.centerx, self.player.rect.top))
+            self.current_bullet_stock -= 1
+            self.telemetry.record(SHOT, 0)
+        self.start_recharge()
+        self.audio.play_sfx("shoot")
+
+    # ---- Timer Callbacks (see Scheduler) ----
+    def start_recharge(self):
+        """Arms the recharge timer of each ship that is below max stock and not recharging yet."""
+        if self.recharge_timer is None and self.current_bullet_stock < self.max_bullet_stock:
+            self.recharge_timer = self.timers.schedule(self.bullet_recharge_time, self.recharge_done, False)
+        if (self.rival is not None and self.rival_recharge_timer is None
+                and self.rival_bullet_stock < self.max_bullet_stock):
+            self.rival_recharge_timer = self.timers.schedule(self.bullet_recharge_time, self.recharge_done, True)
+
+    def recharge_done(self, rival):
+        if rival:
+            self.rival_bullet_stock += 1
+            self.rival_recharge_timer = None
+        else:
+            self.current_bullet_stock += 1
+            self.recharge_timer = None
+        self.start_recharge()
+
+    def recharge_progress(self, timer):
+        """0.0 to 1.0 for the HUD: how far the missile being recharged is."""
+        if timer is None:
+            return 0.0
+        return 1.0 - self.timers.remaining(timer) / self.bullet_recharge_time
+
+    def enemy_fires(self, enemy):
+        if not enemy.alive():  # Shot down (or its wave was cleared) since the timer was set
+            return
+        enemy.fire_timer = self.timers.schedule(enemy.next_shot_delay(), self.enemy_fires, enemy)
+        enemy.fire(self.enemy_bullets)
+
+    def spawn_ufo(self):
+        self.ufo_timer = None
+        self.audio.play_sfx("ufo", loops=-1)
+        side = random.choice(["left", "right"])
+        self.ufo_group.add(UFO(self.assets["ufo"], side))
+        self.telemetry.record(UFO_SPAWN, 0 if side == "left" else 1)
+        self.ufo_spawn_delay = random.uniform(15.0, 30.0)
+
+    def end_freeze(self):
+        self.frozen = False
+        self.freeze_timer = None
+        if any(e.rect.y > COLLISION_DISTANCE for e in self.enemies):
+            self.state = "GAME_OVER"
+
+    def step(self, dt, p1_input, p2_input=0):
+        """Advances one tick from input words (see controls.py) instead of the live keyboard.
+
+        Same order as run(): fire presses (the events) first, then update.
+        """
+        self.mark_phase("update.input")
+        if self.state == "PLAYING":
+            if p1_input & INPUT_FIRE:
+                self.fire_bullet()
+            if self.rival is not None and p2_input & INPUT_FIRE:
+                self.fire_bullet(rival=True)
+        self.update(dt, InputKeys(p1_input), InputKeys(p2_input))
+
     def check_collisions(self):
 
         # Player's Bullets -> Enemies
         hits = pygame.sprite.groupcollide(self.enemies, self.bullets, True, True, pygame.sprite.collide_mask)
-        for hit in hits:
+        for hit, missiles in hits.items():
+            self.record_kill(hit, missiles, 0)
             self.score += hit.points
             self.audio.play_sfx("explosion")
             self.create_explosion(hit.rect.centerx, hit.rect.centery, GOLD, count=15)
@@ -284,20 +514,28 @@ class GameManager:
                 self.level += 1
                 self.spawn_enemies()
 
+        if self.rival is not None:
+            self.check_rival_collisions()
+
         # Enemy Bullets -> Player
-        if pygame.sprite.spritecollide(self.player, self.enemy_bullets, True, pygame.sprite.collide_mask):
-            self.player_death_sequence()
+        if self.player_alive and pygame.sprite.spritecollide(self.player, self.enemy_bullets, True,
+                                                             pygame.sprite.collide_mask):
+            if self.rival is None:
+                self.player_death_sequence("shot")
+            else:
+                self.ship_down(rival=False)
 
         for enemy in self.enemies:
             if enemy.rect.bottom >= COLLISION_DISTANCE:
-                if self.state == "PLAYING" and self.freeze_timer <= 0:
-                    self.player_death_sequence()
+                if self.state == "PLAYING" and not self.frozen:
+                    self.player_death_sequence("invaded")
                 break
 
         # Player Bullets vs UFO
         ufo_hit = pygame.sprite.groupcollide(self.ufo_group, self.bullets, True, True,
                                                      pygame.sprite.collide_mask)
-        for hit in ufo_hit:
+        for hit, missiles in ufo_hit.items():
+            self.record_kill(hit, missiles, 0)
             self.audio.stop_sfx("ufo")
             self.score += hit.points
             self.audio.play_sfx("explosion")
@@ -305,35 +543,94 @@ class GameManager:
             # Maybe trigger a unique screen shake for the UFO?
             self.fx.trigger_shake(15, 0.3)
 
-    def player_death_sequence(self):
+    def check_rival_collisions(self):
+        """Versus: the rival's missiles score for the rival, and enemy fire can knock it out."""
+        hits = pygame.sprite.groupcollide(self.enemies, self.rival_bullets, True, True, pygame.sprite.collide_mask)
+        for hit, missiles in hits.items():
+            self.record_kill(hit, missiles, 1)
+            self.rival_score += hit.points
+            self.audio.play_sfx("explosion")
+            self.create_explosion(hit.rect.centerx, hit.rect.centery, GOLD, count=15)
+            if not self.enemies:
+                self.level += 1
+                self.spawn_enemies()
+
+        ufo_hit = pygame.sprite.groupcollide(self.ufo_group, self.rival_bullets, True, True,
+                                             pygame.sprite.collide_mask)
+        for hit, missiles in ufo_hit.items():
+            self.record_kill(hit, missiles, 1)
+            self.audio.stop_sfx("ufo")
+            self.rival_score += hit.points
+            self.audio.play_sfx("explosion")
+            self.create_explosion(hit.rect.centerx, hit.rect.centery, GOLD, count=30)
+            self.fx.trigger_shake(15, 0.3)
+
+        if self.rival_alive and pygame.sprite.spritecollide(self.rival, self.enemy_bullets, True,
+                                                            pygame.sprite.collide_mask):
+            self.ship_down(rival=True)
+
+    def record_kill(self, target, missiles, ship):
+        """Telemetry for a target destroyed by ship: one HIT per missile that struck it, then the kill."""
+        if isinstance(target, UFO):
+            kind = TARGET_UFO
+        else:
+            kind = 1 if isinstance(target, ShooterEnemy) else 0
+        for _ in missiles:
+            self.telemetry.record(HIT, ship, kind)
+        if kind == TARGET_UFO:
+            self.telemetry.record(UFO_KILL, ship, target.points)
+        else:
+            self.telemetry.record(KILL, kind, ship)
+
+    def ship_down(self, rival):
+        """Versus: one ship is destroyed. The match ends once both are."""
+        self.telemetry.record(DEATH, 1 if rival else 0, CAUSES.index("shot"))
+        ship = self.rival if rival else self.player
+        if rival:
+            self.rival_alive = False
+        else:
+            self.player_alive = False
+
+        self.audio.play_sfx("explosion")
+        self.create_explosion(ship.rect.centerx, ship.rect.centery, RED, count=50)
+        self.fx.trigger_shake(30)
+
+        if not self.player_alive and not self.rival_alive:
+            self.trigger_shake(50, 2.0)
+            self.change_state("GAME_OVER")
+
+    def player_death_sequence(self, cause):
+        self.death_cause = cause  # "shot" or "invaded" (balance.py statistics)
+        self.telemetry.record(DEATH, 0, CAUSES.index(cause))
         self.audio.set_volume(0.2)  # Lower background music
         self.audio.play_sfx("explosion")
         # After a delay, switch to game over music
         self.create_explosion(self.player.rect.centerx, self.player.rect.centery, RED, count=50)
         self.trigger_shake(50, 2.0)  # Big shake
         self.change_state("GAME_OVER")
-        self.save_high_score()
+        if not self.versus and not self.headless:  # Bots and benchmarks don't set records
+            self.save_high_score()
 
-    def draw_bullet_hud(self):
+    def draw_bullet_hud(self, snap):
         start_x = 10
         start_y = SCREEN_HEIGHT * .92
         spacing = 30
 
-        for i in range(self.max_bullet_stock):
+        for i in range(snap.max_bullet_stock):
             x = start_x + (i * spacing)
 
-            if i < self.current_bullet_stock:
+            if i < snap.current_bullet_stock:
                 # 1. We have this bullet - Draw normally
-                self.main_surface.blit(self.hud_bullet, (x, start_y))
+                self.render_queue.submit(LAYER_HUD, self.hud_bullet, (x, start_y))
 
-            elif i == self.current_bullet_stock:
+            elif i == snap.current_bullet_stock:
                 # 2. This is the bullet currently RECHARGING
                 # Draw the gray base first
-                self.main_surface.blit(self.hud_bullet_gray, (x, start_y))
+                self.render_queue.submit(LAYER_HUD, self.hud_bullet_gray, (x, start_y))
 
                 # Calculate how much of the "color" bullet to show from the bottom
                 # progress is 0.0 to 1.0
-                progress = self.recharge_timer / self.bullet_recharge_time
+                progress = snap.recharge_progress
 
                 height = self.hud_bullet.get_height()
                 visible_height = int(height * progress)
@@ -344,11 +641,11 @@ class GameManager:
                 clip_rect = pygame.Rect(0, height - visible_height, self.hud_bullet.get_width(), visible_height)
 
                 # Blit the colored bullet using the area parameter to only show the bottom
-                self.main_surface.blit(self.hud_bullet, (x, start_y + (height - visible_height)), clip_rect)
+                self.render_queue.submit(LAYER_HUD, self.hud_bullet, (x, start_y + (height - visible_height)), clip_rect)
 
             else:
                 # 3. This bullet is empty and waiting its turn - Draw fully gray
-                self.main_surface.blit(self.hud_bullet_gray, (x, start_y))
+                self.render_queue.submit(LAYER_HUD, self.hud_bullet_gray, (x, start_y))
 
     def update_background(self, dt):
         for layer in self.star_layers:
@@ -359,7 +656,7 @@ class GameManager:
                 # Wrap around if it leaves the bottom
                 if star[1] > SCREEN_HEIGHT:
                     star[1] = 0
-                    star[0] = random.randint(0, SCREEN_WIDTH)
+                    star[0] = self.star_rng.randint(0, SCREEN_WIDTH)
 
     def update_difficulty(self):
         """Speeds up the game after killing a certain amount of enemies"""
@@ -367,23 +664,23 @@ class GameManager:
         self.speed_multiplier = 1.0 + (self.level - 1) * self.difficulty_step
         if self.level % 5 == 0:
             self.max_bullet_stock += 1
-        print(f"Current Level: {self.level}")
+        self.telemetry.record(LEVEL_UP, self.level)
 
     def trigger_shake(self, intensity, duration=0.5):
         self.fx.trigger_shake(intensity)
-        self.freeze_timer = duration
+        self.round_timers.cancel(self.freeze_timer)
+        self.frozen = True
+        self.freeze_timer = self.round_timers.schedule(duration, self.end_freeze)
 
-    def draw_menu(self):
+    def draw_menu(self, snap):
         """Draws the main menu on the main surface."""
         # Dim background
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.set_alpha(100)
-        overlay.fill((0, 0, 0))
-        self.main_surface.blit(overlay, (0, 0))
+        self.dim_overlay.set_alpha(100)
+        self.render_queue.submit(LAYER_OVERLAY, self.dim_overlay, (0, 0))
 
         # Title
         safe_width = SCREEN_WIDTH * 0.9
-        title_str = self.locale.get("title")
+        title_str = self.locale.get("title", snap.lang)
 
         # Use our new helper
         title_surf = self.render_scaled_text(
@@ -395,231 +692,359 @@ class GameManager:
 
         #title_surf = self.over_font.render(TITLE, True, CYAN)
         title_rect = title_surf.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3))
-        self.main_surface.blit(title_surf, title_rect)
+        self.render_queue.submit(LAYER_OVERLAY, title_surf, title_rect)
 
         # Options
-        for i, option in enumerate(self.menu_options):
-            color = GOLD if i == self.menu_index else WHITE
+        for i, option in enumerate(snap.menu_options):
+            color = GOLD if i == snap.menu_index else WHITE
             txt_surf = self.font.render(option, True, color)
             txt_rect = txt_surf.get_rect(center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT * 0.5 + i * 60))
 
-            if i == self.menu_index:
+            if i == snap.menu_index:
                 # Draw a little cursor >
                 cursor = self.font.render(">", True, RED)
-                self.main_surface.blit(cursor, (txt_rect.left - 40, txt_rect.top))
+                self.render_queue.submit(LAYER_OVERLAY, cursor, (txt_rect.left - 40, txt_rect.top))
 
-            self.main_surface.blit(txt_surf, txt_rect)
+            self.render_queue.submit(LAYER_OVERLAY, txt_surf, txt_rect)
 
         # ---- NEW CODE: High Score Display ----
         # Draw a separator line
-        pygame.draw.line(self.main_surface, WHITE,
-                       (SCREEN_WIDTH / 2 - 100, SCREEN_HEIGHT * 0.75),
-                        (SCREEN_WIDTH / 2 + 100, SCREEN_HEIGHT * 0.75), 2)
+        self.render_queue.submit(LAYER_OVERLAY, self.menu_separator, (0, SCREEN_HEIGHT * 0.75 - 4))
 
         # Draw the score
-        hi_score_surf = self.font.render(f"{self.locale.get('high_score')}{self.high_score}", True, GOLD)
+        hi_score_surf = self.font.render(f"{self.locale.get('high_score', snap.lang)}{snap.high_score}", True, GOLD)
         hi_score_rect = hi_score_surf.get_rect(center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT * 0.82))
-        self.main_surface.blit(hi_score_surf, hi_score_rect)
+        self.render_queue.submit(LAYER_OVERLAY, hi_score_surf, hi_score_rect)
 
-    def draw_pause_overlay(self):
+    def draw_pause_overlay(self, snap):
         """Draws pause text over the frozen game."""
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.set_alpha(150)
-        overlay.fill((0, 0, 0))
-        self.main_surface.blit(overlay, (0, 0))
+        self.dim_overlay.set_alpha(150)
+        self.render_queue.submit(LAYER_OVERLAY, self.dim_overlay, (0, 0))
 
-        txt_surf = self.over_font.render(self.locale.get("paused"), True, WHITE)
+        txt_surf = self.over_font.render(self.locale.get("paused", snap.lang), True, WHITE)
         txt_rect = txt_surf.get_rect(center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2))
-        self.main_surface.blit(txt_surf, txt_rect)
+        self.render_queue.submit(LAYER_OVERLAY, txt_surf, txt_rect)
 
-        sub_surf = self.font.render(self.locale.get("return_to_main"), True, GRAY_HUD)
+        sub_surf = self.font.render(self.locale.get("return_to_main", snap.lang), True, GRAY_HUD)
         sub_rect = sub_surf.get_rect(center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 + 60))
-        self.main_surface.blit(sub_surf, sub_rect)
+        self.render_queue.submit(LAYER_OVERLAY, sub_surf, sub_rect)
+
+    def draw_ui_to_main(self, snap):
+        score_txt = self.font.render(f"{self.locale.get('score', snap.lang)}{snap.score}", True, WHITE)
+        level_txt = self.font.render(f"{self.locale.get('level', snap.lang)}{snap.level}", True, WHITE)
+        hi_txt = self.font.render(f"{self.locale.get('high_score', snap.lang)}{snap.high_score}", True, GOLD)
 
-    def draw_ui_to_main(self):
-        score_txt = self.font.render(f"{self.locale.get('score')}{self.score}", True, WHITE)
-        level_txt = self.font.render(f"{self.locale.get('level')}{self.level}", True, WHITE)
-        hi_txt = self.font.render(f"{self.locale.get('high_score')}{self.high_score}", True, GOLD)
+        self.render_queue.submit(LAYER_HUD, score_txt, (10, 10))
+        self.render_queue.submit(LAYER_HUD, level_txt, (10, 50))
+        self.render_queue.submit(LAYER_HUD, hi_txt, (10, 90))
 
-        self.main_surface.blit(score_txt, (10, 10))
-        self.main_surface.blit(level_txt, (10, 50))
-        self.main_surface.blit(hi_txt, (10, 90))
+        if snap.rival_score is not None:
+            rival_txt = self.font.render(f"P2 {self.locale.get('score', snap.lang)}{snap.rival_score}", True, RED)
+            self.render_queue.submit(LAYER_HUD, rival_txt, (10, 130))
 
-    def draw_parallax(self):
+    def draw_parallax(self, snap):
         # 1. Draw static earth background first
-        self.main_surface.blit(self.assets["bg"], (0, 0))
+        self.render_queue.submit(LAYER_BACKGROUND, self.assets["bg"], (0, 0))
 
-        # 2. Draw moving star layers
-        for i, layer in enumerate(self.star_layers):
-            # i=0 is furthest, i=2 is closest
-            size = i + 1
-            for star in layer["stars"]:
-                pygame.draw.rect(self.main_surface, layer["color"], (star[0], star[1], size, size))
+        # 2. Draw moving star layers (i=0 is furthest, i=2 is closest)
+        for i, (color, size, stars) in enumerate(snap.stars):
+            star_surf = self.star_sprites[i]
+            self.render_queue.extend(LAYER_STARS, [(star_surf, star) for star in stars])
 
         # 3. Draw the Earth background OVER the stars
         # Because the PNG has transparency, the stars will only show through the "holes"
-        self.main_surface.blit(self.assets["bg"], (0, 0))
+        self.render_queue.submit(LAYER_BACKGROUND_OVER, self.assets["bg"], (0, 0))
 
-    def draw_danger_zone(self):
+    def draw_danger_zone(self, snap):
         # Create a flicker effect using the current time
         # This oscillates between 50 and 150 alpha for a pulsing "warning" look
 
         # Pulse speed increases if enemies are very close
-        proximity_warning = any(e.rect.bottom > COLLISION_DISTANCE - 125 for e in self.enemies)
+        proximity_warning = snap.proximity_warning
         pulse_speed = 0.02 if proximity_warning else 0.01
 
-        flicker = int(100 + math.sin(pygame.time.get_ticks() * 0.01) * 50)
+        flicker = int(100 + math.sin(snap.ticks * 0.01) * 50)
 
         # 2. The Warning Zone (Transparent red floor)
-        warning_floor = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT - COLLISION_DISTANCE))
-        warning_floor.set_alpha(flicker // 4)  # Very faint
-        warning_floor.fill((200, 0, 0))
-        self.main_surface.blit(warning_floor, (0, COLLISION_DISTANCE))
+        self.warning_floor.set_alpha(flicker // 4)  # Very faint
+        self.render_queue.submit(LAYER_DANGER, self.warning_floor, (0, COLLISION_DISTANCE))
 
         # 3. Text Alert
         if proximity_warning:
-            msg = self.locale.get('proximity_alert') if any(
-                e.rect.bottom > COLLISION_DISTANCE - 50 for e in self.enemies) else self.locale.get('proximity_warning')
+            msg = self.locale.get('proximity_alert' if snap.proximity_alert else 'proximity_warning', snap.lang)
             warn_txt = self.font.render(msg, True, (255, flicker, flicker))
-            self.main_surface.blit(warn_txt, (SCREEN_WIDTH // 2 - warn_txt.get_width() // 2, SCREEN_HEIGHT - 34))
+            self.render_queue.submit(LAYER_DANGER, warn_txt, (SCREEN_WIDTH // 2 - warn_txt.get_width() // 2, SCREEN_HEIGHT - 34))
 
 
-        # Create a temporary surface for transparency
-        danger_surf = pygame.Surface((SCREEN_WIDTH, 2))
-        danger_surf.set_alpha(flicker)
-        danger_surf.fill(DANGER_COLOR)
-
         # Draw the line
-        self.main_surface.blit(danger_surf, (0, COLLISION_DISTANCE))
-
-    def draw(self):
+        self.danger_line.set_alpha(flicker)
+        self.render_queue.submit(LAYER_DANGER, self.danger_line, (0, COLLISION_DISTANCE))
+
+    def set_render_scale(self, scale):
+        """Renders gameplay, sprites and FX at a fraction of the window size.
+
+        Simulation keeps using full SCREEN_WIDTH x SCREEN_HEIGHT coordinates; only the
+        render targets shrink. The finished frame is upscaled once before the flip.
+        """
+        self.render_scale = scale
+        self.render_size = (max(1, round(SCREEN_WIDTH * scale)), max(1, round(SCREEN_HEIGHT * scale)))
+
+        self.fx.resize(self.render_size)
+        if self.textures is not None:
+            # The GPU scales while drawing: the queue stays in screen coordinates
+            self.textures.resize(self.render_size, scale)
+            return
+        self.main_surface = pygame.Surface(self.render_size)
+        self.present_surface = self.screen if scale == 1.0 else pygame.Surface(self.render_size)
+        self.render_queue.set_scale(scale)
+
+    def govern_quality(self, work_ms=None):
+        """Feeds the last frame's work time to the governor and applies the tier it picks."""
+        if work_ms is None:
+            work_ms = self.clock.get_rawtime()
+        self.frames_governed += 1
+        if self.frames_governed % TELEMETRY_FRAME_EVERY == 0:
+            self.telemetry.record(FRAME, int(work_ms * 1000), QUALITY_TIERS.index(self.quality))
+        if self.governor is not None and self.governor.record(work_ms):
+            self.apply_quality(self.governor.tier)
+            self.telemetry.record(QUALITY, self.governor.tier)
+
+    def apply_quality(self, index):
+        """Switches every governed visual feature to QUALITY_TIERS[index]. Never touches gameplay."""
+        self.quality = QUALITY_TIERS[index]
+        self.fx.aberration = self.quality.aberration
+        self.fx.flicker = self.quality.flicker
+        scale = min(self.base_render_scale, self.quality.render_scale)
+        if scale != self.render_scale:
+            self.set_render_scale(scale)
+
+    def capture_render_state(self):
+        """Freezes everything draw needs into an immutable RenderSnapshot."""
+        if self.spectator is not None:
+            self.spectator.publish(self)  # Same moment, same state: the spectator sees what we draw
+        in_game = self.state != "MENU"
+        layers = ()
+        proximity_warning = proximity_alert = False
+        if in_game:
+            ships = [ship for ship, alive in ((self.player, self.player_alive), (self.rival, self.rival_alive))
+                     if alive]
+            layers = (
+                tuple((p.image, p.rect.topleft) for p in self.particles),
+                tuple((ship.image, ship.rect.topleft) for ship in ships),
+                tuple((e.image, e.rect.topleft) for e in self.enemies),
+                tuple((b.image, b.rect.topleft) for group in (self.bullets, self.rival_bullets) for b in group),
+                tuple((b.image, b.rect.topleft) for b in self.enemy_bullets),
+                tuple((u.image, u.rect.topleft) for u in self.ufo_group),
+            )
+            proximity_warning = any(e.rect.bottom > COLLISION_DISTANCE - 125 for e in self.enemies)
+            proximity_alert = any(e.rect.bottom > COLLISION_DISTANCE - 50 for e in self.enemies)
+
+        density = self.quality.star_density
+        return RenderSnapshot(
+            state=self.state,
+            lang=self.locale.current_lang,
+            ticks=pygame.time.get_ticks(),
+            fps=int(self.clock.get_fps()),
+            menu_index=self.menu_index,
+            menu_options=tuple(self.menu_options),
+            stars=tuple((layer["color"], i + 1,
+                         tuple((x, y) for x, y in layer["stars"][:round(len(layer["stars"]) * density)]))
+                        for i, layer in enumerate(self.star_layers)),
+            layers=layers,
+            score=self.score,
+            level=self.level,
+            high_score=self.high_score,
+            rival_score=self.rival_score if self.versus else None,
+            max_bullet_stock=self.max_bullet_stock,
+            current_bullet_stock=self.rival_bullet_stock if self.local_is_rival else self.current_bullet_stock,
+            recharge_progress=self.recharge_progress(self.rival_recharge_timer if self.local_is_rival
+                                                     else self.recharge_timer),
+            proximity_warning=proximity_warning,
+            proximity_alert=proximity_alert,
+            quality=self.quality.name,
+        )
 
-        self.main_surface.fill(SPACE_COLOR)
+    def start_telemetry(self, path):
+        """Streams gameplay events to path (.bin: binary records, otherwise newline-delimited JSON)."""
+        self.telemetry.start(open_sink(path), {
+            "state": STATES,
+            "lang": self.locale.lang_codes,
+            "quality": [tier.name for tier in QUALITY_TIERS],
+        })
+
+    def toggle_profiler(self):
+        """F9: starts the sampling profiler, or stops it and writes the flamegraph input."""
+        if not self.profiler.running:
+            self.profiler.start()
+            print("Profiler started (F9 to stop)")
+            return
+        self.profiler.stop()
+        path = self.profile_path
+        if path is None:
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            path = os.path.join(PROFILE_DIR, time.strftime("profile-%Y%m%d-%H%M%S.folded"))
+        samples = self.profiler.write(path)
+        print(f"Profile written to {path} ({samples} samples); view with flamegraph.pl or speedscope")
+
+    def mark_phase(self, name):
+        """Starts attributing per-frame costs to a named update/draw phase (no-op unless tracking)."""
+        if self.alloc_tracker is not None:
+            self.alloc_tracker.begin(name)
+
+    def render_frame(self, snap):
+        """Draws a snapshot to the screen (everything except the flip)."""
+        self.mark_phase("draw.compose")
         # 1. Background (Always draw this so we don't get trails)
         #self.main_surface.blit(self.assets['bg'], (0, 0))
 
-        self.draw_parallax()
+        self.draw_parallax(snap)
 
         # 2. Game Elements (Draw if Playing, Paused, or Game Over)
-        if self.state != "MENU":
-            self.particles.draw(self.main_surface)
-            self.main_surface.blit(self.player.image, self.player.rect)
-            self.enemies.draw(self.main_surface)
-            self.bullets.draw(self.main_surface)
-            self.enemy_bullets.draw(self.main_surface)
-            self.ufo_group.draw(self.main_surface)
+        for layer, sprites in zip(SPRITE_LAYERS, snap.layers):
+            self.render_queue.extend(layer, sprites)
 
         # 3. State-Specific Overlays (Drawn to main_surface to get FX)
-        if self.state == "MENU":
-            self.draw_menu()
+        if snap.state == "MENU":
+            self.draw_menu(snap)
 
-        elif self.state == "PAUSED":
-            self.draw_pause_overlay()
+        elif snap.state == "PAUSED":
+            self.draw_pause_overlay(snap)
 
-        elif self.state == "GAME_OVER":
+        elif snap.state == "GAME_OVER":
             # Game Over Overlay
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-            overlay.set_alpha(150)
-            overlay.fill((0, 0, 0))
-            self.main_surface.blit(overlay, (0, 0))
+            self.dim_overlay.set_alpha(150)
+            self.render_queue.submit(LAYER_OVERLAY, self.dim_overlay, (0, 0))
 
-            msg_surface = self.over_font.render(self.locale.get("game_over"), True, (200, 200, 200))
+            msg_surface = self.over_font.render(self.locale.get("game_over", snap.lang), True, (200, 200, 200))
             text_rect = msg_surface.get_rect()
             text_rect.center = (int(SCREEN_WIDTH / 2), int(SCREEN_HEIGHT / 2))
-            self.main_surface.blit(msg_surface, text_rect)
+            self.render_queue.submit(LAYER_OVERLAY, msg_surface, text_rect)
 
-            restart_surface = self.font.render(self.locale.get("restart"), True, (200, 200, 200))
+            restart_surface = self.font.render(self.locale.get("restart", snap.lang), True, (200, 200, 200))
             restart_rect = restart_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50))
-            self.main_surface.blit(restart_surface, restart_rect)
+            self.render_queue.submit(LAYER_OVERLAY, restart_surface, restart_rect)
 
         # self.fx.render(self.main_surface, self.screen)
 
 
         # Draw UI (On top of affects)
-        if self.state == "PLAYING" or self.state == "PAUSED" or self.state == "GAME_OVER":
-            self.draw_danger_zone()
-            self.draw_ui_to_main()
-
-            if self.state != "GAME_OVER":
-                self.draw_bullet_hud()
-
-
-        fps_val = int(self.clock.get_fps())
-        fps_txt = self.font.render(f"FPS: {fps_val}", True, (0, 255, 0))  # Green text for performance
+        if snap.state == "PLAYING" or snap.state == "PAUSED" or snap.state == "GAME_OVER":
+            self.draw_danger_zone(snap)
+            self.draw_ui_to_main(snap)
+
+            if snap.state != "GAME_OVER":
+                self.draw_bullet_hud(snap)
+
+        self.mark_phase("draw.flush")
+        if self.textures is not None:
+            self.textures.flush(self.render_queue)
+            self.mark_phase("draw.fx")
+            self.textures.post_process(self.fx)
+        else:
+            self.main_surface.fill(SPACE_COLOR)
+            self.render_queue.flush(self.main_surface)
+            self.mark_phase("draw.fx")
+            self.fx.render(self.main_surface, self.present_surface)
+            if self.capture is not None:
+                self.capture.add(self.present_surface)
+
+        self.mark_phase("draw.present")
+        fps_txt = self.font.render(f"FPS: {snap.fps}", True, (0, 255, 0))  # Green text for performance
+        blits_txt = self.font.render(f"BLT: {self.render_queue.blit_count}", True, (0, 255, 0))
+        if self.textures is not None:
+            self.textures.present(zip((fps_txt, blits_txt, self.quality_labels[snap.quality]), self.stats_dests))
+            return
+        if self.present_surface is not self.screen:
+            # Single upscale of the finished low-res frame to the window
+            pygame.transform.scale(self.present_surface, (SCREEN_WIDTH, SCREEN_HEIGHT), self.screen)
+        self.screen.blit(fps_txt, self.stats_dests[0]) # FPS Counter
+        self.screen.blit(blits_txt, self.stats_dests[1]) # Blits submitted this frame
+        self.screen.blit(self.quality_labels[snap.quality], self.stats_dests[2]) # Governor's tier
 
-        self.fx.render(self.main_surface, self.screen)
-        self.screen.blit(fps_txt, (SCREEN_WIDTH - 250, 10)) # FPS Counter
-        pygame.display.flip()
+    def draw(self):
+        self.mark_phase("draw.capture")
+        snapshot = self.capture_render_state()
+        self.render_frame(snapshot)
+        self.flip()
+        if self.alloc_tracker is not None:
+            self.alloc_tracker.end()
+
+    def flip(self):
+        """Shows the finished frame."""
+        if self.textures is not None:
+            self.textures.flip()
+        else:
+            pygame.display.flip()
 
     def update_menu(self, dt):
         # You could add background rotation or floaty enemies here
         pass
 
-    def update_playing(self, dt, keys):
+    def update_playing(self, dt, keys, rival_keys=None):
         # Logic when Game is Active
-        if self.freeze_timer > 0:
-            self.freeze_timer -= dt
-            if self.freeze_timer <= 0 and any(e.rect.y > COLLISION_DISTANCE for e in self.enemies):
-                self.state = "GAME_OVER"
-        else:
-            self.player.update(dt, keys)
+        self.mark_phase("update.entities")
+        if not self.frozen:
+            if self.player_alive:
+                self.player.update(dt, keys)
+            if self.rival_alive:
+                self.rival.update(dt, rival_keys)
             self.bullets.update(dt)
+            self.rival_bullets.update(dt)
             self.enemy_bullets.update(dt)
 
             for enemy in self.enemies:
-                if hasattr(enemy, "fire"):
-                    enemy.update(self.speed_multiplier, dt, self.enemy_bullets)
-                else:
-                    enemy.update(self.speed_multiplier, dt)
+                enemy.update(self.speed_multiplier, dt)
 
-            self.check_collisions()
+            # Shooter fire and missile recharge: only timers that fall due this frame cost anything
+            self.timers.advance(dt)
 
-            if self.current_bullet_stock < self.max_bullet_stock:
-                self.recharge_timer += dt
-                if self.recharge_timer >= self.bullet_recharge_time:
-                    self.current_bullet_stock += 1
-                    self.recharge_timer = 0.0
+            self.mark_phase("update.collisions")
+            self.check_collisions()
 
+        self.mark_phase("update.particles")
         self.particles.update(dt)
 
         # ENGINE EXHAUST LOGIC
         # Spawn small blue/white particles at the back of the player
-        if random.random() > 0.5:  # Don't spawn every frame to save performance
-            exhaust_x = self.player.rect.centerx + random.randint(-5, 5)
-            exhaust_y = self.player.rect.bottom - 10
-            # Give exhaust a downward velocity
-            self.particles.add(Particle(
-                exhaust_x, exhaust_y, CYAN,
-                velocity=(random.uniform(-20, 20), random.uniform(100, 200)),
-                lifetime=0.3, size=3
-            ))
+        ships = [ship for ship, alive in ((self.player, self.player_alive), (self.rival, self.rival_alive)) if alive]
+        for ship in ships:
+            if self.particle_rng.random() < self.quality.exhaust_rate * dt:  # Not every frame, to save performance
+                exhaust_x = ship.rect.centerx + self.particle_rng.randint(-5, 5)
+                exhaust_y = ship.rect.bottom - 10
+                # Give exhaust a downward velocity
+                Particle(
+                    exhaust_x, exhaust_y, CYAN,
+                    velocity=(self.particle_rng.uniform(-20, 20), self.particle_rng.uniform(100, 200)),
+                    lifetime=0.3, size=3
+                ).add(self.particles)
 
         # ---- Spawn UFO
-        if not self.ufo_group:  # Only spawn if one isn't already there
-            self.ufo_spawn_timer -= dt
-            if self.ufo_spawn_timer <= 0:
-                self.audio.play_sfx("ufo", loops=-1)
-                side = random.choice(["left", "right"])
-                self.ufo_group.add(UFO(self.assets["ufo"], side))
-                self.ufo_spawn_timer = random.uniform(15.0, 30.0)
-        else:
+        self.mark_phase("update.ufo")
+        if self.ufo_group:
             self.ufo_group.update(dt)
             if not self.ufo_group:
                 self.audio.stop_sfx("ufo")
+        if not self.ufo_group and self.ufo_timer is None:
+            # The UFO flew off or was shot down: the wait for the next one starts now
+            self.ufo_timer = self.round_timers.schedule(self.ufo_spawn_delay, self.spawn_ufo)
+        self.round_timers.advance(dt)  # Also ends a freeze
 
     def update_game_over(self, dt):
         # self.audio.play_music("game_over")
         pass
 
 
-    def update(self, dt, keys):
+    def update(self, dt, keys, rival_keys=None):
         # Always update FX (so shake decays even if game over, or static flickers in menu)
         # Assuming you might want menu background animation later.
+        self.mark_phase("update.background")
+        self.fx.update(dt)
+        self.audio.update()  # Advance music crossfades
         self.update_background(dt)
 
         # 2. State-specific logic
         if self.state == "PLAYING":
-            self.update_playing(dt, keys)
+            self.update_playing(dt, keys, rival_keys)
         elif self.state == "MENU":
             self.update_menu(dt)
         elif self.state == "PAUSED":
@@ -628,22 +1053,276 @@ class GameManager:
         elif self.state == "GAME_OVER":
             self.update_game_over(dt)
 
+    def is_idle(self):
+        """True on static screens with nothing animating, where frames only need to follow input."""
+        return (self.idle_fps > 0 and self.state in ("MENU", "PAUSED", "GAME_OVER")
+                and self.fx.shake_intensity <= 0.1 and not self.audio.music.fades)
+
+    def next_frame(self, govern=True):
+        """Waits for the next frame. Returns (dt, events); events is None when the queue should be polled.
+
+        While playing (or while a shake or music fade is running) frames are paced at self.fps as
+        usual. On idle static screens the loop instead blocks in pygame.event.wait until
+        input arrives or the next IDLE_FPS refresh (starfield, flicker) is due, so an
+        attract-mode cabinet does not render 60 identical frames a second.
+        """
+        if not self.is_idle():
+            dt = self.clock.tick(self.fps) / 1000.0
+            if govern:
+                self.govern_quality()
+            return dt, None
+
+        timeout = self.next_idle_refresh - pygame.time.get_ticks()
+        if timeout <= 0:
+            # Refresh already due (or stale from before this screen): event.wait(0) would block for good
+            events = pygame.event.get()
+        else:
+            event = pygame.event.wait(timeout)
+            events = [] if event.type == pygame.NOEVENT else [event] + pygame.event.get()
+        dt = self.clock.tick() / 1000.0  # No governor here: the wait isn't frame work
+        self.next_idle_refresh = pygame.time.get_ticks() + 1000 // self.idle_fps
+        return dt, events
+
     def run(self):
+        if self.low_latency:
+            self.run_low_latency()
+            return
+        if self.pipelined:
+            self.run_pipelined()
+            return
+
         while self.running:
-            dt = self.clock.tick(FPS) / 1000.0
+            dt, events = self.next_frame()
             keys = pygame.key.get_pressed()
 
+            if not self.handle_events(events):
+                self.running = False
+
+            self.update(dt, keys)
+            self.draw()
+
+        pygame.quit()
+
+    def run_pipelined(self):
+        """Same loop as run(), but frame N is drawn on the render thread while frame N+1 simulates.
+
+        Events, simulation and the flip stay on the main thread (SDL wants them there);
+        only render_frame moves to the worker, and it only ever sees snapshots.
+        """
+        pipeline = RenderPipeline(self.render_frame)
+        pipeline.start()
+        try:
+            unpresented = False
+            while self.running:
+                dt, events = self.next_frame(govern=False)
+                keys = pygame.key.get_pressed()
+
+                if not self.handle_events(events):
+                    self.running = False
+
+                self.update(dt, keys)
+                snapshot = self.capture_render_state()
+
+                # Present the previous frame, then hand this one to the worker
+                pipeline.wait()
+                self.govern_quality()  # Safe to swap render targets: the worker is idle
+                if unpresented:
+                    self.flip()
+                pipeline.submit(snapshot)
+                unpresented = True
+
+                if self.is_idle():
+                    # Nothing to overlap with on a static screen: show this frame now, not after the idle wait
+                    pipeline.wait()
+                    self.flip()
+                    unpresented = False
+
+            pipeline.wait()
+        finally:
+            pipeline.stop()
+
+        pygame.quit()
+
+    def run_low_latency(self):
+        """Same loop as run(), paced so input is read as late as the frame's work allows.
+
+        run() sleeps first and samples the keyboard straight after, so a press waits for the
+        whole update + draw + fx before it shows. Here the loop instead waits, polling the
+        keyboard, until just enough time is left to simulate and render before the next present
+        (judged by the worst of the last frames), then latches the player's horizontal input
+        with sub-frame precision. Prints the measured input-to-present latency on exit.
+        """
+        latched = LatchedInput()
+        frame_time = 1.0 / self.fps if self.fps else 0.0  # Uncapped: latch and present back to back
+        work = deque([frame_time / 2], maxlen=LOW_LATENCY_WINDOW)
+        next_present = time.perf_counter() + frame_time
+
+        while self.running:
+            latched.wait_until(next_present - max(work) - LOW_LATENCY_MARGIN)
+            start = time.perf_counter()
+            dt, keys = latched.latch()
+            self.clock.tick()  # FPS counter only; pacing is done above
+
             if not self.handle_events():
                 self.running = False
 
             self.update(dt, keys)
             self.draw()
+            latched.presented()
+
+            end = time.perf_counter()
+            work.append(end - start)
+            self.govern_quality((end - start) * 1000.0)
+            # Fell behind (a slow frame): re-anchor instead of rushing to catch up
+            next_present = max(next_present + frame_time, end)
 
+        print(latched.report())
+        pygame.quit()
+
+    async def run_async(self):
+        """Same loop as run(), as an asyncio task: frames are paced by awaiting the event loop.
+
+        Between frames the game yields to asyncio, so coroutines started with spawn() (or any
+        other task on the same loop) run in the time the frame leaves over, not inside a
+        frame and not on ad-hoc threads. Prints how much of each frame went back to the loop on exit.
+        """
+        pacer = AsyncFramePacer(self.fps)
+        while self.running:
+            if self.is_idle():
+                # Static screen: refresh at IDLE_FPS, but answer input as soon as it arrives
+                dt = await pacer.wait(1.0 / self.idle_fps, wake=pygame.event.peek)
+                idle = True
+            else:
+                dt = await pacer.wait()
+                idle = False
+            start = time.perf_counter()
+            self.clock.tick()  # FPS counter only; pacing is done by the pacer
+
+            if not self.handle_events():
+                self.running = False
+
+            self.update(dt, pygame.key.get_pressed())
+            self.draw()
+            if not idle:
+                self.govern_quality((time.perf_counter() - start) * 1000.0)
+
+        if self.background_tasks:
+            await asyncio.gather(*self.background_tasks, return_exceptions=True)
+        print(pacer.report())
+        pygame.quit()
+
+    def spawn(self, coro):
+        """Runs coro on the game's event loop between frames (run_async only). Returns its Task."""
+        task = asyncio.get_running_loop().create_task(coro)
+        self.background_tasks.add(task)
+        task.add_done_callback(self.background_tasks.discard)
+        return task
+
+    def run_versus(self, session):
+        """Networked versus loop: fixed ticks, with both ships' inputs going through the rollback session."""
+        fire = False
+        while self.running:
+            # Both cabinets simulate fixed 1 / FPS ticks (RollbackSession.dt), so versus ignores --fps
+            self.clock.tick(FPS)
+            self.govern_quality()
+
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self.running = False
+                elif event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_ESCAPE:
+                        self.running = False
+                    elif event.key == pygame.K_SPACE:
+                        fire = True
+
+            # A press made while stalled waiting for the peer is kept for the next frame
+            if session.advance(sample_input(pygame.key.get_pressed(), fire)):
+                fire = False
+            self.draw()
+
+        session.close()
         pygame.quit()
 
 if __name__ == "__main__":
-    game = GameManager()
-    game.run()
+    parser = argparse.ArgumentParser(description=TITLE)
+    parser.add_argument("--pipelined", action="store_true", default=PIPELINED_RENDER,
+                        help="render on a separate thread, one frame behind the simulation")
+    parser.add_argument("--render-scale", type=float, default=RENDER_SCALE,
+                        help="internal render resolution as a fraction of the window, e.g. 0.5")
+    parser.add_argument("--no-governor", dest="governor", action="store_false", default=QUALITY_GOVERNOR,
+                        help="keep full quality even when frames run over budget")
+    parser.add_argument("--fps", type=int, default=FPS,
+                        help="frame rate, e.g. 120, 144 or 240 for high-refresh monitors (0: uncapped)")
+    parser.add_argument("--idle-fps", type=int, default=IDLE_FPS,
+                        help="refresh rate of the menu, pause and game-over screens (0: full FPS)")
+    parser.add_argument("--low-latency", action="store_true", default=LOW_LATENCY,
+                        help="latch player input just before rendering and report input-to-present latency")
+    parser.add_argument("--fx-threads", type=int, default=FX_THREADS,
+                        help="compose the CRT effects in this many parallel horizontal bands (surface backend)")
+    parser.add_argument("--asyncio", action="store_true",
+                        help="run the main loop as an asyncio task and report idle time given back per frame")
+    parser.add_argument("--backend", choices=("surface", "texture"), default=RENDER_BACKEND,
+                        help="surface: software Surface blits; texture: SDL2 renderer with uploaded textures")
+    parser.add_argument("--software-renderer", dest="accelerated", action="store_false", default=RENDER_ACCELERATED,
+                        help="texture backend: use SDL's software renderer (no GPU needed)")
+    parser.add_argument("--telemetry", metavar="PATH",
+                        help="stream gameplay events to PATH (.bin: binary records, otherwise NDJSON)")
+    parser.add_argument("--profile", metavar="PATH",
+                        help="sample the game's stacks from launch and write collapsed stacks to PATH on exit")
+    parser.add_argument("--capture", metavar="PATH",
+                        help="record presented frames: .rgb/.raw for a raw RGB24 stream, otherwise a PNG directory")
+    parser.add_argument("--capture-stride", type=int, default=CAPTURE_STRIDE, help="capture every Nth frame")
+    parser.add_argument("--capture-scale", type=float, default=CAPTURE_SCALE,
+                        help="captured size relative to the window")
+    parser.add_argument("--spectator", action="store_true",
+                        help="publish each frame to the shared-memory feed that spectator.py displays")
+    parser.add_argument("--versus", metavar="HOST:PORT",
+                        help="two-player LAN match against the cabinet at HOST:PORT")
+    parser.add_argument("--player", type=int, choices=(1, 2), default=1,
+                        help="versus: 1 hosts the match, 2 joins it")
+    parser.add_argument("--port", type=int, default=NET_PORT, help="versus: local UDP port")
+    parser.add_argument("--input-delay", type=int, default=NET_INPUT_DELAY, help="versus: input delay in frames")
+    args = parser.parse_args()
+
+    game = GameManager(pipelined=args.pipelined, render_scale=args.render_scale, governor=args.governor,
+                       low_latency=args.low_latency, idle_fps=args.idle_fps, backend=args.backend,
+                       accelerated=args.accelerated, fps=args.fps)
+    game.fx.set_threads(args.fx_threads)
+    if args.telemetry:
+        game.start_telemetry(args.telemetry)
+    if args.capture:
+        if args.backend == "texture":
+            print("Frame capture reads Surfaces; --capture needs the surface backend")
+        else:
+            game.capture = FrameCapture(args.capture, stride=args.capture_stride, scale=args.capture_scale)
+    if args.spectator:
+        game.spectator = SpectatorPublisher()
+    if args.profile:
+        game.profile_path = args.profile
+        game.toggle_profiler()
+    if args.versus:
+        host, port = args.versus.rsplit(":", 1)
+        transport = UdpTransport(args.port, (socket.gethostbyname(host), int(port)))
+        local_index = args.player - 1
+        print(f"Waiting for the other cabinet at {args.versus}...")
+        seed, input_delay = connect(transport, local_index, args.input_delay)
+        game.start_versus(seed, local_is_rival=local_index == 1)
+        game.run_versus(RollbackSession(game, transport, local_index, input_delay))
+    elif args.asyncio:
+        asyncio.run(game.run_async())
+    else:
+        game.run()
+    if game.profiler.running:
+        game.toggle_profiler()
+    if game.spectator is not None:
+        game.spectator.close()
+    if game.capture is not None:
+        game.capture.close()
+        print(game.capture.report())
+        print(game.capture.ffmpeg_hint(game.fps or FPS))
+    game.telemetry.close()
+    if game.telemetry.dropped:
+        print(f"Telemetry: {game.telemetry.dropped} events dropped (writer fell a full buffer behind)")
 
 
 
@@ -0,0 +1,68 @@
+from collections import deque, namedtuple
+
+from settings import *
+
+# Visual cost knobs, from full quality down to the bare minimum.
+# render_scale is a ceiling: the game never renders above what the player asked for.
+QualityTier = namedtuple("QualityTier", [
+    "name",
+    "render_scale",     # internal render resolution (see GameManager.set_render_scale)
+    "aberration",       # PostProcessor RGB split
+    "flicker",          # PostProcessor atmospheric flicker
+    "star_density",     # share of each parallax layer that is drawn
+    "particle_scale",   # multiplier on explosion particle counts
+    "exhaust_rate",     # exhaust particles a ship emits per second (on average)
+])
+
+QUALITY_TIERS = (
+    QualityTier("HIGH", 1.0, True, True, 1.0, 1.0, 30),
+    QualityTier("MED", 1.0, True, False, 0.6, 0.6, 21),
+    QualityTier("LOW", 0.75, False, False, 0.4, 0.4, 12),
+    QualityTier("MIN", 0.5, False, False, 0.25, 0.25, 6),
+)
+
+
+class QualityGovernor:
+    """Picks a quality tier from recent frame work times, with hysteresis so it settles.
+
+    Frame times are judged in whole windows. One window averaging over the downgrade
+    threshold steps down a tier; stepping back up takes several calm windows in a row,
+    and every upgrade that has to be undone straight away doubles that requirement.
+    """
+
+    def __init__(self, budget_ms=1000.0 / FPS, window=GOVERNOR_WINDOW, tier=0):
+        self.budget_ms = budget_ms
+        self.tier = tier
+        self.samples = deque(maxlen=window)
+        self.calm = 0
+        self.calm_needed = GOVERNOR_CALM_WINDOWS
+        self.just_upgraded = False
+
+    def record(self, work_ms):
+        """Feeds one frame's work time (excluding the frame-cap sleep). Returns True if the tier changed."""
+        self.samples.append(work_ms)
+        if len(self.samples) < self.samples.maxlen:
+            return False
+        mean = sum(self.samples) / len(self.samples)
+        self.samples.clear()
+
+        if mean > self.budget_ms * GOVERNOR_DOWNGRADE and self.tier < len(QUALITY_TIERS) - 1:
+            if self.just_upgraded:
+                # The better tier didn't fit after all: be slower to try it again
+                self.calm_needed = min(self.calm_needed * 2, 64)
+            self.tier += 1
+            self.calm = 0
+            self.just_upgraded = False
+            return True
+        self.just_upgraded = False
+
+        if mean < self.budget_ms * GOVERNOR_UPGRADE and self.tier > 0:
+            self.calm += 1
+            if self.calm >= self.calm_needed:
+                self.tier -= 1
+                self.calm = 0
+                self.just_upgraded = True
+                return True
+        else:
+            self.calm = 0
+        return False
@@ -0,0 +1,77 @@
+import argparse
+import random
+import sys
+
+from settings import *
+from controls import INPUT_FIRE, InputKeys, ScriptedPad
+from entities import Player
+
+# ---- Handling Check ----
+# The ship must handle the same at every frame rate (--fps 60/120/144/240 or uncapped).
+# One input timeline is played at each rate and the paths are compared. Directions only
+# change on a grid every rate has a frame boundary on, so every run sees the same input;
+# frame-rate-independent physics then gives the same path, and per-frame constants show
+# up as drift that grows with the rate.
+
+STEP = 1.0 / 12  # Input grid: a frame boundary at 60, 120, 144 and 240 Hz
+RATES = (60, 120, 144, 240, 0)  # 0: uncapped, with irregular frame times
+
+
+def input_timeline(seed, seconds):
+    """The held direction for each STEP, as ScriptedPad picks them."""
+    pad = ScriptedPad(seed)
+    return [pad.next_input() & ~INPUT_FIRE for _ in range(round(seconds / STEP))]
+
+
+def frame_times(rate, seconds, seed=0):
+    """Frame end times: evenly spaced at rate, or 1-12 ms apart for uncapped (0), meeting every STEP."""
+    steps = round(seconds / STEP)
+    if rate:
+        return [i / rate for i in range(1, steps * round(rate * STEP) + 1)]
+    rng = random.Random(seed)
+    times = []
+    for i in range(steps):
+        t, end = i * STEP, (i + 1) * STEP
+        while end - t > 0.012:
+            t += rng.uniform(0.001, 0.012)
+            times.append(t)
+        times.append(end)
+    return times
+
+
+def ship_path(surface, timeline, times):
+    """Flies a fresh ship through timeline; returns its pos_x at the end of every STEP."""
+    ship = Player(surface)
+    path = []
+    previous = 0.0
+    for t in times:
+        step = min(len(timeline) - 1, int(previous / STEP + 1e-9))
+        ship.update(t - previous, InputKeys(timeline[step]))
+        previous = t
+        if abs(t / STEP - round(t / STEP)) < 1e-9:
+            path.append(ship.pos_x)
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Flies the ship through the same input at several frame rates and reports how far the paths drift")
+    parser.add_argument("--seconds", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--tolerance", type=float, default=0.01, help="largest drift accepted, in pixels")
+    args = parser.parse_args()
+
+    from game import GameManager
+    game = GameManager(headless=True, governor=False)
+    surface = game.assets["player"]
+    timeline = input_timeline(args.seed, args.seconds)
+
+    reference = ship_path(surface, timeline, frame_times(FPS, args.seconds))
+    failed = False
+    for rate in RATES:
+        path = ship_path(surface, timeline, frame_times(rate, args.seconds, args.seed))
+        drift = max(abs(a - b) for a, b in zip(path, reference))
+        status = "OK" if drift <= args.tolerance else "DRIFTS"
+        failed = failed or drift > args.tolerance
+        print(f"{rate or 'uncapped':>9} Hz: {len(path)} steps, largest drift from {FPS} Hz {drift:.4f} px  {status}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,68 @@
+import argparse
+import random
+import sys
+import threading
+import time
+
+import pygame
+
+from settings import *
+
+# ---- Idle Loop Check ----
+# Static screens (menu, pause, game over) wait for input between IDLE_FPS refreshes
+# (GameManager.next_frame). A wait that never times out looks fine while keys are being
+# pressed and only shows once the screen is left alone, so this plays a few frames, pauses
+# with ESC, then sends nothing and checks the paused game keeps refreshing on its own.
+
+
+def check_paused_refresh(pipelined, frames=10, timeout=10.0, idle_fps=IDLE_FPS):
+    """Runs the real main loop headless and pauses it. Returns (paused frames drawn, seconds taken).
+
+    The loop is ended with a QUIT once `frames` paused frames were drawn, or by a
+    watchdog after `timeout` seconds if it stops advancing.
+    """
+    from game import GameManager
+    game = GameManager(pipelined=pipelined, headless=True, governor=False, idle_fps=idle_fps)
+    random.seed(0)
+    game.state = "PLAYING"
+    game.reset_game_state_vars()
+
+    played = paused = 0
+    capture = game.capture_render_state
+
+    def counting_capture():
+        nonlocal played, paused
+        if game.state == "PLAYING":
+            played += 1
+            if played == 10:
+                pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_ESCAPE, mod=0,
+                                                     unicode="", scancode=0))
+        elif game.state == "PAUSED":
+            paused += 1
+            if paused == frames:
+                pygame.event.post(pygame.event.Event(pygame.QUIT))
+        return capture()
+
+    game.capture_render_state = counting_capture
+    watchdog = threading.Timer(timeout, lambda: pygame.event.post(pygame.event.Event(pygame.QUIT)))
+    watchdog.start()
+    start = time.perf_counter()
+    game.run()
+    watchdog.cancel()
+    return paused, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Checks that a paused game keeps refreshing without input")
+    parser.add_argument("--frames", type=int, default=10, help="paused frames expected")
+    parser.add_argument("--timeout", type=float, default=10.0, help="seconds before the loop counts as hung")
+    args = parser.parse_args()
+
+    failed = False
+    for pipelined in (False, True):
+        name = "run_pipelined" if pipelined else "run"
+        paused, elapsed = check_paused_refresh(pipelined, args.frames, args.timeout)
+        ok = paused >= args.frames
+        failed = failed or not ok
+        print(f"{name:<14} {paused} paused frames in {elapsed:.1f} s  {'OK' if ok else 'HUNG'}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,98 @@
+import time
+
+import pygame
+
+
+class LatchedKeys:
+    """Stands in for pygame.key.get_pressed() in Player.handle_input.
+
+    Holds the share of the frame (0..1) each direction was held instead of a bool,
+    so a press made half-way through a frame only counts for half of it.
+    """
+    __slots__ = ("left", "right")
+
+    def __init__(self, left=0.0, right=0.0):
+        self.left = left
+        self.right = right
+
+    def __getitem__(self, key):
+        if key == pygame.K_LEFT:
+            return self.left
+        if key == pygame.K_RIGHT:
+            return self.right
+        return 0.0
+
+
+class LatchedInput:
+    """Horizontal player input, polled while the frame waits and latched at the last moment.
+
+    pygame events carry no timestamps, so the keyboard is polled about once a millisecond
+    while the loop waits for its latch point; every left/right transition is stamped with
+    the poll that saw it. latch() turns the transitions since the previous latch into
+    LatchedKeys, and presented() measures how long each transition took to reach the screen.
+    """
+
+    def __init__(self):
+        self.last_latch = time.perf_counter()
+        self.state = (False, False)  # (left, right) as last polled
+        self.latched_state = self.state  # (left, right) at the previous latch
+        self.changes = []            # (time, left, right) since the last latch
+        self.in_flight = []          # stamps of transitions latched but not yet presented
+        self.latencies = []          # input-to-present times in ms
+
+    def poll(self):
+        pygame.event.pump()  # Events stay queued for handle_events
+        pressed = pygame.key.get_pressed()
+        state = (bool(pressed[pygame.K_LEFT]), bool(pressed[pygame.K_RIGHT]))
+        if state != self.state:
+            self.changes.append((time.perf_counter(), *state))
+            self.state = state
+
+    def wait_until(self, deadline):
+        """Polls the keyboard until deadline (a time.perf_counter() value)."""
+        while True:
+            self.poll()
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return
+            time.sleep(min(0.001, remaining))
+
+    def latch(self):
+        """Returns (dt, LatchedKeys) for the time elapsed since the previous latch."""
+        self.poll()
+        now = time.perf_counter()
+        start = self.last_latch
+        dt = now - start
+
+        # Replay the transitions: left wins over right, as in Player.handle_input
+        left_time = right_time = 0.0
+        t, (left, right) = start, self.latched_state
+        for stamp, new_left, new_right in self.changes + [(now, *self.state)]:
+            if left:
+                left_time += stamp - t
+            elif right:
+                right_time += stamp - t
+            t, left, right = stamp, new_left, new_right
+
+        self.in_flight.extend(stamp for stamp, _, _ in self.changes)
+        self.changes.clear()
+        self.last_latch = now
+        self.latched_state = self.state
+        if dt <= 0:
+            return 0.0, LatchedKeys()
+        return dt, LatchedKeys(left_time / dt, right_time / dt)
+
+    def presented(self):
+        """Call right after the flip: records latency for every transition in that frame."""
+        now = time.perf_counter()
+        self.latencies.extend((now - stamp) * 1000.0 for stamp in self.in_flight)
+        self.in_flight.clear()
+
+    def report(self):
+        if not self.latencies:
+            return "Input-to-present latency: no key transitions measured"
+        ordered = sorted(self.latencies)
+        mean = sum(ordered) / len(ordered)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        return (f"Input-to-present latency over {len(ordered)} transitions: "
+                f"mean {mean:.1f} ms, p95 {p95:.1f} ms, worst {ordered[-1]:.1f} ms")
@@ -93,9 +93,9 @@ class LocaleManager:
         self.current_index = 0
         self.current_lang = self.lang_codes[self.current_index]
 
-    def get(self, key):
-        """Retrieves the string for the current language."""
-        return self.languages[self.current_lang].get(key, key)
+    def get(self, key, lang=None):
+        """Retrieves the string for the current language (or the given one)."""
+        return self.languages[lang or self.current_lang].get(key, key)
 
     def toggle_language(self):
         """Cycles to the next language in the dictionary."""
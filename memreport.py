@@ -0,0 +1,169 @@
+import argparse
+import math
+import random
+import sys
+
+from settings import *
+from controls import ScriptedPad
+import entities
+
+# ---- Memory Report ----
+# What one game instance holds, by owner: entities, Surfaces, masks and caches. Bot
+# evaluation runs many headless games per host, so this is the number that multiplies.
+# Entity bytes are the Python objects an instance owns itself; the image and mask it
+# points at are shared (entities.prepare_sprite) and counted once, under surfaces/masks.
+# Surface bytes are pixel buffers (pitch x height); masks are 1 bit per pixel.
+
+_SHARED_SLOTS = ("image", "mask", "original_image", "bullet_img", "color")  # Shared, or counted under surfaces/masks
+
+
+def _slot_names(cls):
+    for klass in cls.__mro__:
+        yield from getattr(klass, "__slots__", ())
+
+
+def entity_bytes(entity):
+    """Approximate bytes owned by one entity: the object, its attribute values and its rect."""
+    size = sys.getsizeof(entity)
+    if hasattr(entity, "__dict__"):
+        size += sys.getsizeof(entity.__dict__) + sum(sys.getsizeof(v) for v in entity.__dict__.values())
+    for name in _slot_names(type(entity)):
+        if name in _SHARED_SLOTS or not hasattr(entity, name):
+            continue
+        value = getattr(entity, name)
+        if type(value) is int and -5 <= value <= 256:
+            continue  # Small ints are interned
+        size += sys.getsizeof(value)
+    return size
+
+
+def surface_bytes(surface):
+    if surface.get_parent() is not None:
+        return 0  # Subsurfaces share their parent's pixels
+    return surface.get_pitch() * surface.get_height()
+
+
+def mask_bytes(mask):
+    width, height = mask.get_size()
+    return math.ceil(width / 64) * 8 * height
+
+
+def _live_entities(game):
+    groups = [game.enemies, game.bullets, game.rival_bullets, game.enemy_bullets,
+              game.ufo_group, game.particles]
+    seen = {}
+    for group in groups:
+        for sprite in group:
+            seen[id(sprite)] = sprite
+    for ship in (game.player, game.rival):
+        if ship is not None:
+            seen[id(ship)] = ship
+    wave = game.waves._wave  # The prefetched next wave is already built
+    if wave is not None:
+        for sprite in wave:
+            seen[id(sprite)] = sprite
+    return seen.values()
+
+
+def _surface_groups(game):
+    """{category: [Surface, ...]} for everything the game keeps alive."""
+    fx = game.fx
+    render_targets = [fx.crt_texture, fx.vignette, game.dim_overlay, game.warning_floor,
+                      game.danger_line, game.menu_separator, *game.star_sprites]
+    if game.textures is None:  # The texture backend renders into Textures instead (see _texture_groups)
+        render_targets.append(game.main_surface)
+        if game.present_surface is not game.screen:
+            render_targets.append(game.present_surface)
+    groups = {
+        "assets": [*game.assets.values(), game.hud_bullet, game.hud_bullet_gray],
+        "sprite cache": [entry[1] for entry in entities._sprite_cache.values()],
+        "flip cache": [entry[1] for entry in entities._flip_cache.values()],
+        "particle images": list(entities._particle_cache.values()),
+        "render targets": render_targets,
+        "text caches": [*game.scaled_text_cache.values(), *game.quality_labels.values()],
+    }
+    if game.capture is not None:
+        groups["capture ring"] = game.capture.ring
+    return groups
+
+
+def _texture_groups(game):
+    """{category: [Texture, ...]} held by the texture backend, or {} on the surface backend."""
+    textures = game.textures
+    if textures is None:
+        return {}
+    return {"render targets": [textures.world, textures.frame],
+            "uploaded surfaces": list(textures._textures.values())}
+
+
+def memory_report(game):
+    """Returns the report as text: bytes by entity type, Surface category, masks and caches."""
+    lines = ["Entities               count   bytes/each        total"]
+    by_type = {}
+    for entity in _live_entities(game):
+        count, total = by_type.get(type(entity).__name__, (0, 0))
+        by_type[type(entity).__name__] = (count + 1, total + entity_bytes(entity))
+    entity_total = 0
+    for name, (count, total) in sorted(by_type.items(), key=lambda item: -item[1][1]):
+        lines.append(f"  {name:<20}{count:>6}{total / count:>12.0f}{total:>13,}")
+        entity_total += total
+    lines.append(f"  {'all':<20}{sum(c for c, _ in by_type.values()):>6}{'':>12}{entity_total:>13,}")
+
+    lines.append("Surfaces               count                 bytes")
+    seen = set()
+    surface_total = 0
+    for category, surfaces in _surface_groups(game).items():
+        count = total = 0
+        for surface in surfaces:
+            if surface is None or id(surface) in seen:
+                continue  # Shared with an earlier category (a cache entry that is the asset itself)
+            seen.add(id(surface))
+            count += 1
+            total += surface_bytes(surface)
+        lines.append(f"  {category:<20}{count:>6}{total:>25,}")
+        surface_total += total
+    lines.append(f"  {'all':<20}{len(seen):>6}{surface_total:>25,}")
+
+    texture_total = 0
+    texture_groups = _texture_groups(game)
+    if texture_groups:
+        lines.append("Textures (renderer memory, 4 bytes/pixel)")
+        for category, textures in texture_groups.items():
+            total = sum(texture.width * texture.height * 4 for texture in textures)
+            lines.append(f"  {category:<20}{len(textures):>6}{total:>25,}")
+            texture_total += total
+
+    masks = {id(entry[2]): entry[2] for entry in entities._sprite_cache.values()}
+    mask_total = sum(mask_bytes(mask) for mask in masks.values())
+    lines.append(f"Masks                  {len(masks):>6}{mask_total:>25,}")
+
+    caches = {"sprite": entities._sprite_cache, "flip": entities._flip_cache,
+              "particle": entities._particle_cache,
+              "text": game.scaled_text_cache}
+    lines.append("Cache entries: " + ", ".join(f"{name} {len(cache)}" for name, cache in caches.items()))
+    lines.append(f"Total: {entity_total + surface_total + texture_total + mask_total:,} bytes")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Plays a scripted game headless and prints its memory report")
+    parser.add_argument("--frames", type=int, default=600, help="frames played before the report")
+    parser.add_argument("--level", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    from game import GameManager
+    game = GameManager(headless=True, governor=False)
+    random.seed(args.seed)
+    game.state = "PLAYING"
+    game.reset_game_state_vars()
+    if args.level > 1:
+        game.level = args.level
+        game.spawn_enemies()
+    pad = ScriptedPad(args.seed)
+    for _ in range(args.frames):
+        if game.state != "PLAYING":
+            break
+        game.step(1.0 / FPS, pad.next_input())
+        game.draw()
+    print(memory_report(game))
@@ -0,0 +1,395 @@
+import argparse
+import random
+import socket
+import struct
+import sys
+import time
+import zlib
+
+from settings import *
+from controls import INPUT_FIRE, ScriptedPad
+
+# ---- Wire Format ----
+# Every input packet carries all of the sender's inputs the peer has not acknowledged
+# yet, so a lost packet is repaired by the next one instead of by a resend.
+TAG = b"EI"
+PACKET_INPUT = 0
+PACKET_SYNC = 1
+PACKET_SYNC_ACK = 2
+
+_PACKET = struct.Struct("<2sBiiB")   # tag, kind, ack (last contiguous frame received), first frame, count
+_SYNC = struct.Struct("<2sBIB")      # tag, kind, match seed, input delay
+MAX_INPUTS_PER_PACKET = 64
+
+CHECKSUM_HISTORY = 3600  # Frames of state checksums kept for desync checks
+
+
+class UdpTransport:
+    """Non-blocking UDP socket talking to one peer."""
+
+    def __init__(self, local_port, remote_addr):
+        self.remote_addr = remote_addr
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(("", local_port))
+        self.sock.setblocking(False)
+
+    def send(self, data):
+        try:
+            self.sock.sendto(data, self.remote_addr)
+        except OSError:
+            pass  # Peer not up yet / transient; the next packet carries the same inputs
+
+    def receive(self):
+        packets = []
+        while True:
+            try:
+                data, addr = self.sock.recvfrom(2048)
+            except (BlockingIOError, ConnectionResetError):
+                return packets
+            if addr[0] == self.remote_addr[0]:
+                packets.append(data)
+
+    def close(self):
+        self.sock.close()
+
+
+class LoopbackTransport:
+    """In-memory transport with simulated latency, jitter and packet loss (for one-machine tests)."""
+
+    def __init__(self, clock, latency=0.05, jitter=0.0, loss=0.0, seed=0):
+        self.clock = clock
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        self.rng = random.Random(seed)
+        self.peer = None
+        self.inbox = []  # (deliver_at, data)
+
+    @classmethod
+    def pair(cls, clock, latency=0.05, jitter=0.0, loss=0.0, seed=0):
+        a = cls(clock, latency, jitter, loss, seed)
+        b = cls(clock, latency, jitter, loss, seed + 1)
+        a.peer, b.peer = b, a
+        return a, b
+
+    def send(self, data):
+        if self.rng.random() < self.loss:
+            return
+        deliver_at = self.clock() + self.latency + self.rng.uniform(0, self.jitter)
+        self.peer.inbox.append((deliver_at, bytes(data)))
+
+    def receive(self):
+        now = self.clock()
+        ready = [data for at, data in self.inbox if at <= now]
+        self.inbox = [(at, data) for at, data in self.inbox if at > now]
+        return ready
+
+    def close(self):
+        pass
+
+
+class RollbackSession:
+    """Runs a versus GameManager in lockstep with a remote peer using rollback.
+
+    Local input is scheduled input_delay frames ahead and sent to the peer. Frames
+    whose remote input has not arrived are simulated with a prediction (the last
+    confirmed input, minus the fire press). When the real input turns out to differ,
+    the game is restored to the saved state of that frame and re-simulated up to
+    the present. If the remote side falls more than max_rollback frames behind,
+    advance() stalls instead of predicting further.
+    """
+
+    def __init__(self, game, transport, local_index=0, input_delay=NET_INPUT_DELAY,
+                 max_rollback=NET_MAX_ROLLBACK, dt=1.0 / FPS):
+        self.game = game
+        self.transport = transport
+        self.local_index = local_index
+        self.input_delay = input_delay
+        self.max_rollback = max_rollback
+        self.dt = dt
+
+        self.frame = 0                       # Next frame to simulate
+        self.local_inputs = {f: 0 for f in range(input_delay)}
+        self.remote_inputs = {f: 0 for f in range(input_delay)}
+        self.confirmed_frame = input_delay - 1   # Every remote input up to here has arrived
+        self.peer_ack = -1                   # Every local input up to here has reached the peer
+        self.predicted = {}                  # frame -> remote input we guessed
+        self.states = {}                     # frame -> save_state() taken before simulating it
+        self.rollback_from = None
+        self.checksums = {}
+        self._next_checksum = 0
+
+        # The global random module is the gameplay RNG; keep ours separate in case
+        # several sessions share a process (the loopback harness does)
+        self.rng_state = random.getstate()
+
+        # ---- Stats ----
+        self.rollbacks = 0
+        self.resimulated_frames = 0
+        self.max_rollback_ms = 0.0
+        self.total_rollback_ms = 0.0
+        self.stalls = 0
+
+    def advance(self, local_input):
+        """Simulates one local frame. Returns False if stalled waiting for the peer."""
+        self._receive()
+        random.setstate(self.rng_state)
+        try:
+            self._rollback()
+
+            if self.frame - self.confirmed_frame > self.max_rollback:
+                self.stalls += 1
+                return False
+
+            self.local_inputs[self.frame + self.input_delay] = local_input
+            self._simulate(self.frame)
+            self.frame += 1
+
+            self._record_checksums()
+            self._prune()
+            return True
+        finally:
+            self.rng_state = random.getstate()
+            self._send()
+
+    def close(self):
+        self.transport.close()
+
+    def _simulate(self, frame):
+        self.states[frame] = self.game.save_state()
+
+        remote = self.remote_inputs.get(frame)
+        if remote is None:
+            remote = self.remote_inputs[self.confirmed_frame] & ~INPUT_FIRE
+            self.predicted[frame] = remote
+        local = self.local_inputs.get(frame, 0)
+
+        if self.local_index == 0:
+            self.game.step(self.dt, local, remote)
+        else:
+            self.game.step(self.dt, remote, local)
+
+    def _rollback(self):
+        if self.rollback_from is None:
+            return
+        start, self.rollback_from = self.rollback_from, None
+
+        t0 = time.perf_counter()
+        self.game.load_state(self.states[start])
+        self.game.audio.muted = True  # Don't replay sounds for frames already heard
+        self.game.telemetry.muted = True  # ...or record their events twice
+        try:
+            for frame in range(start, self.frame):
+                self._simulate(frame)
+        finally:
+            self.game.audio.muted = False
+            self.game.telemetry.muted = False
+        cost_ms = (time.perf_counter() - t0) * 1000.0
+
+        self.rollbacks += 1
+        self.resimulated_frames += self.frame - start
+        self.total_rollback_ms += cost_ms
+        self.max_rollback_ms = max(self.max_rollback_ms, cost_ms)
+
+    def _receive(self):
+        for data in self.transport.receive():
+            if len(data) < 3 or data[:2] != TAG:
+                continue
+            kind = data[2]
+            if kind == PACKET_SYNC:
+                # Our ack got lost and the host is still asking; answer again
+                self.transport.send(_SYNC.pack(TAG, PACKET_SYNC_ACK, 0, self.input_delay))
+                continue
+            if kind != PACKET_INPUT or len(data) < _PACKET.size:
+                continue
+
+            _, _, ack, first, count = _PACKET.unpack_from(data)
+            self.peer_ack = max(self.peer_ack, ack)
+            for i in range(min(count, len(data) - _PACKET.size)):
+                frame = first + i
+                if frame <= self.confirmed_frame or frame in self.remote_inputs:
+                    continue
+                bits = data[_PACKET.size + i]
+                self.remote_inputs[frame] = bits
+
+                guess = self.predicted.pop(frame, None)
+                if guess is not None and guess != bits:
+                    if self.rollback_from is None or frame < self.rollback_from:
+                        self.rollback_from = frame
+
+            while self.confirmed_frame + 1 in self.remote_inputs:
+                self.confirmed_frame += 1
+
+    def _send(self):
+        first = self.peer_ack + 1
+        last = min(self.frame + self.input_delay - 1, first + MAX_INPUTS_PER_PACKET - 1)
+        inputs = bytes(self.local_inputs[f] for f in range(first, last + 1) if f in self.local_inputs)
+        self.transport.send(_PACKET.pack(TAG, PACKET_INPUT, self.confirmed_frame, first, len(inputs)) + inputs)
+
+    def _record_checksums(self):
+        # The state saved before frame f is final once every input before f is confirmed
+        last = min(self.confirmed_frame + 1, self.frame - 1)
+        for frame in range(self._next_checksum, last + 1):
+            self.checksums[frame] = zlib.crc32(self.states[frame])
+        self._next_checksum = max(self._next_checksum, last + 1)
+
+    def _prune(self):
+        oldest_rollback = self.confirmed_frame + 1
+        for frame in [f for f in self.states if f < oldest_rollback]:
+            del self.states[frame]
+        for frame in [f for f in self.remote_inputs if f < self.confirmed_frame]:
+            del self.remote_inputs[frame]
+
+        acked = min(self.peer_ack, self.confirmed_frame)
+        for frame in [f for f in self.local_inputs if f <= acked]:
+            del self.local_inputs[frame]
+
+        for frame in [f for f in self.checksums if f < self.frame - CHECKSUM_HISTORY]:
+            del self.checksums[frame]
+
+
+def connect(transport, local_index, input_delay=NET_INPUT_DELAY, timeout=30.0):
+    """Agrees on a match seed and input delay with the peer. Player 1 (index 0) hosts.
+
+    Returns (seed, input_delay), or raises TimeoutError.
+    """
+    deadline = time.monotonic() + timeout
+    seed = random.getrandbits(32)
+    while time.monotonic() < deadline:
+        if local_index == 0:
+            transport.send(_SYNC.pack(TAG, PACKET_SYNC, seed, input_delay))
+
+        for data in transport.receive():
+            if len(data) < _SYNC.size or data[:2] != TAG:
+                continue
+            _, kind, peer_seed, peer_delay = _SYNC.unpack_from(data)
+            if local_index == 0 and kind == PACKET_SYNC_ACK:
+                return seed, input_delay
+            if local_index == 1 and kind == PACKET_SYNC:
+                transport.send(_SYNC.pack(TAG, PACKET_SYNC_ACK, peer_seed, peer_delay))
+                return peer_seed, peer_delay
+
+        time.sleep(0.05)
+    raise TimeoutError("no response from the other cabinet")
+
+
+# ---- Measurement & Test Harness ----
+
+def measure_resimulation_cost(game, frames=NET_MAX_ROLLBACK, repeats=50, dt=1.0 / FPS, seed=0):
+    """Times a worst-case rollback: restore a state, then re-run `frames` update ticks.
+
+    Returns (average_ms, worst_ms, frame_budget_ms).
+    """
+    rng = random.Random(seed)
+    inputs = [(rng.randrange(8), rng.randrange(8)) for _ in range(frames)]
+    blob = game.save_state()
+
+    game.audio.muted = True
+    game.telemetry.muted = True
+    timings = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        game.load_state(blob)
+        for p1, p2 in inputs:
+            game.step(dt, p1, p2)
+        timings.append((time.perf_counter() - t0) * 1000.0)
+    game.audio.muted = False
+    game.telemetry.muted = False
+    game.load_state(blob)
+
+    return sum(timings) / len(timings), max(timings), 1000.0 / FPS
+
+
+def run_loopback(frames=1200, latency=0.05, jitter=0.01, loss=0.05, input_delay=NET_INPUT_DELAY,
+                 max_rollback=NET_MAX_ROLLBACK, seed=1):
+    """Plays a scripted match between two in-process cabinets over a lossy loopback link.
+
+    Both sides must produce identical state checksums for every confirmed frame.
+    Returns a dict of results.
+    """
+    from game import GameManager
+
+    now = [0.0]
+    clock = lambda: now[0]
+    link_a, link_b = LoopbackTransport.pair(clock, latency, jitter, loss, seed)
+
+    sessions = []
+    for index, link in enumerate((link_a, link_b)):
+        game = GameManager(headless=True)
+        game.start_versus(seed, local_is_rival=index == 1)
+        sessions.append(RollbackSession(game, link, index, input_delay, max_rollback))
+
+    pads = [ScriptedPad(seed * 2 + 1), ScriptedPad(seed * 2 + 2)]
+    pending = [pad.next_input() for pad in pads]
+    dt = 1.0 / FPS
+
+    # Play, then keep ticking with idle input until both sides have confirmed everything
+    ticks = 0
+    while min(s.confirmed_frame for s in sessions) < frames and ticks < frames * 10:
+        now[0] += dt
+        ticks += 1
+        for i, session in enumerate(sessions):
+            if session.advance(pending[i]):
+                pending[i] = pads[i].next_input() if session.frame < frames else 0
+
+    a, b = sessions
+    common = sorted(set(a.checksums) & set(b.checksums))
+    desync = next((f for f in common if a.checksums[f] != b.checksums[f]), None)
+
+    random.setstate(a.rng_state)
+    avg_ms, worst_ms, budget_ms = measure_resimulation_cost(a.game, max_rollback)
+
+    return {
+        "frames": frames,
+        "ticks": ticks,
+        "frames_compared": len(common),
+        "desync_frame": desync,
+        "rollbacks": [s.rollbacks for s in sessions],
+        "resimulated_frames": [s.resimulated_frames for s in sessions],
+        "max_rollback_ms": [round(s.max_rollback_ms, 3) for s in sessions],
+        "stalls": [s.stalls for s in sessions],
+        "resim_avg_ms": round(avg_ms, 3),
+        "resim_worst_ms": round(worst_ms, 3),
+        "frame_budget_ms": round(budget_ms, 3),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Versus netplay tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    loop = sub.add_parser("loopback", help="run a scripted match over a simulated network")
+    loop.add_argument("--frames", type=int, default=1200)
+    loop.add_argument("--latency-ms", type=float, default=50.0)
+    loop.add_argument("--jitter-ms", type=float, default=10.0)
+    loop.add_argument("--loss", type=float, default=0.05, help="packet loss probability (0-1)")
+    loop.add_argument("--input-delay", type=int, default=NET_INPUT_DELAY)
+    loop.add_argument("--max-rollback", type=int, default=NET_MAX_ROLLBACK)
+    loop.add_argument("--seed", type=int, default=1)
+
+    bench = sub.add_parser("bench", help="measure the cost of re-simulating a rollback window")
+    bench.add_argument("--frames", type=int, default=NET_MAX_ROLLBACK)
+    bench.add_argument("--level", type=int, default=10)
+
+    args = parser.parse_args()
+
+    if args.command == "loopback":
+        result = run_loopback(args.frames, args.latency_ms / 1000.0, args.jitter_ms / 1000.0, args.loss,
+                              args.input_delay, args.max_rollback, args.seed)
+        for key, value in result.items():
+            print(f"{key}: {value}")
+        if result["desync_frame"] is not None:
+            print(f"DESYNC at frame {result['desync_frame']}")
+            sys.exit(1)
+        print("OK: both cabinets agree on every confirmed frame")
+
+    elif args.command == "bench":
+        from game import GameManager
+        game = GameManager(headless=True)
+        game.start_versus(0)
+        game.level = args.level
+        game.spawn_enemies()
+        avg_ms, worst_ms, budget_ms = measure_resimulation_cost(game, args.frames)
+        print(f"re-simulating {args.frames} frames at level {args.level}: "
+              f"avg {avg_ms:.3f} ms, worst {worst_ms:.3f} ms, frame budget {budget_ms:.3f} ms")
+        sys.exit(0 if worst_ms < budget_ms else 1)
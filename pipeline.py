@@ -0,0 +1,84 @@
+import threading
+from collections import namedtuple
+
+# Immutable picture of everything the renderer needs for one frame.
+# Sprite layers hold (image, topleft) pairs; the images are shared, never copied,
+# since the simulation only ever replaces a sprite's image instead of drawing into it.
+RenderSnapshot = namedtuple("RenderSnapshot", [
+    "state", "lang", "ticks", "fps",
+    "menu_index", "menu_options",
+    "stars",            # ((color, size, ((x, y), ...)), ...) one entry per parallax layer
+    "layers",           # ((image, (x, y)), ...) per layer, in draw order
+    "score", "level", "high_score",
+    "rival_score",      # None outside versus matches
+    "max_bullet_stock", "current_bullet_stock", "recharge_progress",
+    "proximity_warning", "proximity_alert",
+    "quality",          # name of the current quality tier (HUD indicator)
+])
+
+
+class RenderPipeline:
+    """Draws published snapshots on a worker thread while the simulation advances.
+
+    The simulation publishes frame N with submit() and immediately moves on to
+    simulate frame N+1. The worker renders N into the back buffer in the meantime;
+    pygame drops the GIL inside blit/fill so both threads make progress.
+    """
+
+    def __init__(self, render_fn):
+        self.render_fn = render_fn
+
+        # Double buffer: 'back' is the latest published snapshot, 'front' is the one being drawn
+        self._back = None
+        self._front = None
+
+        self._cond = threading.Condition()
+        self._error = None
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._worker, name="render", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def submit(self, snapshot):
+        """Publishes a snapshot for the worker. Replaces any snapshot not yet picked up."""
+        with self._cond:
+            self._back = snapshot
+            self._cond.notify_all()
+
+    def wait(self):
+        """Blocks until every published snapshot has been drawn."""
+        with self._cond:
+            while self._back is not None or self._front is not None:
+                self._cond.wait()
+            if self._error is not None:
+                error, self._error = self._error, None
+                raise error
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while self._running and self._back is None:
+                    self._cond.wait()
+                if not self._running:
+                    return
+                self._front, self._back = self._back, None
+
+            try:
+                self.render_fn(self._front)
+            except Exception as e:
+                self._error = e
+
+            with self._cond:
+                self._front = None
+                self._cond.notify_all()
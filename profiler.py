@@ -0,0 +1,86 @@
+import os
+import sys
+import threading
+import time
+
+from settings import PROFILE_HZ, PROFILED_THREADS
+
+
+class SamplingProfiler:
+    """Statistical profiler: a background thread snapshots the game's Python stacks at a fixed rate.
+
+    Every PROFILE_HZ-th of a second it reads sys._current_frames() for the threads named in
+    PROFILED_THREADS (the main loop and the render worker; idle helpers would only add
+    noise) and counts each stack, root first, prefixed with the game state and level at
+    that moment. write() saves the counts in the collapsed-stack format that
+    flamegraph.pl, speedscope and inferno read: one "frame;frame;... count" line per stack.
+
+    Cost while running is one stack walk per sampled thread per tick, taken on the
+    sampler's thread; while stopped it costs nothing. The sampler needs the GIL to run,
+    so ticks land where the game releases it (C calls such as blits and the flip) or at
+    the interpreter's switch interval: long pure-Python stretches are still caught, but
+    C-heavy lines are slightly over-represented.
+    """
+
+    def __init__(self, game, hz=PROFILE_HZ, threads=PROFILED_THREADS):
+        self.game = game
+        self.interval = 1.0 / hz
+        self.threads = threads
+        self.counts = {}
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None
+
+    def start(self):
+        if self.running:
+            return
+        self.counts = {}
+        self.samples = 0
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if not self.running:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self):
+        next_sample = time.perf_counter()
+        while True:
+            next_sample += self.interval
+            if self._stop.wait(max(0.0, next_sample - time.perf_counter())):
+                return
+            self.sample()
+
+    def sample(self):
+        frames = sys._current_frames()
+        tags = f"state:{self.game.state};level:{self.game.level}"
+        for thread in threading.enumerate():
+            if thread.name not in self.threads:
+                continue
+            frame = frames.get(thread.ident)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            if not stack:
+                continue
+            stack.reverse()
+            key = f"{tags};thread:{thread.name};" + ";".join(stack)
+            self.counts[key] = self.counts.get(key, 0) + 1
+        self.samples += 1
+
+    def write(self, path):
+        """Writes the collapsed stacks, most frequent first. Returns the number of samples."""
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in sorted(self.counts.items(), key=lambda item: -item[1]):
+                f.write(f"{stack} {count}\n")
+        return self.samples
@@ -0,0 +1,76 @@
+import argparse
+import random
+import time
+
+from settings import *
+from controls import ScriptedPad
+
+BACKENDS = ("surface", "texture")
+
+
+def run_benchmark(backend, frames=600, warmup=120, seed=0, level=5, render_scale=1.0, accelerated=True,
+                  headless=False, fx_threads=0):
+    """Plays the same scripted game on one backend and returns the draw time of each measured frame (ms).
+
+    Simulation runs untimed; only draw() (snapshot, compose, FX and present) is measured.
+    The quality governor is off, so both backends render the same full-quality frames.
+    """
+    from game import GameManager
+
+    game = GameManager(render_scale=render_scale, headless=headless, governor=False,
+                       backend=backend, accelerated=accelerated)
+    game.fx.set_threads(fx_threads)
+    random.seed(seed)
+    game.start_new_game()
+    if level > 1:
+        game.level = level
+        game.spawn_enemies()
+
+    pad = ScriptedPad(seed)
+    dt = 1.0 / FPS
+    times = []
+    for i in range(warmup + frames):
+        if game.state != "PLAYING":
+            game.start_new_game()
+        game.step(dt, pad.next_input())
+        start = time.perf_counter()
+        game.draw()
+        if i >= warmup:
+            times.append((time.perf_counter() - start) * 1000.0)
+    return times
+
+
+def report(results):
+    lines = [f"{'backend':<12}{'mean ms':>10}{'p50':>8}{'p95':>8}{'max':>8}{'draw fps':>10}"]
+    for backend, times in results.items():
+        ordered = sorted(times)
+        mean = sum(ordered) / len(ordered)
+        p50 = ordered[len(ordered) // 2]
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        lines.append(f"{backend:<12}{mean:>10.2f}{p50:>8.2f}{p95:>8.2f}{ordered[-1]:>8.2f}{1000.0 / mean:>10.0f}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compares the Surface and SDL2 texture render backends")
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument("--frames", type=int, default=600, help="measured frames per backend")
+    parser.add_argument("--warmup", type=int, default=120, help="frames drawn before measuring")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--level", type=int, default=5)
+    parser.add_argument("--render-scale", type=float, default=1.0)
+    parser.add_argument("--software-renderer", dest="accelerated", action="store_false",
+                        help="texture backend: use SDL's software renderer (no GPU needed)")
+    parser.add_argument("--fx-threads", type=int, nargs="+", default=[0],
+                        help="surface backend: PostProcessor band threads to compare, e.g. 0 2 4")
+    parser.add_argument("--headless", action="store_true",
+                        help="no window (dummy video driver): compares CPU cost only")
+    args = parser.parse_args()
+
+    results = {}
+    for backend in args.backends:
+        for threads in args.fx_threads if backend == "surface" else [0]:
+            name = f"{backend}/{threads}fx" if threads > 1 else backend
+            results[name] = run_benchmark(backend, args.frames, args.warmup, args.seed, args.level,
+                                          args.render_scale, args.accelerated, args.headless, threads)
+    print(report(results))
@@ -0,0 +1,93 @@
+import weakref
+
+import pygame
+
+# --- Draw Layers (lowest first) ---
+LAYER_BACKGROUND = 0
+LAYER_STARS = 1
+LAYER_BACKGROUND_OVER = 2  # Earth again, so stars only show through its transparent holes
+LAYER_PARTICLES = 10
+LAYER_PLAYER = 11
+LAYER_ENEMIES = 12
+LAYER_BULLETS = 13
+LAYER_ENEMY_BULLETS = 14
+LAYER_UFO = 15
+LAYER_OVERLAY = 20         # Menu / pause / game over dimming and text
+LAYER_DANGER = 30
+LAYER_HUD = 31
+
+# Order of RenderSnapshot.layers
+SPRITE_LAYERS = (LAYER_PARTICLES, LAYER_PLAYER, LAYER_ENEMIES,
+                 LAYER_BULLETS, LAYER_ENEMY_BULLETS, LAYER_UFO)
+
+
+class RenderQueue:
+    """Collects blit commands for a frame and submits them with one Surface.blits call per layer.
+
+    Commands are (surface, dest) or (surface, dest, area, special_flags) tuples, exactly
+    what Surface.blits accepts. Within a layer, submission order is draw order.
+
+    Callers always work in screen (simulation) coordinates. When the internal render
+    scale is not 1.0, the queue maps every command onto the smaller render target:
+    positions and areas are scaled and each surface is swapped for a scaled copy that
+    is cached for as long as the original surface lives.
+    """
+
+    def __init__(self, scale=1.0):
+        self.layers = {}
+        self.blit_count = 0   # Blits submitted by the last flush
+        self.call_count = 0   # Surface.blits calls made by the last flush
+        self.set_scale(scale)
+
+    def set_scale(self, scale):
+        self.scale = float(scale)
+        self._scaled = weakref.WeakKeyDictionary()
+
+    def submit(self, layer, surface, dest, area=None, special_flags=0):
+        if self.scale != 1.0:
+            surface, dest, area = self._to_render_space(surface, dest, area)
+
+        if area is None and not special_flags:
+            command = (surface, dest)
+        else:
+            command = (surface, dest, area, special_flags)
+        self.layers.setdefault(layer, []).append(command)
+
+    def extend(self, layer, commands):
+        """Queues a batch of ready-made (surface, dest) command tuples."""
+        if self.scale != 1.0:
+            commands = [self._to_render_space(surface, dest)[:2] for surface, dest in commands]
+        self.layers.setdefault(layer, []).extend(commands)
+
+    def _to_render_space(self, surface, dest, area=None):
+        scale = self.scale
+
+        scaled = self._scaled.get(surface)
+        if scaled is None:
+            width, height = surface.get_size()
+            scaled = pygame.transform.scale(surface, (max(1, round(width * scale)), max(1, round(height * scale))))
+            self._scaled[surface] = scaled
+        # Overlays change their surface alpha between frames, so always carry it over
+        scaled.set_alpha(surface.get_alpha())
+
+        dest = (dest[0] * scale, dest[1] * scale)
+        if area is not None:
+            area = pygame.Rect(area)
+            area = pygame.Rect(round(area.x * scale), round(area.y * scale),
+                               round(area.width * scale), round(area.height * scale))
+        return scaled, dest, area
+
+    def flush(self, target):
+        """Draws every queued layer onto target, lowest layer first, and empties the queue."""
+        blits = calls = 0
+        for layer in sorted(self.layers):
+            commands = self.layers[layer]
+            if commands:
+                target.blits(commands, doreturn=False)
+                blits += len(commands)
+                calls += 1
+
+        self.layers.clear()
+        self.blit_count = blits
+        self.call_count = calls
+        return blits
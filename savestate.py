@@ -0,0 +1,203 @@
+import random
+import struct
+from array import array
+
+import pygame
+
+from entities import Player, Bullet, Enemy, ShooterEnemy, UFO
+from scheduler import Scheduler
+
+# Binary layout of a gameplay snapshot (little-endian, fixed-size records).
+# Only numbers are stored: sprites are rebuilt from the shared images/masks in
+# entities.py, so taking or restoring a snapshot never touches pixel data.
+# Particles are cosmetic: they are neither saved nor touched by a restore.
+# Timers are stored as (due, seq) on their Scheduler's clock, seq 0 meaning "none",
+# so a restore rebuilds both heaps exactly, down to the order of simultaneous events.
+MAGIC = b"EIS4"
+STATES = ("MENU", "PLAYING", "PAUSED", "GAME_OVER")
+
+_HEADER = struct.Struct("<4sBiiidiid HHHB BBI")
+_TIMERS = struct.Struct("<dIdI dIdIdI d")
+_PLAYER = struct.Struct("<dddiiii")
+_ENEMY = struct.Struct("<BdddiiidId")
+_BULLET = struct.Struct("<dddbii")
+_UFO = struct.Struct("<dddbiii")
+_RIVAL = struct.Struct("<iidIBH")
+_RNG = struct.Struct("<iIBd")
+
+ENEMY_NORMAL = 0
+ENEMY_SHOOTER = 1
+
+
+def pack_state(game):
+    """Serializes the complete gameplay state of a GameManager into bytes."""
+    ufo = game.ufo_group.sprite
+    parts = [_HEADER.pack(
+        MAGIC, STATES.index(game.state),
+        game.score, game.level, game.high_score, game.speed_multiplier,
+        game.max_bullet_stock, game.current_bullet_stock,
+        game.bullet_recharge_time,
+        len(game.enemies), len(game.bullets), len(game.enemy_bullets), ufo is not None,
+        game.player_alive, game.rival is not None, game.wave_seed,
+    )]
+    parts.append(_TIMERS.pack(
+        game.timers.now, game.timers.next_seq, game.round_timers.now, game.round_timers.next_seq,
+        *_timer(game.recharge_timer), *_timer(game.freeze_timer), *_timer(game.ufo_timer),
+        game.ufo_spawn_delay,
+    ))
+
+    parts.append(_pack_ship(game.player))
+
+    for e in game.enemies:
+        if isinstance(e, ShooterEnemy):
+            parts.append(_ENEMY.pack(ENEMY_SHOOTER, e.pos_x, e.pos_y, e.vx, e.rect.x, e.rect.y, e.points,
+                                     *_timer(e.fire_timer), e.shoot_interval))
+        else:
+            parts.append(_ENEMY.pack(ENEMY_NORMAL, e.pos_x, e.pos_y, e.vx, e.rect.x, e.rect.y, e.points,
+                                     0.0, 0, 0.0))
+
+    for group in (game.bullets, game.enemy_bullets):
+        for b in group:
+            parts.append(_BULLET.pack(b.pos_x, b.pos_y, b.speed, b.direction, b.rect.x, b.rect.y))
+
+    if ufo is not None:
+        parts.append(_UFO.pack(ufo.pos_x, ufo.pos_y, ufo.speed, ufo.direction, ufo.rect.x, ufo.rect.y, ufo.points))
+
+    if game.rival is not None:
+        parts.append(_pack_ship(game.rival))
+        parts.append(_RIVAL.pack(game.rival_score, game.rival_bullet_stock, *_timer(game.rival_recharge_timer),
+                                 game.rival_alive, len(game.rival_bullets)))
+        for b in game.rival_bullets:
+            parts.append(_BULLET.pack(b.pos_x, b.pos_y, b.speed, b.direction, b.rect.x, b.rect.y))
+
+    # Mersenne Twister state: 624 words + position, plus the cached gauss value
+    version, internal, gauss_next = random.getstate()
+    parts.append(_RNG.pack(version, internal[-1], gauss_next is not None, gauss_next or 0.0))
+    parts.append(array("I", internal[:-1]).tobytes())
+
+    return b"".join(parts)
+
+
+def unpack_state(game, blob):
+    """Restores a GameManager to the state captured by pack_state."""
+    view = memoryview(blob)
+    (magic, state, score, level, high_score, speed_multiplier,
+     max_stock, stock, recharge_time,
+     n_enemies, n_bullets, n_enemy_bullets, has_ufo,
+     player_alive, has_rival, wave_seed) = _HEADER.unpack_from(view, 0)
+    if magic != MAGIC:
+        raise ValueError("not an Earth Invaders state snapshot")
+    (now, next_seq, round_now, round_next_seq,
+     recharge_due, recharge_seq, freeze_due, freeze_seq, ufo_due, ufo_seq,
+     ufo_spawn_delay) = _TIMERS.unpack_from(view, _HEADER.size)
+    offset = _HEADER.size + _TIMERS.size
+
+    # Plain assignment: a restore must not trigger change_state's music/reset side effects
+    game.state = STATES[state]
+    game.score = score
+    game.level = level
+    game.high_score = high_score
+    game.speed_multiplier = speed_multiplier
+    game.max_bullet_stock = max_stock
+    game.current_bullet_stock = stock
+    game.bullet_recharge_time = recharge_time
+    game.player_alive = bool(player_alive)
+    game.wave_seed = wave_seed
+
+    # Fresh clocks: whatever the old heaps held (timers of dead enemies, too) is dropped
+    game.timers = Scheduler()
+    game.timers.now, game.timers.next_seq = now, next_seq
+    game.round_timers = Scheduler()
+    game.round_timers.now, game.round_timers.next_seq = round_now, round_next_seq
+    game.recharge_timer = _untimer(game.timers, recharge_due, recharge_seq, game.recharge_done, False)
+    game.freeze_timer = _untimer(game.round_timers, freeze_due, freeze_seq, game.end_freeze)
+    game.frozen = game.freeze_timer is not None
+    game.ufo_timer = _untimer(game.round_timers, ufo_due, ufo_seq, game.spawn_ufo)
+    game.ufo_spawn_delay = ufo_spawn_delay
+
+    offset = _unpack_ship(game.player, view, offset)
+
+    game.enemies.empty()
+    for _ in range(n_enemies):
+        kind, pos_x, pos_y, vx, x, y, points, fire_due, fire_seq, shoot_interval = _ENEMY.unpack_from(view, offset)
+        offset += _ENEMY.size
+        if kind == ENEMY_SHOOTER:
+            e = ShooterEnemy(game.assets["enemy_shooter"], pos_x, pos_y, game.assets["bullet"], fire_due - now)
+            e.shoot_interval = shoot_interval
+            e.fire_timer = _untimer(game.timers, fire_due, fire_seq, game.enemy_fires, e)
+        else:
+            e = Enemy(game.assets["enemy"], pos_x, pos_y)
+        e.vx = vx
+        e.points = points
+        e.rect.x, e.rect.y = x, y
+        game.enemies.add(e)
+
+    offset = _unpack_bullets(game, game.bullets, n_bullets, view, offset)
+    offset = _unpack_bullets(game, game.enemy_bullets, n_enemy_bullets, view, offset)
+
+    game.ufo_group.empty()
+    if has_ufo:
+        pos_x, pos_y, speed, direction, x, y, points = _UFO.unpack_from(view, offset)
+        offset += _UFO.size
+        ufo = UFO(game.assets["ufo"], "left" if direction == 1 else "right")
+        ufo.pos_x, ufo.pos_y, ufo.speed, ufo.points = pos_x, pos_y, speed, points
+        ufo.rect.x, ufo.rect.y = x, y
+        game.ufo_group.add(ufo)
+    else:
+        game.audio.stop_sfx("ufo")
+
+    if has_rival:
+        if game.rival is None:
+            game.rival = Player(game.assets["rival"])
+        offset = _unpack_ship(game.rival, view, offset)
+        (game.rival_score, game.rival_bullet_stock, rival_recharge_due, rival_recharge_seq,
+         rival_alive, n_rival_bullets) = _RIVAL.unpack_from(view, offset)
+        offset += _RIVAL.size
+        game.rival_recharge_timer = _untimer(game.timers, rival_recharge_due, rival_recharge_seq,
+                                             game.recharge_done, True)
+        game.rival_alive = bool(rival_alive)
+        offset = _unpack_bullets(game, game.rival_bullets, n_rival_bullets, view, offset)
+    else:
+        game.rival = None
+        game.rival_alive = False
+        game.rival_recharge_timer = None
+        game.rival_bullets.empty()
+
+    # RNG last: the entity constructors above draw from it
+    version, index, has_gauss, gauss = _RNG.unpack_from(view, offset)
+    offset += _RNG.size
+    internal = array("I")
+    internal.frombytes(view[offset:offset + 624 * internal.itemsize])
+    random.setstate((version, tuple(internal) + (index,), gauss if has_gauss else None))
+
+
+def _timer(timer):
+    return (timer.due, timer.seq) if timer is not None else (0.0, 0)
+
+
+def _untimer(scheduler, due, seq, callback, *args):
+    return scheduler.schedule_at(due, seq, callback, *args) if seq else None
+
+
+def _pack_ship(p):
+    return _PLAYER.pack(p.pos_x, p.pos_y, p.velocity, p.rect.x, p.rect.y, p.rect.width, p.rect.height)
+
+
+def _unpack_ship(p, view, offset):
+    p.pos_x, p.pos_y, p.velocity, x, y, w, h = _PLAYER.unpack_from(view, offset)
+    tilt_angle = -(p.velocity / p.max_speed) * 15
+    p.image = pygame.transform.rotate(p.original_image, tilt_angle)
+    p.rect = pygame.Rect(x, y, w, h)
+    return offset + _PLAYER.size
+
+
+def _unpack_bullets(game, group, count, view, offset):
+    group.empty()
+    for _ in range(count):
+        pos_x, pos_y, speed, direction, x, y = _BULLET.unpack_from(view, offset)
+        offset += _BULLET.size
+        b = Bullet(game.assets["bullet"], 0, 0, direction)
+        b.pos_x, b.pos_y, b.speed = pos_x, pos_y, speed
+        b.rect.x, b.rect.y = x, y
+        group.add(b)
+    return offset
@@ -0,0 +1,65 @@
+import heapq
+
+
+class Timer:
+    """Handle returned by Scheduler.schedule. Pass it to cancel() or reschedule()."""
+    __slots__ = ("due", "seq", "callback", "args", "active")
+
+    def __init__(self, due, seq, callback, args):
+        self.due = due
+        self.seq = seq
+        self.callback = callback
+        self.args = args
+        self.active = True
+
+
+class Scheduler:
+    """Runs callbacks at points in simulation time, kept in a min-heap keyed on due time.
+
+    advance(dt) moves the clock and fires only what has fallen due, so a frame in which
+    nothing expires costs one comparison however many timers are pending. The clock only
+    moves when advance() is called: not calling it (PAUSED, a freeze) stops every timer
+    on it at once.
+
+    Equal due times fire in scheduling order (seq). Both the clock and the sequence
+    counter are plain numbers, so savestate.py can store them and rebuild the heap
+    exactly with schedule_at().
+    """
+
+    def __init__(self):
+        self.now = 0.0
+        self.next_seq = 1  # 0 is left free to mean "no timer" in a snapshot
+        self._heap = []
+
+    def schedule(self, delay, callback, *args):
+        """Calls callback(*args) once, delay seconds of simulation time from now."""
+        return self.schedule_at(self.now + delay, self.next_seq, callback, *args)
+
+    def schedule_at(self, due, seq, callback, *args):
+        timer = Timer(due, seq, callback, args)
+        self.next_seq = max(self.next_seq, seq + 1)
+        heapq.heappush(self._heap, (due, seq, timer))
+        return timer
+
+    def cancel(self, timer):
+        """Stops a pending timer. It stays in the heap and is dropped when it reaches the top."""
+        if timer is not None:
+            timer.active = False
+
+    def reschedule(self, timer, delay):
+        """Moves a timer to delay seconds from now. Returns the new handle."""
+        self.cancel(timer)
+        return self.schedule(delay, timer.callback, *timer.args)
+
+    def remaining(self, timer):
+        return timer.due - self.now
+
+    def advance(self, dt):
+        """Moves the clock forward by dt and fires everything due, earliest first."""
+        self.now += dt
+        heap = self._heap
+        while heap and heap[0][0] <= self.now:
+            timer = heapq.heappop(heap)[2]
+            if timer.active:
+                timer.active = False
+                timer.callback(*timer.args)
@@ -3,9 +3,45 @@ import os
 # --- Screen & Display ---
 SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 720
-FPS = 60
+FPS = 60                  # Default refresh rate; --fps 120/144/240 for high-refresh monitors, 0 for uncapped
 TITLE = "Earth Invaders"
 
+# --- Rendering ---
+PIPELINED_RENDER = False  # Draw on a worker thread one frame behind the simulation
+RENDER_SCALE = 1.0        # Internal render resolution relative to the window (0.5 = half-res)
+QUALITY_GOVERNOR = True   # Trade visual extras for frame time when the machine can't hold FPS
+GOVERNOR_WINDOW = 30      # Frames averaged per governor decision
+GOVERNOR_DOWNGRADE = 0.85  # Step down when a window averages above this share of the frame budget
+GOVERNOR_UPGRADE = 0.55    # Step up only after windows averaging below this share...
+GOVERNOR_CALM_WINDOWS = 4  # ...this many in a row (doubles each time an upgrade has to be undone)
+IDLE_FPS = 10             # Refresh rate of static screens (menu, pause, game over); 0 keeps them at FPS
+LOW_LATENCY = False       # Pace frames so player input is latched just before render instead of right after the sleep
+LOW_LATENCY_MARGIN = 0.001  # Seconds of slack kept between the predicted end of a frame and its present
+LOW_LATENCY_WINDOW = 30   # Recent frames whose worst work time predicts the next one
+FX_THREADS = 0            # Compose CRT effects in this many parallel horizontal bands (0 or 1: serial)
+RENDER_BACKEND = "surface"  # "surface": software Surface blits; "texture": SDL2 Renderer with uploaded textures
+RENDER_ACCELERATED = True   # Texture backend: prefer a GPU renderer (False forces SDL's software renderer)
+
+SHAKE_DECAY = 0.9 ** 60   # Share of a screen shake left after one second (0.9 per frame at 60 FPS)
+
+# --- Telemetry ---
+TELEMETRY_BUFFER = 8192          # Events the ring holds before unflushed ones are overwritten
+TELEMETRY_FLUSH_INTERVAL = 1.0   # Seconds between background flushes to the sink
+TELEMETRY_FRAME_EVERY = 10       # Record one frame-time sample per this many frames
+
+# --- Profiling (F9 or --profile) ---
+PROFILE_HZ = 97                           # Stack samples per second (off the frame rate, so frames don't alias)
+PROFILED_THREADS = ("MainThread", "render")  # Threads doing frame work; idle helpers are skipped
+
+# --- Spectator Feed (--spectator) ---
+SPECTATOR_FEED = "earth_invaders_feed"  # Shared-memory name the spectator display attaches to
+SPECTATOR_SLOTS = 8                     # Frames the ring keeps, so a slow spectator still gets every effect
+
+# --- Frame Capture (--capture) ---
+CAPTURE_SLOTS = 16    # Frames buffered for the writer thread; beyond that frames are dropped
+CAPTURE_STRIDE = 1    # Capture every Nth presented frame (2 at 60 FPS gives a 30 FPS video)
+CAPTURE_SCALE = 1.0   # Captured size relative to the window
+
 # --- Gameplay ---
 PLAYER_START_X = SCREEN_WIDTH / 2
 PLAYER_START_Y = SCREEN_HEIGHT * 0.85
@@ -13,10 +49,22 @@ COLLISION_DISTANCE = int(SCREEN_HEIGHT * 0.85)
 ENEMY_SPAWN_Y_MIN = 20
 ENEMY_SPAWN_Y_MAX = 250
 
-# --- Player Physics ---
-PLAYER_ACCEL = 45.0
-PLAYER_FRICTION = 0.5
-PLAYER_MAX_SPEED = 600
+# --- Balance (tune with balance.py) ---
+DIFFICULTY_STEP = 0.2        # Enemy speed multiplier gained per level
+SHOOTER_CHANCE = 0.3         # Chance each enemy of a wave is a shooter...
+SHOOTER_MIN_LEVEL = 5        # ...from this level on
+BULLET_STOCK = 3             # Missiles in stock at the start of a game
+BULLET_RECHARGE_TIME = 1.0   # Seconds per missile
+
+# --- Versus Netplay ---
+NET_PORT = 7777
+NET_INPUT_DELAY = 2      # Frames local input is held back before it applies (hides latency)
+NET_MAX_ROLLBACK = 8     # Furthest the simulation may run ahead of confirmed remote input
+
+# --- Player Physics (per second, so the ship handles the same at any frame rate) ---
+PLAYER_ACCEL = 2700.0     # px/s^2 while a direction is held (was 45 px/s per frame at 60 FPS)
+PLAYER_FRICTION = 0.5     # Braking while coasting, as a share of PLAYER_ACCEL
+PLAYER_MAX_SPEED = 600    # px/s
 
 # --- Colors ---
 WHITE = (255, 255, 255)
@@ -48,4 +96,6 @@ def get_path(filename):
 # settings.py
 FONT_MAIN = get_path("assets/font/PressStart2P-Regular.ttf")
 FONT_SIZE_HUD = 24
-FONT_SIZE_TITLE = 64
\ No newline at end of file
+FONT_SIZE_TITLE = 64
+
+PROFILE_DIR = get_path("profiles")  # Where F9 profiles are written
\ No newline at end of file
@@ -0,0 +1,202 @@
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import random
+import sys
+
+from settings import *
+from bots import BOTS
+from controls import ScriptedPad
+from entities import ShooterEnemy
+
+# Golden traces checked into the repo: the gate for performance work on entities.py and
+# game.py. A change that makes the simulation faster must leave every trace matching;
+# --record rewrites them, and should only be needed when gameplay is meant to change.
+GOLDEN_DIR = get_path("golden")
+
+# name: (seed, level, ticks, player 1 driver, player 2 driver or None for a solo game)
+SCENARIOS = {
+    "solo": (1, 1, 900, "pad", None),
+    "shooters": (6, 6, 900, "greedy", None),
+    "late_waves": (3, 12, 900, "dodge", None),
+    "versus": (4, 3, 600, "pad", "pad"),
+}
+
+
+def gameplay_fields(game):
+    """Flattens the gameplay state into {name: value}, in a stable order.
+
+    Everything the simulation reads or writes goes in: positions, velocities, pending
+    timers (as due times on their clock), score, level, bullet stock and the gameplay
+    RNG. Cosmetic state (particles, stars, shake, quality) stays out, so render and FX
+    work can never trip the check.
+    """
+    def due(timer):
+        return timer.due if timer is not None and timer.active else None
+
+    fields = {
+        "state": game.state, "score": game.score, "level": game.level,
+        "speed_multiplier": game.speed_multiplier, "wave_seed": game.wave_seed,
+        "bullet_stock": game.current_bullet_stock, "max_bullet_stock": game.max_bullet_stock,
+        "recharge_time": game.bullet_recharge_time, "frozen": game.frozen,
+        "timers.now": game.timers.now, "timers.next_seq": game.timers.next_seq,
+        "round_timers.now": game.round_timers.now, "round_timers.next_seq": game.round_timers.next_seq,
+        "recharge_timer": due(game.recharge_timer), "freeze_timer": due(game.freeze_timer),
+        "ufo_timer": due(game.ufo_timer), "ufo_spawn_delay": game.ufo_spawn_delay,
+        "player_alive": game.player_alive,
+    }
+    ships = [("player", game.player)]
+    if game.rival is not None:
+        ships.append(("rival", game.rival))
+        fields.update({"rival_alive": game.rival_alive, "rival_score": game.rival_score,
+                       "rival_bullet_stock": game.rival_bullet_stock,
+                       "rival_recharge_timer": due(game.rival_recharge_timer)})
+    for name, ship in ships:
+        fields.update({f"{name}.pos_x": ship.pos_x, f"{name}.velocity": ship.velocity,
+                       f"{name}.rect": tuple(ship.rect)})
+
+    for i, e in enumerate(game.enemies):
+        prefix = f"enemies[{i}]"
+        fields.update({f"{prefix}.pos": (e.pos_x, e.pos_y), f"{prefix}.vx": e.vx,
+                       f"{prefix}.rect": tuple(e.rect), f"{prefix}.points": e.points})
+        if isinstance(e, ShooterEnemy):
+            fields.update({f"{prefix}.fire_timer": due(e.fire_timer), f"{prefix}.shoot_interval": e.shoot_interval})
+    for group_name in ("bullets", "rival_bullets", "enemy_bullets"):
+        for i, b in enumerate(getattr(game, group_name)):
+            fields.update({f"{group_name}[{i}].pos": (b.pos_x, b.pos_y), f"{group_name}[{i}].rect": tuple(b.rect)})
+    for ufo in game.ufo_group:
+        fields.update({"ufo.pos_x": ufo.pos_x, "ufo.direction": ufo.direction, "ufo.points": ufo.points,
+                       "ufo.rect": tuple(ufo.rect)})
+
+    fields["rng"] = hashlib.blake2b(repr(random.getstate()).encode(), digest_size=8).hexdigest()
+    return fields
+
+
+def state_hash(fields):
+    """Digest of one tick: exact, so any change in any field shows up."""
+    return hashlib.blake2b(repr(list(fields.items())).encode(), digest_size=8).hexdigest()
+
+
+def _driver(name, seed):
+    if name == "pad":
+        pad = ScriptedPad(seed)
+        return lambda game: pad.next_input()
+    return BOTS[name](seed).next_input
+
+
+def run_scenario(game, name):
+    """Plays a scenario headless at a fixed 60 Hz step, yielding the gameplay fields after every tick."""
+    seed, level, ticks, p1, p2 = SCENARIOS[name]
+    if p2 is None:
+        random.seed(seed)
+        # Same fresh start as balance.py: no state-change side effects leak between scenarios
+        game.versus = False
+        game.state = "PLAYING"
+        game.reset_game_state_vars()
+    else:
+        game.start_versus(seed)
+    if level > 1:
+        game.level = level
+        game.spawn_enemies()
+
+    p1 = _driver(p1, seed)
+    p2 = _driver(p2, seed + 1) if p2 is not None else (lambda game: 0)
+    dt = 1.0 / 60
+    for _ in range(ticks):
+        game.step(dt, p1(game), p2(game))
+        yield gameplay_fields(game)
+        if game.state != "PLAYING":
+            return
+
+
+def trace_path(name, directory=GOLDEN_DIR):
+    return os.path.join(directory, f"sim_{name}.json.gz")
+
+
+def record(game, name, directory=GOLDEN_DIR):
+    """Writes a golden trace: the per-tick hashes, plus each tick's changed fields to explain a mismatch."""
+    hashes, deltas = [], []
+    previous = {}
+    for fields in run_scenario(game, name):
+        hashes.append(state_hash(fields))
+        changed = {key: value for key, value in fields.items() if previous.get(key, ()) != value}
+        deltas.append([changed, [key for key in previous if key not in fields]])
+        previous = fields
+    os.makedirs(directory, exist_ok=True)
+    trace = {"scenario": name, "setup": SCENARIOS[name], "hashes": hashes, "deltas": deltas}
+    # mtime=0: re-recording an unchanged simulation leaves the files byte-identical
+    with open(trace_path(name, directory), "wb") as f:
+        f.write(gzip.compress(json.dumps(trace, separators=(",", ":")).encode("utf-8"), mtime=0))
+    return len(hashes)
+
+
+def _close(a, b, tolerance):
+    if isinstance(a, float) or isinstance(b, float):
+        return isinstance(a, (int, float)) and isinstance(b, (int, float)) and abs(a - b) <= tolerance
+    if isinstance(a, (list, tuple)) and isinstance(b, (list, tuple)):
+        return len(a) == len(b) and all(_close(x, y, tolerance) for x, y in zip(a, b))
+    return a == b
+
+
+def verify(game, name, tolerance=0.0, directory=GOLDEN_DIR):
+    """Replays a scenario against its golden trace.
+
+    Returns (ticks checked, None) when it matches, or (tick, "field: golden ... now ...") at the
+    first field that differs. A tick whose hash matches is accepted without looking at the
+    fields; with a tolerance, floats within it of the golden value still pass.
+    """
+    with gzip.open(trace_path(name, directory), "rt", encoding="utf-8") as f:
+        trace = json.load(f)
+    golden = {}
+    tick = 0
+    for tick, fields in enumerate(run_scenario(game, name)):
+        if tick >= len(trace["hashes"]):
+            return tick, f"game still running after the golden trace ended ({len(trace['hashes'])} ticks)"
+        changed, removed = trace["deltas"][tick]
+        for key in removed:
+            del golden[key]
+        golden.update(changed)
+        if state_hash(fields) == trace["hashes"][tick]:
+            continue
+        for key, value in golden.items():
+            if key not in fields:
+                return tick, f"{key}: golden {value!r}, now missing"
+            if not _close(value, fields[key], tolerance):
+                return tick, f"{key}: golden {value!r}, now {fields[key]!r}"
+        for key in fields:
+            if key not in golden:
+                return tick, f"{key}: not in golden, now {fields[key]!r}"
+    checked = tick + 1
+    if checked < len(trace["hashes"]):
+        return checked, f"game ended after {checked} ticks, golden trace has {len(trace['hashes'])}"
+    return checked, None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Checks that the simulation still plays the golden scenarios tick for tick")
+    parser.add_argument("--scenario", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--tolerance", type=float, default=0.0,
+                        help="absolute tolerance for float fields (default: exact)")
+    parser.add_argument("--record", action="store_true",
+                        help="rewrite the golden traces (only when gameplay is meant to change)")
+    parser.add_argument("--golden", default=GOLDEN_DIR, help="directory of the golden traces")
+    args = parser.parse_args()
+
+    from game import GameManager
+    game = GameManager(headless=True, governor=False)
+
+    failed = False
+    for name in args.scenario:
+        if args.record:
+            print(f"{name}: recorded {record(game, name, args.golden)} ticks to {os.path.relpath(trace_path(name, args.golden))}")
+            continue
+        ticks, mismatch = verify(game, name, args.tolerance, args.golden)
+        if mismatch is None:
+            print(f"{name}: OK ({ticks} ticks)")
+        else:
+            failed = True
+            print(f"{name}: DIVERGES at tick {ticks}: {mismatch}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,329 @@
+import argparse
+import math
+import os
+import random
+import struct
+from collections import namedtuple
+from multiprocessing import resource_tracker, shared_memory
+
+import pygame
+
+from settings import *
+from entities import Particle, ShooterEnemy, prepare_sprite, flipped_image
+from savestate import STATES
+
+# ---- Feed Layout ----
+# A shared-memory ring of SPECTATOR_SLOTS fixed-size slots. The game writes frame N into
+# slot N % SPECTATOR_SLOTS between two copies of N (a seqlock: the head copy is written
+# first, the tail copy last), then publishes N in the header. A reader checks them in the
+# opposite order: the tail before copying the slot (the write was finished) and the head
+# after (no rewrite had started), so the writer never waits for anyone and a slot being
+# rewritten is simply skipped.
+# Only render state goes over: entity types and positions, HUD numbers and effect
+# triggers. The spectator draws everything itself, at its own size and rate.
+MAGIC = b"EISF"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sHHIQ")           # magic, version, slots, slot size, latest frame
+_SEQ = struct.Struct("<Q")
+_FRAME = struct.Struct("<BBBiiiiIfHH")        # state, flags, lang, score, level, high, rival, ticks,
+                                             # shake, entity count, effect count
+_ENTITY = struct.Struct("<Bhhb")              # kind, x, y, tilt (degrees, ships only)
+_EFFECT = struct.Struct("<hhBBBB")            # explosion: x, y, r, g, b, particle count
+
+SHIP, RIVAL, ENEMY, SHOOTER, UFO_SHIP, MISSILE, ENEMY_MISSILE = range(7)
+FLAG_PROXIMITY_WARNING = 1
+FLAG_PROXIMITY_ALERT = 2
+FLAG_VERSUS = 4
+
+MAX_ENTITIES = 512
+MAX_EFFECTS = 64
+SLOT_SIZE = (_SEQ.size + _FRAME.size + MAX_ENTITIES * _ENTITY.size + MAX_EFFECTS * _EFFECT.size
+             + _SEQ.size)
+
+Frame = namedtuple("Frame", ["seq", "state", "lang", "score", "level", "high_score", "rival_score",
+                             "ticks", "shake", "flags", "entities", "effects"])
+
+
+class SpectatorPublisher:
+    """Game side of the feed: packs each frame's render state straight into shared memory.
+
+    publish() costs a few struct.pack_into calls per entity and never waits for a reader;
+    there may be none, or several.
+    """
+
+    def __init__(self, name=SPECTATOR_FEED, slots=SPECTATOR_SLOTS):
+        size = _HEADER.size + slots * SLOT_SIZE
+        try:
+            self.shm = shared_memory.SharedMemory(name, create=True, size=size)
+        except FileExistsError:
+            # Left behind by a cabinet that crashed: take it over
+            self.shm = shared_memory.SharedMemory(name)
+            if self.shm.size < size:
+                self.shm.close()
+                self.shm.unlink()
+                self.shm = shared_memory.SharedMemory(name, create=True, size=size)
+        self.slots = slots
+        self.buf = self.shm.buf
+        self.seq = 0
+        self.effects = []  # Explosions since the last publish
+        _HEADER.pack_into(self.buf, 0, MAGIC, VERSION, slots, SLOT_SIZE, 0)
+
+    def explosion(self, x, y, color, count):
+        if len(self.effects) < MAX_EFFECTS:
+            self.effects.append((int(x), int(y), color[0], color[1], color[2], min(255, count)))
+
+    def publish(self, game):
+        self.seq += 1
+        seq = self.seq
+        buf = self.buf
+        base = _HEADER.size + (seq % self.slots) * SLOT_SIZE
+        _SEQ.pack_into(buf, base, seq)
+
+        offset = base + _SEQ.size + _FRAME.size
+        count = 0
+        if game.state != "MENU":
+            ships = ((SHIP, game.player, game.player_alive), (RIVAL, game.rival, game.rival_alive))
+            for kind, ship, alive in ships:
+                if alive:
+                    tilt = round(-(ship.velocity / ship.max_speed) * 15)
+                    _ENTITY.pack_into(buf, offset, kind, ship.rect.x, ship.rect.y, tilt)
+                    offset += _ENTITY.size
+                    count += 1
+            groups = ((None, game.enemies), (UFO_SHIP, game.ufo_group), (MISSILE, game.bullets),
+                      (MISSILE, game.rival_bullets), (ENEMY_MISSILE, game.enemy_bullets))
+            for kind, group in groups:
+                for sprite in group:
+                    if count == MAX_ENTITIES:
+                        break
+                    if kind is None:
+                        sprite_kind = SHOOTER if isinstance(sprite, ShooterEnemy) else ENEMY
+                    else:
+                        sprite_kind = kind
+                    _ENTITY.pack_into(buf, offset, sprite_kind, sprite.rect.x, sprite.rect.y, 0)
+                    offset += _ENTITY.size
+                    count += 1
+
+        for effect in self.effects:
+            _EFFECT.pack_into(buf, offset, *effect)
+            offset += _EFFECT.size
+
+        flags = ((FLAG_PROXIMITY_WARNING if any(e.rect.bottom > COLLISION_DISTANCE - 125 for e in game.enemies) else 0)
+                 | (FLAG_PROXIMITY_ALERT if any(e.rect.bottom > COLLISION_DISTANCE - 50 for e in game.enemies) else 0)
+                 | (FLAG_VERSUS if game.versus else 0))
+        _FRAME.pack_into(buf, base + _SEQ.size, STATES.index(game.state), flags,
+                         game.locale.lang_codes.index(game.locale.current_lang),
+                         game.score, game.level, game.high_score, game.rival_score if game.versus else -1,
+                         pygame.time.get_ticks() & 0xFFFFFFFF, game.fx.shake_intensity, count, len(self.effects))
+        _SEQ.pack_into(buf, base + SLOT_SIZE - _SEQ.size, seq)
+        self.effects.clear()
+        _HEADER.pack_into(buf, 0, MAGIC, VERSION, self.slots, SLOT_SIZE, seq)
+
+    def close(self):
+        self.buf = None
+        self.shm.close()
+        self.shm.unlink()
+
+
+class SpectatorReader:
+    """Spectator side of the feed. read() returns the newest complete Frame, or None if nothing new.
+
+    Frames skipped because the spectator runs slower than the game still hand over their
+    effect triggers (as long as they are within the ring), so no explosion goes missing.
+    """
+
+    def __init__(self, name=SPECTATOR_FEED):
+        self.shm = shared_memory.SharedMemory(name)
+        # Attaching registers the segment with this process's resource tracker, which would
+        # unlink it when the spectator exits; it belongs to the game
+        if os.name == "posix":  # The only platform with a tracker; it knows the segment by its "/" name
+            resource_tracker.unregister("/" + self.shm.name, "shared_memory")
+        magic, version, self.slots, self.slot_size, _ = _HEADER.unpack_from(self.shm.buf, 0)
+        if magic != MAGIC or version != VERSION or self.slot_size != SLOT_SIZE:
+            self.shm.close()
+            raise ValueError("not an Earth Invaders spectator feed (or a different version)")
+        self.last_seq = 0
+        self.pending_effects = []  # Effects of frames read since the last one returned
+
+    def _read_slot(self, seq):
+        buf = self.shm.buf
+        base = _HEADER.size + (seq % self.slots) * SLOT_SIZE
+        if _SEQ.unpack_from(buf, base + SLOT_SIZE - _SEQ.size)[0] != seq:
+            return None  # Not finished yet, or already lapped
+        data = bytes(buf[base:base + SLOT_SIZE])
+        if _SEQ.unpack_from(buf, base)[0] != seq:
+            return None  # The writer lapped the slot while it was being copied
+        return data
+
+    def read(self):
+        latest = _HEADER.unpack_from(self.shm.buf, 0)[4]
+        if latest <= self.last_seq:
+            return None
+        effects = self.pending_effects
+        frame = None
+        for seq in range(max(self.last_seq + 1, latest - self.slots + 2), latest + 1):
+            data = self._read_slot(seq)
+            if data is None:
+                continue
+            frame_data = _FRAME.unpack_from(data, _SEQ.size)
+            n_entities, n_effects = frame_data[-2:]
+            offset = _SEQ.size + _FRAME.size + n_entities * _ENTITY.size
+            effects.extend(_EFFECT.unpack_from(data, offset + i * _EFFECT.size) for i in range(n_effects))
+            if seq == latest:
+                offset = _SEQ.size + _FRAME.size
+                entities = [_ENTITY.unpack_from(data, offset + i * _ENTITY.size) for i in range(n_entities)]
+                state, flags, lang, score, level, high, rival, ticks, shake = frame_data[:-2]
+                frame = Frame(seq, STATES[state], lang, score, level, high, None if rival < 0 else rival,
+                              ticks, shake, flags, entities, effects)
+        # A lapped latest slot returns no frame: its predecessors' effects wait for the next one
+        self.pending_effects = [] if frame is not None else effects
+        self.last_seq = latest
+        return frame
+
+    def close(self):
+        self.shm.close()
+
+
+class Spectator:
+    """Draws the feed on its own window: own resolution, own frame rate, own particles."""
+
+    def __init__(self, reader, size, fps, fullscreen=False):
+        pygame.init()
+        self.screen = pygame.display.set_mode(size, pygame.FULLSCREEN if fullscreen else 0)
+        pygame.display.set_caption(f"{TITLE} - Spectator")
+        self.reader = reader
+        self.fps = fps
+        self.clock = pygame.time.Clock()
+        self.frame = None
+        self.rng = random.Random()
+
+        # Game coordinates -> this window, letterboxed to keep the 16:9 playfield
+        width, height = size
+        self.scale = min(width / SCREEN_WIDTH, height / SCREEN_HEIGHT)
+        self.offset = ((width - SCREEN_WIDTH * self.scale) / 2, (height - SCREEN_HEIGHT * self.scale) / 2)
+
+        from asset_bundle import load_sprites
+        from locale_manager import LocaleManager
+        assets, _ = load_sprites()
+        rival = assets["player"].copy()
+        rival.fill((255, 110, 110), special_flags=pygame.BLEND_RGB_MULT)
+
+        def sprite(surface, factor, flip=False):
+            image = prepare_sprite(surface, factor)[0]
+            image = flipped_image(image) if flip else image
+            return pygame.transform.scale_by(image, self.scale)
+
+        self.sprites = {
+            SHIP: sprite(assets["player"], 2),
+            RIVAL: sprite(rival, 2),
+            ENEMY: sprite(assets["enemy"], 2, flip=True),
+            SHOOTER: sprite(assets["enemy_shooter"], 2, flip=True),
+            UFO_SHIP: sprite(assets["ufo"], 2.0),
+            MISSILE: sprite(assets["bullet"], .5),
+            ENEMY_MISSILE: sprite(assets["bullet"], .5),
+        }
+        self.tilted = {}
+        self.background = pygame.transform.scale_by(assets["bg"], self.scale)
+        self.locale = LocaleManager()
+        self.font = pygame.font.Font(FONT_MAIN, max(8, round(FONT_SIZE_HUD * self.scale)))
+        self.big_font = pygame.font.Font(FONT_MAIN, max(12, round(FONT_SIZE_TITLE * self.scale)))
+        self.particles = pygame.sprite.Group()
+
+    def to_screen(self, x, y):
+        return self.offset[0] + x * self.scale, self.offset[1] + y * self.scale
+
+    def ship_image(self, kind, tilt):
+        key = (kind, tilt)
+        image = self.tilted.get(key)
+        if image is None:
+            image = self.tilted[key] = pygame.transform.rotate(self.sprites[kind], tilt)
+        return image
+
+    def update(self, dt):
+        frame = self.reader.read()
+        if frame is not None:
+            self.frame = frame
+            for x, y, r, g, b, count in frame.effects:
+                for _ in range(count):
+                    velocity = (self.rng.uniform(-150, 150), self.rng.uniform(-150, 150))
+                    Particle(x, y, (r, g, b), velocity=velocity).add(self.particles)
+        self.particles.update(dt)
+
+    def draw(self):
+        screen = self.screen
+        screen.fill(BLACK)
+        frame = self.frame
+        shake_x = shake_y = 0
+        if frame is not None and frame.shake > 0.1:
+            shake_x = self.rng.randint(-int(frame.shake), int(frame.shake)) * self.scale
+            shake_y = self.rng.randint(-int(frame.shake), int(frame.shake)) * self.scale
+        ox, oy = self.offset
+        screen.blit(self.background, (ox + shake_x, oy + shake_y))
+        if frame is None:
+            text = self.font.render("WAITING FOR CABINET...", True, GRAY_HUD)
+            screen.blit(text, text.get_rect(center=screen.get_rect().center))
+            return
+
+        for p in self.particles:
+            px, py = self.to_screen(p.rect.x, p.rect.y)
+            size = max(1, p.rect.width * self.scale)
+            screen.fill(p.color, (px + shake_x, py + shake_y, size, size))
+        for kind, x, y, tilt in frame.entities:
+            image = self.ship_image(kind, tilt) if kind in (SHIP, RIVAL) and tilt else self.sprites[kind]
+            px, py = self.to_screen(x, y)
+            screen.blit(image, (px + shake_x, py + shake_y))
+
+        if frame.flags & FLAG_PROXIMITY_ALERT and frame.state == "PLAYING":
+            # Same pulse as the cabinet's danger line, driven by the cabinet's clock
+            alpha = int(100 + math.sin(frame.ticks * 0.01) * 50)
+            line = pygame.Surface((SCREEN_WIDTH * self.scale, max(1, 2 * self.scale)))
+            line.fill(DANGER_COLOR)
+            line.set_alpha(alpha)
+            screen.blit(line, self.to_screen(0, COLLISION_DISTANCE))
+
+        lang = self.locale.lang_codes[frame.lang]
+        hud = f"{self.locale.get('score', lang)}{frame.score}   {self.locale.get('level', lang)}{frame.level}"
+        if frame.rival_score is not None:
+            hud += f"   P2 {frame.rival_score}"
+        screen.blit(self.font.render(hud, True, WHITE), self.to_screen(10, 10))
+        best = self.font.render(f"{self.locale.get('high_score', lang)}{frame.high_score}", True, GOLD)
+        screen.blit(best, best.get_rect(topright=self.to_screen(SCREEN_WIDTH - 10, 10)))
+
+        title = {"MENU": "title", "PAUSED": "paused", "GAME_OVER": "game_over"}.get(frame.state)
+        if title is not None:
+            text = self.big_font.render(self.locale.get(title, lang), True, CYAN if title == "title" else WHITE)
+            screen.blit(text, text.get_rect(center=self.to_screen(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)))
+
+    def run(self, frames=None):
+        running = True
+        while running and (frames is None or frames > 0):
+            dt = self.clock.tick(self.fps) / 1000.0
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                    running = False
+            self.update(dt)
+            self.draw()
+            pygame.display.flip()
+            if frames is not None:
+                frames -= 1
+        pygame.quit()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=f"{TITLE} spectator display (start the game with --spectator)")
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--fullscreen", action="store_true")
+    parser.add_argument("--feed", default=SPECTATOR_FEED, help="shared-memory name of the feed")
+    parser.add_argument("--frames", type=int, help="quit after this many frames (testing)")
+    args = parser.parse_args()
+
+    try:
+        reader = SpectatorReader(args.feed)
+    except FileNotFoundError:
+        raise SystemExit(f"No spectator feed '{args.feed}': start the game with --spectator first")
+    try:
+        Spectator(reader, (args.width, args.height), args.fps, args.fullscreen).run(args.frames)
+    finally:
+        reader.close()
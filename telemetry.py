@@ -0,0 +1,175 @@
+import json
+import struct
+import threading
+import time
+
+from settings import TELEMETRY_BUFFER, TELEMETRY_FLUSH_INTERVAL
+
+# ---- Event Types ----
+# Every event is (t, type, a, b): seconds since the stream started and two ints whose
+# meaning depends on the type. SCHEMA names them; label tables (TARGETS, CAUSES and the
+# ones passed to Telemetry.start) decode the enum-like ones.
+SHOT, HIT, KILL, UFO_SPAWN, UFO_KILL, DEATH, LEVEL_UP, STATE, FRAME, LANGUAGE, QUALITY = range(11)
+
+SCHEMA = {
+    SHOT: ("shot", "ship", None),            # A missile left a ship (0 player, 1 rival)
+    HIT: ("hit", "ship", "target"),          # One of its missiles struck a target
+    KILL: ("kill", "target", "ship"),        # An enemy was destroyed, credited to ship
+    UFO_SPAWN: ("ufo_spawn", "side", None),  # 0 from the left, 1 from the right
+    UFO_KILL: ("ufo_kill", "ship", "points"),
+    DEATH: ("death", "ship", "cause"),
+    LEVEL_UP: ("level_up", "level", None),
+    STATE: ("state", "state", None),
+    FRAME: ("frame", "work_us", "quality"),  # Sampled every TELEMETRY_FRAME_EVERY frames
+    LANGUAGE: ("language", "lang", None),
+    QUALITY: ("quality", "quality", None),
+}
+
+TARGETS = ("enemy", "shooter", "ufo")
+TARGET_UFO = TARGETS.index("ufo")
+CAUSES = ("shot", "invaded")
+
+
+class Telemetry:
+    """Records typed gameplay events into a fixed-size ring that a background thread drains to a sink.
+
+    record() is what the game calls: a timestamp, one tuple and one slot store, whatever
+    the sink is. Nothing on the game thread waits for I/O. The ring is single-producer /
+    single-consumer: the game only ever advances head, the writer only tail, and
+    the GIL keeps each slot store atomic. If the writer falls more than a full ring behind,
+    the oldest events are overwritten and counted in `dropped` instead of blocking the game.
+
+    Without a sink (the default) events still go into the ring and are simply overwritten,
+    so call sites never need to check whether telemetry is on.
+    """
+
+    def __init__(self, size=TELEMETRY_BUFFER):
+        self.size = size
+        self._ring = [None] * size
+        self.head = 0      # Events recorded so far
+        self.tail = 0      # Events handed to the sink so far
+        self.dropped = 0
+        self.muted = False  # Set while netplay re-simulates frames that were already recorded
+        self.sink = None
+        self._origin = time.perf_counter()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def record(self, kind, a=0, b=0):
+        if self.muted:
+            return
+        head = self.head
+        self._ring[head % self.size] = (time.perf_counter() - self._origin, kind, a, b)
+        self.head = head + 1
+
+    def start(self, sink, labels=None):
+        """Starts streaming to sink (see NdjsonSink/BinarySink) on a background thread."""
+        self.sink = sink
+        sink.open({"events": {kind: list(fields) for kind, fields in SCHEMA.items()},
+                   "labels": dict({"target": TARGETS, "cause": CAUSES}, **(labels or {}))})
+        self.tail = self.head  # Whatever happened before the stream started isn't part of it
+        self._origin = time.perf_counter()
+        self._thread = threading.Thread(target=self._writer, name="telemetry", daemon=True)
+        self._thread.start()
+
+    def close(self):
+        """Flushes everything recorded so far and closes the sink."""
+        if self._thread is None:
+            return
+        self._thread, thread = None, self._thread
+        self._wake.set()
+        thread.join()
+        self.sink.close()
+
+    def _writer(self):
+        while self._thread is not None:
+            self._wake.wait(TELEMETRY_FLUSH_INTERVAL)
+            self._flush()
+        self._flush()
+
+    def _flush(self):
+        head = self.head
+        if head - self.tail > self.size:
+            self.dropped += head - self.tail - self.size
+            self.tail = head - self.size
+        if head == self.tail:
+            return
+        ring, size = self._ring, self.size
+        batch = [ring[i % size] for i in range(self.tail, head)]
+        # The game may have lapped the ring while we copied: those slots are newer than they should be
+        lapped = self.head - self.size - self.tail
+        if lapped > 0:
+            del batch[:lapped]
+            self.dropped += lapped
+        self.tail = head
+        self.sink.write(batch)
+
+
+class NdjsonSink:
+    """One JSON object per line. The first line holds the schema and label tables."""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+
+    def open(self, schema):
+        self.file = open(self.path, "w", encoding="utf-8")
+        self.file.write(json.dumps({"schema": schema}, separators=(",", ":")) + "\n")
+
+    def write(self, events):
+        lines = []
+        for t, kind, a, b in events:
+            name, field_a, field_b = SCHEMA[kind]
+            if field_b is None:
+                lines.append(f'{{"t":{t:.4f},"ev":"{name}","{field_a}":{a}}}\n')
+            else:
+                lines.append(f'{{"t":{t:.4f},"ev":"{name}","{field_a}":{a},"{field_b}":{b}}}\n')
+        self.file.write("".join(lines))
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class BinarySink:
+    """Fixed 17-byte little-endian records (t: f64, type: u8, a: i32, b: i32) after a JSON schema header.
+
+    File layout: MAGIC, u32 header length, the UTF-8 JSON header, then records. read_binary() decodes it.
+    """
+    MAGIC = b"EITL"
+    RECORD = struct.Struct("<dBii")
+
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+
+    def open(self, schema):
+        header = json.dumps({"schema": schema}, separators=(",", ":")).encode("utf-8")
+        self.file = open(self.path, "wb")
+        self.file.write(self.MAGIC + struct.pack("<I", len(header)) + header)
+
+    def write(self, events):
+        pack = self.RECORD.pack
+        self.file.write(b"".join(pack(*event) for event in events))
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+def read_binary(path):
+    """Returns (header, events) from a BinarySink file; events are (t, type, a, b) tuples."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:4] != BinarySink.MAGIC:
+        raise ValueError("not an Earth Invaders telemetry file")
+    (length,) = struct.unpack_from("<I", data, 4)
+    header = json.loads(data[8:8 + length])
+    offset = 8 + length
+    usable = offset + (len(data) - offset) // BinarySink.RECORD.size * BinarySink.RECORD.size
+    return header, list(BinarySink.RECORD.iter_unpack(data[offset:usable]))
+
+
+def open_sink(path):
+    """Picks the sink from the file extension: .bin is binary, anything else NDJSON."""
+    return BinarySink(path) if path.endswith(".bin") else NdjsonSink(path)
@@ -0,0 +1,140 @@
+import weakref
+
+import pygame
+from pygame._sdl2.video import Window, Renderer, Texture
+
+from settings import SPACE_COLOR
+
+# Surface blend flags the render queue may carry, as SDL texture blend modes
+_BLEND_MODES = {
+    pygame.BLEND_RGB_ADD: pygame.BLENDMODE_ADD,
+    pygame.BLEND_ADD: pygame.BLENDMODE_ADD,
+    pygame.BLEND_RGB_MULT: pygame.BLENDMODE_MOD,
+    pygame.BLEND_MULT: pygame.BLENDMODE_MOD,
+}
+
+
+class TextureRenderer:
+    """Alternate backend: draws frames with SDL's Renderer (pygame._sdl2.video) instead of Surface blits.
+
+    Every Surface the game submits is uploaded once as a Texture and then drawn as a
+    textured quad; the cache lives as long as the Surface does, so the sprite images
+    (and the FX overlays, rebuilt only on a resize) never go back over the bus. Text and
+    particles are fresh Surfaces each frame and are uploaded each frame.
+
+    Same pipeline as the Surface path: the render queue is drawn into a world target at
+    the internal render size, PostProcessor's shake/flicker/aberration and the CRT and
+    vignette overlays are composed into a frame target, and that is stretched to the window.
+    Without a GPU it falls back to SDL's software renderer (accelerated=False forces it),
+    so it also runs under the dummy video driver.
+    """
+
+    def __init__(self, title, size, accelerated=True):
+        self.size = size
+        self.window = Window(title, size=size)
+        # -1: the best renderer available (a GPU one when there is one), 0: SDL's software renderer
+        self.renderer = Renderer(self.window, accelerated=-1 if accelerated else 0)
+        self._textures = weakref.WeakKeyDictionary()
+        self.world = self.frame = None
+        self.scale = 1.0
+
+    def resize(self, render_size, scale):
+        """(Re)creates the world and frame targets at the internal render size."""
+        self.scale = scale
+        self.world = Texture(self.renderer, render_size, target=True)
+        self.frame = Texture(self.renderer, render_size, target=True)
+
+    def texture(self, surface):
+        texture = self._textures.get(surface)
+        if texture is None:
+            texture = self._textures[surface] = Texture.from_surface(self.renderer, surface)
+        return texture
+
+    def _draw(self, surface, dest, area=None, special_flags=0):
+        texture = self.texture(surface)
+        alpha = surface.get_alpha()
+        if special_flags:
+            texture.blend_mode = _BLEND_MODES.get(special_flags, pygame.BLENDMODE_BLEND)
+        elif alpha is not None:
+            # Overlays change their surface alpha between frames, so always carry it over
+            texture.blend_mode = pygame.BLENDMODE_BLEND
+            texture.alpha = alpha
+        if area is None:
+            texture.draw(dstrect=(dest[0], dest[1]))
+        else:
+            area = pygame.Rect(area)
+            texture.draw(srcrect=area, dstrect=(dest[0], dest[1], area.width, area.height))
+
+    def flush(self, queue):
+        """Draws every queued layer into the world target, lowest layer first, and empties the queue.
+
+        The queue must be at scale 1.0: the renderer scales coordinates itself.
+        """
+        renderer = self.renderer
+        renderer.target = self.world
+        renderer.scale = (self.scale, self.scale)
+        renderer.draw_color = (*SPACE_COLOR, 255)
+        renderer.clear()
+
+        blits = calls = 0
+        for layer in sorted(queue.layers):
+            commands = queue.layers[layer]
+            for command in commands:
+                self._draw(*command)
+            blits += len(commands)
+            calls += len(commands)  # One quad per draw call; there is no batching to count
+
+        renderer.scale = (1.0, 1.0)
+        queue.layers.clear()
+        queue.blit_count = blits
+        queue.call_count = calls
+        return blits
+
+    def post_process(self, fx):
+        """PostProcessor.render, with the world target as game_surface and the frame target as final_screen."""
+        renderer = self.renderer
+        shake_x, shake_y = fx.shake_offset()
+
+        # BLEND_RGB_ADD ignores the flicker Surface's alpha on the Surface path, so it is a plain add here too
+        if fx.flicker_alpha() is not None:
+            renderer.target = self.world
+            renderer.draw_blend_mode = pygame.BLENDMODE_ADD
+            renderer.draw_color = (*fx.flicker_color, 255)
+            renderer.fill_rect((0, 0, self.world.width, self.world.height))
+            renderer.draw_blend_mode = pygame.BLENDMODE_NONE
+
+        renderer.target = self.frame
+        renderer.draw_color = (0, 0, 0, 255)
+        renderer.clear()
+
+        world = self.world
+        width, height = world.width, world.height
+        if fx.aberration:
+            shift = fx.aberration_shift
+            world.blend_mode = pygame.BLENDMODE_ADD
+            world.draw(dstrect=(-shift + shake_x, shake_y, width, height))
+            world.draw(dstrect=(shift + shake_x, shake_y, width, height))
+            world.blend_mode = pygame.BLENDMODE_MOD
+            world.draw(dstrect=(shake_x, shake_y, width, height))
+        else:
+            world.blend_mode = pygame.BLENDMODE_NONE
+            world.draw(dstrect=(shake_x, shake_y, width, height))
+
+        self.texture(fx.crt_texture).draw()
+        self.texture(fx.vignette).draw()
+
+    def present(self, overlays):
+        """Stretches the frame target to the window and draws (surface, dest) overlays on top at full size."""
+        renderer = self.renderer
+        renderer.target = None
+        self.frame.blend_mode = pygame.BLENDMODE_NONE
+        self.frame.draw(dstrect=(0, 0) + tuple(self.size))
+        for surface, dest in overlays:
+            self._draw(surface, dest)
+
+    def flip(self):
+        self.renderer.present()
+
+    def to_surface(self):
+        """Reads the window back (screenshots, tests). Slow: only call it outside the frame loop."""
+        return self.renderer.to_surface()
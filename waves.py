@@ -0,0 +1,84 @@
+import random
+import threading
+
+from settings import *
+from entities import Enemy, ShooterEnemy
+
+
+def build_wave(assets, level, seed, shooter_chance=SHOOTER_CHANCE, shooter_min_level=SHOOTER_MIN_LEVEL):
+    """Builds the enemies for one wave.
+
+    Depends only on its arguments: the layout comes from its own RNG, never the
+    gameplay one, so a wave built early on another thread is identical to one
+    built on the spot (and netplay peers agree on it).
+    """
+    rng = random.Random(seed)
+    wave = []
+    for _ in range(5 + level):
+        x = rng.randint(50, SCREEN_WIDTH - 100)
+        y = rng.randint(ENEMY_SPAWN_Y_MIN, ENEMY_SPAWN_Y_MAX)
+
+        if level >= shooter_min_level and rng.random() < shooter_chance:
+            wave.append(ShooterEnemy(assets["enemy_shooter"], x, y, assets["bullet"],
+                                     shoot_timer=rng.uniform(0.5, 2.0)))
+        else:
+            wave.append(Enemy(assets["enemy"], x, y))
+    return wave
+
+
+class WavePrefetcher:
+    """Builds the next wave on a worker thread while the current one is being played.
+
+    take() hands over the prefetched enemies when they match the requested wave and
+    falls back to building on the spot otherwise (first wave, a restored snapshot,
+    a rollback that already consumed it).
+    """
+
+    def __init__(self, assets):
+        self.assets = assets
+        self._cond = threading.Condition()
+        # Waves are identified by their build_wave arguments: (level, seed, shooter_chance, shooter_min_level)
+        self._request = None  # wave the worker should build next
+        self._building = None  # wave the worker is building right now
+        self._key = None      # wave held in self._wave
+        self._wave = None
+        self._thread = threading.Thread(target=self._worker, name="waves", daemon=True)
+        self._thread.start()
+
+    def prefetch(self, level, seed, shooter_chance=SHOOTER_CHANCE, shooter_min_level=SHOOTER_MIN_LEVEL):
+        key = (level, seed, shooter_chance, shooter_min_level)
+        with self._cond:
+            if key != self._key:
+                self._request = key
+                self._cond.notify()
+
+    def take(self, level, seed, shooter_chance=SHOOTER_CHANCE, shooter_min_level=SHOOTER_MIN_LEVEL):
+        """Returns the enemies of wave (level, seed, shooter_chance, shooter_min_level), prefetched if possible."""
+        key = (level, seed, shooter_chance, shooter_min_level)
+        with self._cond:
+            # A build for this wave still in flight is usually close to done: wait for it
+            while key in (self._request, self._building):
+                self._cond.wait()
+            if self._key == key:
+                wave = self._wave
+                self._key = None
+                self._wave = None
+                return wave
+        return build_wave(self.assets, *key)
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while self._request is None:
+                    self._cond.wait()
+                key, self._request = self._request, None
+                self._building = key
+
+            wave = build_wave(self.assets, *key)
+
+            with self._cond:
+                self._building = None
+                if self._request is None:
+                    self._key = key
+                    self._wave = wave
+                self._cond.notify_all()